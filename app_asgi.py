@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Point d'entrée ASGI du chatbot : les requêtes sont acceptées sur une boucle asyncio
+et l'inférence (ChatbotBancaire.process_message) s'exécute dans un pool de threads borné.
+Au-delà de ASGI_MAX_WORKERS requêtes en cours et ASGI_MAX_QUEUE en attente, le serveur
+répond 503 immédiatement au lieu d'allonger la file.
+
+Usage :
+    uvicorn app_asgi:app --host 0.0.0.0 --port 8000
+    python app_asgi.py --preload
+"""
+
+import asyncio
+import json
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import app_flask
+from app_flask import SERVER_OVERLOADED_ERROR, handle_chat_message, initialize_chatbot
+from json_encoding import dumps
+
+config = app_flask.app.config
+
+# Threads d'inférence et requêtes admises en attente d'un thread (au-delà : 503)
+config['ASGI_MAX_WORKERS'] = int(os.environ.get('ASGI_MAX_WORKERS', 4))
+config['ASGI_MAX_QUEUE'] = int(os.environ.get('ASGI_MAX_QUEUE', 64))
+
+# Taille maximale du corps d'une requête /chat (octets)
+MAX_BODY_SIZE = 64 * 1024
+
+
+class ServerOverloaded(Exception):
+    """
+    Le pool d'inférence et sa file d'attente sont pleins
+    """
+
+
+class InferenceExecutor:
+    """
+    Pool de threads borné pour l'inférence, avec contrôle d'admission.
+
+    `max_workers` requêtes s'exécutent en parallèle et `max_queue` attendent un thread ;
+    les suivantes sont refusées (ServerOverloaded) sans être mises en file, ce qui
+    borne la latence des requêtes admises. Le compteur n'est manipulé que depuis la
+    boucle asyncio : pas de verrou nécessaire.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 64):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        self.in_flight = 0
+        self.stats = {
+            'accepted': 0,
+            'rejected': 0,
+            'completed': 0,
+            'failed': 0,
+            'max_in_flight': 0
+        }
+
+    async def run(self, function: Callable, *args) -> Any:
+        """
+        Exécute `function(*args)` dans le pool
+
+        Raises:
+            ServerOverloaded: si toutes les places (threads + file) sont occupées
+        """
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.stats['rejected'] += 1
+            raise ServerOverloaded()
+
+        self.in_flight += 1
+        self.stats['accepted'] += 1
+        self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.in_flight)
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+            self.stats['completed'] += 1
+            return result
+        except Exception:
+            self.stats['failed'] += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats, in_flight=self.in_flight,
+                    max_workers=self.max_workers, max_queue=self.max_queue)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+executor: Optional[InferenceExecutor] = None
+
+
+def get_executor() -> InferenceExecutor:
+    global executor
+    if executor is None:
+        executor = InferenceExecutor(config['ASGI_MAX_WORKERS'], config['ASGI_MAX_QUEUE'])
+    return executor
+
+
+async def send_json(send, payload: Dict[str, Any], status: int = 200, headers: Optional[list] = None):
+    body = dumps(payload, backend=config['JSON_BACKEND'])
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode())
+        ] + (headers or [])
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def read_body(receive) -> bytes:
+    """
+    Lit le corps de la requête (refusé au-delà de MAX_BODY_SIZE)
+    """
+    chunks = []
+    size = 0
+    while True:
+        event = await receive()
+        if event['type'] == 'http.disconnect':
+            raise ConnectionError("Client déconnecté")
+        chunk = event.get('body', b'')
+        size += len(chunk)
+        if size > MAX_BODY_SIZE:
+            raise ValueError("Requête trop volumineuse")
+        chunks.append(chunk)
+        if not event.get('more_body', False):
+            return b''.join(chunks)
+
+
+async def chat(receive, send):
+    """
+    Endpoint pour le chat (même format de réponse que /chat de app_flask)
+    """
+    try:
+        data = json.loads(await read_body(receive) or b'{}')
+        message = data.get('message', '').strip()
+        user_id = str(data.get('user_id', 'default'))
+    except ConnectionError:
+        return
+    except (ValueError, AttributeError) as e:
+        await send_json(send, {'success': False, 'error': str(e)}, status=400)
+        return
+
+    if not message:
+        await send_json(send, {'success': False, 'error': 'Message vide'})
+        return
+
+    try:
+        response = await get_executor().run(handle_chat_message, message, user_id)
+    except (ServerOverloaded, queue.Full):
+        # Pool d'inférence ou file du micro-batching pleins
+        await send_json(send, {'success': False, 'error': SERVER_OVERLOADED_ERROR},
+                        status=503, headers=[(b'retry-after', b'1')])
+        return
+    except Exception as e:
+        response = {'success': False, 'error': str(e)}
+    await send_json(send, response)
+
+
+async def health(receive, send):
+    """
+    Endpoint de vérification de santé
+    """
+    chatbot = app_flask.chatbot
+    await send_json(send, {
+        'status': 'healthy' if chatbot is not None else 'starting',
+        'chatbot_initialized': chatbot is not None,
+        'timestamp': time.time()
+    })
+
+
+async def metrics(receive, send):
+    """
+    Endpoint des métriques (pool d'inférence, micro-batching, cache, sessions)
+    """
+    chatbot = app_flask.chatbot
+    await send_json(send, {
+        'success': True,
+        'executor': get_executor().get_stats(),
+        'micro_batching': app_flask.batch_scheduler.get_metrics() if app_flask.batch_scheduler else None,
+        'analysis_cache': chatbot.analysis_cache.get_stats() if chatbot else None,
+        'sessions': chatbot.conversation_context.get_stats() if chatbot else None
+    })
+
+
+ROUTES = {
+    '/chat': ('POST', chat),
+    '/health': ('GET', health),
+    '/api/metrics': ('GET', metrics)
+}
+
+
+async def lifespan(receive, send):
+    """
+    Démarrage : création du chatbot (et chargement des modèles si PRELOAD_MODELS)
+    hors de la boucle ; arrêt : fermeture du pool
+    """
+    while True:
+        event = await receive()
+        if event['type'] == 'lifespan.startup':
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, initialize_chatbot)
+                get_executor()
+            except Exception as e:
+                await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                return
+            await send({'type': 'lifespan.startup.complete'})
+        elif event['type'] == 'lifespan.shutdown':
+            if executor is not None:
+                executor.shutdown()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """
+    Application ASGI
+    """
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    route = ROUTES.get(scope['path'])
+    if route is None:
+        await send_json(send, {'success': False, 'error': 'Introuvable'}, status=404)
+    elif scope['method'] != route[0]:
+        await send_json(send, {'success': False, 'error': 'Méthode non autorisée'}, status=405,
+                        headers=[(b'allow', route[0].encode())])
+    else:
+        await route[1](receive, send)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serveur ASGI du Chatbot Bancaire")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--preload', action='store_true',
+                        help="Charge les modèles au démarrage au lieu de la première requête")
+    args = parser.parse_args()
+    if args.preload:
+        config['PRELOAD_MODELS'] = True
+
+    print("🚀 Démarrage du serveur ASGI...")
+    print(f"📱 API disponible sur : http://localhost:{args.port}/chat")
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
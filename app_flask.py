@@ -1,13 +1,71 @@
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Response, render_template, request, jsonify, session, stream_with_context
 import json
+import os
+import queue
+import threading
 import time
 from chatbot_bancaire import ChatbotBancaire
+from credit_calculator import MAX_ANNUAL_RATE, MIN_ANNUAL_RATE
+from json_encoding import StaticPayloadCache, dumps, resolve_backend
+from micro_batcher import MicroBatchScheduler
+from session_store import create_context_store
 
 app = Flask(__name__)
 app.secret_key = 'chatbot_bancaire_secret_key_2024'
 
+# Micro-batching des passes modèles (intent + NER) pour /chat
+app.config['MICRO_BATCH_ENABLED'] = os.environ.get('MICRO_BATCH_ENABLED', '1') == '1'
+app.config['MICRO_BATCH_MAX_SIZE'] = int(os.environ.get('MICRO_BATCH_MAX_SIZE', 16))
+app.config['MICRO_BATCH_MAX_WAIT_MS'] = float(os.environ.get('MICRO_BATCH_MAX_WAIT_MS', 5))
+
+# Routage des intents : "transformer" ou "cascade" (mots-clés puis DistilBERT si ambigu)
+app.config['INTENT_ROUTING_MODE'] = os.environ.get('INTENT_ROUTING_MODE', 'transformer')
+app.config['CASCADE_THRESHOLD'] = float(os.environ.get('CASCADE_THRESHOLD', 0.25))
+
+# Backend du modèle d'intent : "torch", "onnx" (ONNX Runtime, 0 thread = cœurs physiques)
+# "student" (élève distillé, voir IntentClassifier.distill) ou "knn" (index d'embeddings des exemples)
+app.config['INTENT_BACKEND'] = os.environ.get('INTENT_BACKEND', 'torch')
+app.config['ONNX_INTRA_OP_THREADS'] = int(os.environ.get('ONNX_INTRA_OP_THREADS', 0))
+
+# Contextes de conversation : expiration des sessions inactives (s) et nombre maximal de sessions
+app.config['SESSION_TTL'] = float(os.environ.get('SESSION_TTL', 3600))
+app.config['MAX_SESSIONS'] = int(os.environ.get('MAX_SESSIONS', 100000))
+
+# Stockage des contextes : "memory" (par worker), "sqlite" ou "redis" (partagés entre workers)
+app.config['SESSION_BACKEND'] = os.environ.get('SESSION_BACKEND', 'memory')
+app.config['SESSION_SQLITE_PATH'] = os.environ.get('SESSION_SQLITE_PATH', 'sessions.db')
+app.config['REDIS_URL'] = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+
+# Quantification dynamique int8 des modèles PyTorch (intent et NER) au chargement
+app.config['QUANTIZE_MODELS'] = os.environ.get('QUANTIZE_MODELS', '0') == '1'
+
+# Nombre maximal de cellules d'une grille de simulation (/api/simulate/batch)
+app.config['SIMULATION_GRID_MAX_CELLS'] = int(os.environ.get('SIMULATION_GRID_MAX_CELLS', 10000))
+
+# Durée maximale (en années) d'un crédit simulé (/api/amortization, /api/simulate/batch)
+app.config['AMORTIZATION_MAX_YEARS'] = int(os.environ.get('AMORTIZATION_MAX_YEARS', 50))
+
+# Dossier du modèle d'intent entraîné et modèle NER (nom Hugging Face ou dossier local)
+app.config['INTENT_MODEL_PATH'] = os.environ.get('INTENT_MODEL_PATH', './intent_model')
+app.config['NER_MODEL'] = os.environ.get('NER_MODEL', 'dslim/bert-base-NER')
+
+# Chargement des modèles au démarrage (sinon à la première requête qui en a besoin)
+app.config['PRELOAD_MODELS'] = os.environ.get('PRELOAD_MODELS', '0') == '1'
+
+# Encodage des réponses dynamiques (/chat, /api/simulate) : 'json' (jsonify) ou 'orjson'
+app.config['JSON_BACKEND'] = os.environ.get('JSON_BACKEND', 'json')
+
+# Réponses /api/products et /api/rates, encodées par jsonify une seule fois et réutilisées
+# tant que le catalogue ou les taux ne sont pas rechargés
+static_payloads = StaticPayloadCache(encode=lambda data: jsonify(data).get_data())
+
+# Message renvoyé quand la file du micro-batching est pleine
+SERVER_OVERLOADED_ERROR = 'Serveur surchargé, réessayez plus tard'
+
 # Initialisation du chatbot
 chatbot = None
+batch_scheduler = None
+_init_lock = threading.RLock()  # Création unique du chatbot et du planificateur
 
 def initialize_chatbot():
     """
@@ -15,11 +73,47 @@ def initialize_chatbot():
     """
     global chatbot
     if chatbot is None:
-        chatbot = ChatbotBancaire()
-        if not chatbot.load_models():
-            raise Exception("Impossible d'initialiser le chatbot")
+        with _init_lock:
+            if chatbot is None:
+                app.config['JSON_BACKEND'] = resolve_backend(app.config['JSON_BACKEND'])
+                instance = ChatbotBancaire(
+                    routing_mode=app.config['INTENT_ROUTING_MODE'],
+                    cascade_threshold=app.config['CASCADE_THRESHOLD'],
+                    intent_backend=app.config['INTENT_BACKEND'],
+                    onnx_threads=app.config['ONNX_INTRA_OP_THREADS'],
+                    quantize_models=app.config['QUANTIZE_MODELS'],
+                    ner_model=app.config['NER_MODEL'],
+                    context_store=create_context_store(
+                        app.config['SESSION_BACKEND'],
+                        ChatbotBancaire.new_context,
+                        ttl=app.config['SESSION_TTL'],
+                        max_sessions=app.config['MAX_SESSIONS'],
+                        sqlite_path=app.config['SESSION_SQLITE_PATH'],
+                        redis_url=app.config['REDIS_URL']
+                    )
+                )
+                if not instance.load_models(app.config['INTENT_MODEL_PATH'], preload=app.config['PRELOAD_MODELS']):
+                    raise Exception("Impossible d'initialiser le chatbot")
+                # Publié une fois chargé : les autres threads ne voient jamais un chatbot incomplet
+                chatbot = instance
     return chatbot
 
+def get_batch_scheduler():
+    """
+    Initialise le planificateur de micro-lots partagé par les requêtes /chat
+    """
+    global batch_scheduler
+    if batch_scheduler is None:
+        with _init_lock:
+            if batch_scheduler is None:
+                chatbot = initialize_chatbot()
+                batch_scheduler = MicroBatchScheduler(
+                    lambda messages: chatbot.analyze_messages(messages, batch_size=len(messages)),
+                    max_batch_size=app.config['MICRO_BATCH_MAX_SIZE'],
+                    max_wait_ms=app.config['MICRO_BATCH_MAX_WAIT_MS']
+                )
+    return batch_scheduler
+
 @app.route('/')
 def index():
     """
@@ -27,19 +121,60 @@ def index():
     """
     return render_template('index.html')
 
+def json_response(payload: dict) -> Response:
+    """
+    Réponse JSON d'un endpoint dynamique, encodée avec le backend JSON_BACKEND
+    """
+    if app.config['JSON_BACKEND'] == 'orjson':
+        return Response(dumps(payload, backend='orjson'), mimetype='application/json')
+    return jsonify(payload)
+
+def static_json_response(key: str, version, build) -> Response:
+    """
+    Réponse JSON pré-encodée avec son ETag ; 304 si le client possède déjà cette version
+    """
+    body, etag = static_payloads.get(key, version, build)
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def handle_chat_message(message: str, user_id: str) -> dict:
+    """
+    Traite un message de chat et retourne la réponse JSON (partagé par Flask et app_asgi)
+    """
+    chatbot = initialize_chatbot()
+    
+    # Traitement du message (analyse regroupée avec les requêtes concurrentes)
+    analysis = None
+    if app.config['MICRO_BATCH_ENABLED']:
+        analysis = get_batch_scheduler().submit(message)
+    result = chatbot.process_message(message, user_id, analysis=analysis)
+    
+    # Préparation de la réponse
+    return {
+        'success': True,
+        'response': result['response'],
+        'intent': result['intent'],
+        'confidence': result['confidence'],
+        'entities': result['entities'],
+        'entity_confidence': result['entity_confidence'],
+        'timestamp': time.time()
+    }
+
 @app.route('/chat', methods=['POST'])
 def chat():
     """
     Endpoint pour le chat
     """
     try:
-        # Initialisation du chatbot
-        chatbot = initialize_chatbot()
-        
         # Récupération des données
         data = request.get_json()
         message = data.get('message', '').strip()
-        user_id = data.get('user_id', 'default')
+        user_id = str(data.get('user_id', 'default'))
         
         if not message:
             return jsonify({
@@ -47,28 +182,65 @@ def chat():
                 'error': 'Message vide'
             })
         
-        # Traitement du message
-        result = chatbot.process_message(message, user_id)
-        
-        # Préparation de la réponse
-        response = {
-            'success': True,
-            'response': result['response'],
-            'intent': result['intent'],
-            'confidence': result['confidence'],
-            'entities': result['entities'],
-            'entity_confidence': result['entity_confidence'],
-            'timestamp': time.time()
-        }
-        
-        return jsonify(response)
+        return json_response(handle_chat_message(message, user_id))
         
+    except queue.Full:
+        return jsonify({
+            'success': False,
+            'error': SERVER_OVERLOADED_ERROR
+        }), 503, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         })
 
+def sse_event(event: str, data) -> str:
+    """
+    Formate un événement server-sent events (données en JSON sur une ligne)
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/chat/stream', methods=['GET', 'POST'])
+def chat_stream():
+    """
+    Endpoint de chat en streaming (server-sent events) : événements `analysis`
+    (intent, entités), `token` (morceaux de la réponse), `done` ou `error`.
+    GET (?message=...&user_id=...) pour EventSource, POST JSON comme /chat
+    """
+    def events():
+        # Premier octet envoyé avant l'analyse : le client sait que sa requête est prise en compte
+        yield ": ok\n\n"
+        try:
+            # Lecture des paramètres dans le flux : toute erreur devient un événement `error`
+            data = request.get_json(silent=True) or request.args
+            if not isinstance(data, dict):
+                raise ValueError("Le corps de la requête doit être un objet JSON")
+            message = str(data.get('message') or '').strip()
+            user_id = str(data.get('user_id', 'default'))
+            if not message:
+                yield sse_event('error', {'success': False, 'error': 'Message vide'})
+                return
+            
+            chatbot = initialize_chatbot()
+            analysis = None
+            if app.config['MICRO_BATCH_ENABLED']:
+                analysis = get_batch_scheduler().submit(message)
+            for event, payload in chatbot.stream_message(message, user_id, analysis=analysis):
+                if event == 'token':
+                    yield sse_event('token', {'text': payload})
+                elif event == 'done':
+                    yield sse_event('done', {'success': True, 'timestamp': time.time()})
+                else:
+                    yield sse_event(event, payload)
+        except queue.Full:
+            yield sse_event('error', {'success': False, 'error': SERVER_OVERLOADED_ERROR})
+        except Exception as e:
+            yield sse_event('error', {'success': False, 'error': str(e)})
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/simulate', methods=['POST'])
 def simulate_credit():
     """
@@ -101,7 +273,7 @@ def simulate_credit():
             with_insurance=with_insurance
         )
         
-        return jsonify({
+        return json_response({
             'success': True,
             'simulation': simulation
         })
@@ -112,6 +284,169 @@ def simulate_credit():
             'error': str(e)
         })
 
+# Colonnes du tableau d'amortissement, dans l'ordre de sortie
+AMORTIZATION_COLUMNS = ['mois', 'mensualite', 'interets', 'capital_rembourse', 'assurance', 'capital_restant']
+
+def iter_amortization_rows(schedule, chunk_size=60):
+    """
+    Parcourt le tableau d'amortissement par blocs de lignes arrondies à 2 décimales
+    """
+    columns = [schedule['mois'].tolist()] + [
+        schedule[column].round(2).tolist() for column in AMORTIZATION_COLUMNS[1:]
+    ]
+    rows = list(zip(*columns))
+    for start in range(0, len(rows), chunk_size):
+        yield rows[start:start + chunk_size]
+
+def stream_amortization_csv(schedule):
+    """
+    Génère le tableau d'amortissement en CSV, bloc par bloc
+    """
+    yield ','.join(AMORTIZATION_COLUMNS) + '\n'
+    for chunk in iter_amortization_rows(schedule):
+        yield ''.join(
+            f"{row[0]},{row[1]:.2f},{row[2]:.2f},{row[3]:.2f},{row[4]:.2f},{row[5]:.2f}\n" for row in chunk
+        )
+
+def stream_amortization_json(schedule, summary):
+    """
+    Génère le tableau d'amortissement en JSON, bloc par bloc
+    """
+    yield '{"success": true, "summary": ' + json.dumps(summary) + ', "schedule": ['
+    first = True
+    for chunk in iter_amortization_rows(schedule):
+        rows = ','.join(json.dumps(dict(zip(AMORTIZATION_COLUMNS, row))) for row in chunk)
+        yield rows if first else ',' + rows
+        first = False
+    yield ']}'
+
+@app.route('/api/amortization', methods=['GET', 'POST'])
+def amortization():
+    """
+    Endpoint pour le tableau d'amortissement (JSON par défaut, CSV avec format=csv)
+    """
+    try:
+        data = request.get_json(silent=True) or request.args
+        
+        # Validation des paramètres
+        required_params = ['montant', 'duree']
+        for param in required_params:
+            if param not in data:
+                return jsonify({
+                    'success': False,
+                    'error': f'Paramètre manquant : {param}'
+                })
+        
+        # Récupération des paramètres
+        montant = float(data['montant'])
+        duree = int(data['duree'])
+        taux = float(data['taux']) if 'taux' in data else None
+        assurance = float(data.get('assurance', 0))
+        output_format = data.get('format', 'json')
+        
+        if montant <= 0:
+            return jsonify({
+                'success': False,
+                'error': 'Le montant doit être strictement positif'
+            })
+        if not 0 < duree <= app.config['AMORTIZATION_MAX_YEARS']:
+            return jsonify({
+                'success': False,
+                'error': f"La durée doit être comprise entre 1 et {app.config['AMORTIZATION_MAX_YEARS']} ans"
+            })
+        
+        # Calcul du tableau complet en une fois (vectoriel)
+        chatbot = initialize_chatbot()
+        schedule = chatbot.credit_calculator.amortization_schedule(montant, duree, taux, insurance=assurance)
+        
+        if output_format == 'csv':
+            return Response(
+                stream_with_context(stream_amortization_csv(schedule)),
+                mimetype='text/csv',
+                headers={'Content-Disposition': 'attachment; filename=amortissement.csv'}
+            )
+        
+        summary = {
+            'mensualite': round(float(schedule['mensualite'][0]), 2),
+            'total_rembourse': round(float(schedule['mensualite'].sum()), 2),
+            'interets': round(float(schedule['interets'].sum()), 2),
+            'assurance': round(float(schedule['assurance'].sum()), 2),
+            'nombre_mois': len(schedule['mois'])
+        }
+        return Response(stream_with_context(stream_amortization_json(schedule, summary)), mimetype='application/json')
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/api/simulate/batch', methods=['POST'])
+def simulate_credit_batch():
+    """
+    Endpoint pour simuler une grille montants × durées × taux en une seule requête
+    """
+    try:
+        data = request.get_json()
+        
+        # Validation des paramètres
+        required_params = ['montants', 'durees']
+        for param in required_params:
+            if not data.get(param):
+                return jsonify({
+                    'success': False,
+                    'error': f'Paramètre manquant : {param}'
+                })
+        
+        montants = [float(montant) for montant in data['montants']]
+        durees = [int(duree) for duree in data['durees']]
+        taux = [float(t) for t in data['taux']] if data.get('taux') else None
+        
+        max_years = app.config['AMORTIZATION_MAX_YEARS']
+        if not all(0 < montant < float('inf') for montant in montants):
+            return jsonify({
+                'success': False,
+                'error': 'Les montants doivent être strictement positifs'
+            })
+        if not all(0 < duree <= max_years for duree in durees):
+            return jsonify({
+                'success': False,
+                'error': f"Les durées doivent être comprises entre 1 et {max_years} ans"
+            })
+        if taux and not all(MIN_ANNUAL_RATE < t <= MAX_ANNUAL_RATE for t in taux):
+            return jsonify({
+                'success': False,
+                'error': f"Les taux doivent être compris entre {MIN_ANNUAL_RATE:g} (exclu) et {MAX_ANNUAL_RATE:g} %"
+            })
+        
+        grid_size = len(montants) * len(durees) * (len(taux) if taux else 1)
+        if grid_size > app.config['SIMULATION_GRID_MAX_CELLS']:
+            return jsonify({
+                'success': False,
+                'error': f"Grille trop grande : {grid_size} cellules (maximum {app.config['SIMULATION_GRID_MAX_CELLS']})"
+            })
+        
+        # Calcul de toute la grille en une fois
+        chatbot = initialize_chatbot()
+        grid = chatbot.credit_calculator.simulate_grid(montants, durees, taux)
+        
+        return json_response({
+            'success': True,
+            'montants': montants,
+            'durees': durees,
+            'taux': taux if taux else [chatbot.credit_calculator.taux_annuel],
+            # Matrices indexées [montant][durée][taux]
+            'mensualite': grid['mensualite'].tolist(),
+            'total_rembourse': grid['total_rembourse'].tolist(),
+            'interets': grid['interets'].tolist()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
 @app.route('/api/products')
 def get_products():
     """
@@ -119,7 +454,7 @@ def get_products():
     """
     try:
         chatbot = initialize_chatbot()
-        return jsonify({
+        return static_json_response('products', (id(chatbot), chatbot.catalog_version), lambda: {
             'success': True,
             'products': chatbot.product_info
         })
@@ -136,9 +471,10 @@ def get_rates():
     """
     try:
         chatbot = initialize_chatbot()
-        return jsonify({
+        calculator = chatbot.credit_calculator
+        return static_json_response('rates', (id(calculator), calculator.rates_version), lambda: {
             'success': True,
-            'rates': chatbot.credit_calculator.rates
+            'rates': calculator.rates
         })
     except Exception as e:
         return jsonify({
@@ -146,6 +482,19 @@ def get_rates():
             'error': str(e)
         })
 
+@app.route('/api/metrics')
+def get_metrics():
+    """
+    Endpoint pour récupérer les métriques (micro-batching, routage des intents, cache, sessions)
+    """
+    return jsonify({
+        'success': True,
+        'micro_batching': batch_scheduler.get_metrics() if batch_scheduler else None,
+        'intent_routing': chatbot.intent_router.get_stats() if chatbot and chatbot.intent_router else None,
+        'analysis_cache': chatbot.analysis_cache.get_stats() if chatbot else None,
+        'sessions': chatbot.conversation_context.get_stats() if chatbot else None
+    })
+
 @app.route('/health')
 def health_check():
     """
@@ -156,6 +505,7 @@ def health_check():
         return jsonify({
             'status': 'healthy',
             'chatbot_initialized': chatbot is not None,
+            'pid': os.getpid(),
             'timestamp': time.time()
         })
     except Exception as e:
@@ -165,19 +515,6 @@ def health_check():
             'timestamp': time.time()
         })
 
-if __name__ == '__main__':
-    # Création du dossier templates s'il n'existe pas
-    import os
-    os.makedirs('templates', exist_ok=True)
-    
-    # Création du template HTML
-    create_html_template()
-    
-    print("🚀 Démarrage du serveur Flask...")
-    print("📱 Interface disponible sur : http://localhost:5000")
-    
-    app.run(debug=True, host='0.0.0.0', port=5000)
-
 def create_html_template():
     """
     Crée le template HTML pour l'interface
@@ -562,6 +899,7 @@ Je suis votre conseiller virtuel spécialisé dans les crédits. Je peux vous ai
             
             // Scroll vers le bas
             messagesContainer.scrollTop = messagesContainer.scrollHeight;
+            return messageContent;
         }
 
         function updateDetectionInfo(result) {
@@ -632,7 +970,8 @@ Je suis votre conseiller virtuel spécialisé dans les crédits. Je peux vous ai
             showLoading();
             
             try {
-                const response = await fetch('/chat', {
+                // Réponse en streaming (server-sent events) : affichée au fur et à mesure
+                const response = await fetch('/chat/stream', {
                     method: 'POST',
                     headers: {
                         'Content-Type': 'application/json',
@@ -643,16 +982,48 @@ Je suis votre conseiller virtuel spécialisé dans les crédits. Je peux vous ai
                     })
                 });
                 
-                const result = await response.json();
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
+                const messagesContainer = document.getElementById('chatMessages');
+                let buffer = '';
+                let text = '';
+                let botContent = null;
                 
-                if (result.success) {
-                    // Ajouter la réponse du bot
-                    addMessage(result.response, 'bot');
+                while (true) {
+                    const { value, done } = await reader.read();
+                    if (done) break;
+                    buffer += decoder.decode(value, { stream: true });
                     
-                    // Mettre à jour les informations de détection
-                    updateDetectionInfo(result);
-                } else {
-                    addMessage(`❌ Erreur : ${result.error}`, 'bot');
+                    let boundary;
+                    while ((boundary = buffer.indexOf('\\n\\n')) >= 0) {
+                        const block = buffer.slice(0, boundary);
+                        buffer = buffer.slice(boundary + 2);
+                        
+                        let event = 'message';
+                        let data = '';
+                        for (const line of block.split('\\n')) {
+                            if (line.startsWith('event: ')) event = line.slice(7);
+                            else if (line.startsWith('data: ')) data += line.slice(6);
+                        }
+                        if (!data) continue;
+                        const payload = JSON.parse(data);
+                        
+                        if (event === 'analysis') {
+                            // Mettre à jour les informations de détection
+                            updateDetectionInfo(payload);
+                        } else if (event === 'token') {
+                            // Ajouter la réponse du bot, morceau par morceau
+                            text += payload.text;
+                            if (botContent === null) {
+                                botContent = addMessage(text, 'bot');
+                            } else {
+                                botContent.innerHTML = text;
+                                messagesContainer.scrollTop = messagesContainer.scrollHeight;
+                            }
+                        } else if (event === 'error') {
+                            addMessage(`❌ Erreur : ${payload.error}`, 'bot');
+                        }
+                    }
                 }
             } catch (error) {
                 addMessage(`❌ Erreur de connexion : ${error.message}`, 'bot');
@@ -687,4 +1058,27 @@ Je suis votre conseiller virtuel spécialisé dans les crédits. Je peux vous ai
         f.write(html_content)
     
     print("✅ Template HTML créé dans templates/index.html") 
-    
\ No newline at end of file
+
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Serveur Flask du Chatbot Bancaire")
+    parser.add_argument('--preload', action='store_true',
+                        help="Charge les modèles au démarrage au lieu de la première requête")
+    args = parser.parse_args()
+    if args.preload:
+        app.config['PRELOAD_MODELS'] = True
+    
+    # Création du dossier templates s'il n'existe pas
+    os.makedirs('templates', exist_ok=True)
+    
+    # Création du template HTML
+    create_html_template()
+    
+    if app.config['PRELOAD_MODELS']:
+        initialize_chatbot()
+    
+    print("🚀 Démarrage du serveur Flask...")
+    print("📱 Interface disponible sur : http://localhost:5000")
+    
+    app.run(debug=True, host='0.0.0.0', port=5000)
@@ -225,10 +225,8 @@ def main():
         if st.button("🗑️ Effacer l'historique"):
             clear_chat_history()
         st.subheader("📊 Taux d'intérêt")
-        st.write("**Crédit Personnel :** 4.5% - 7.2%")
-        st.write("**Crédit Immobilier :** 2.8% - 4.1%")
-        st.write("**Crédit Automobile :** 3.2% - 5.8%")
-        st.write("**Crédit Travaux :** 5.1% - 8.3%")
+        for credit_type, grille in chatbot.credit_calculator.rates.items():
+            st.write(f"**Crédit {credit_type.capitalize()} :** {grille['min']}% - {grille['max']}%")
     
     col1, col2 = st.columns([3, 1])
     
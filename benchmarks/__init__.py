@@ -0,0 +1,6 @@
+"""
+Scripts de benchmark du Chatbot Bancaire.
+
+À lancer depuis la racine du projet, par exemple :
+    python -m benchmarks.bench_intent_single_pass
+"""
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Débit (requêtes/s) des endpoints JSON de l'API Flask, mesuré avec le client de test
+(sans réseau) :
+- /api/products et /api/rates : jsonify à chaque requête (implémentation d'origine)
+  vs corps pré-encodé avec ETag, et réponse 304 sur If-None-Match ;
+- /chat et /api/simulate/batch : JSON_BACKEND=json (jsonify) vs JSON_BACKEND=orjson.
+
+Usage :
+    python -m benchmarks.bench_api_json --model-path ./intent_model --requests 2000
+"""
+
+import argparse
+import contextlib
+import os
+import time
+
+GRID = {'montants': list(range(5000, 105000, 5000)), 'durees': list(range(1, 11)),
+        'taux': [0.02, 0.025, 0.03, 0.035, 0.04]}
+
+
+def measure(request, requests):
+    """
+    Retourne le débit en requêtes/s
+    """
+    start = time.perf_counter()
+    for _ in range(requests):
+        request()
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-path", default="./intent_model")
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    os.environ['INTENT_MODEL_PATH'] = args.model_path
+
+    import app_flask
+    from flask import jsonify
+
+    app = app_flask.app
+
+    # Implémentation d'origine : encodage complet à chaque requête
+    app.add_url_rule('/legacy/products', 'legacy_products', lambda: jsonify({
+        'success': True, 'products': app_flask.initialize_chatbot().product_info
+    }))
+    app.add_url_rule('/legacy/rates', 'legacy_rates', lambda: jsonify({
+        'success': True, 'rates': app_flask.initialize_chatbot().credit_calculator.rates
+    }))
+
+    client = app.test_client()
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        app_flask.initialize_chatbot()
+        app_flask.app.config['MICRO_BATCH_ENABLED'] = False
+
+    results = {}
+    print(f"\n{'endpoint':<22}{'variante':<22}{'req/s':>10}")
+    for name in ('products', 'rates'):
+        path = f'/api/{name}'
+        etag = client.get(path).headers['ETag']
+        assert client.get(f'/legacy/{name}').get_data() == client.get(path).get_data()
+        variants = {
+            "jsonify": lambda: client.get(f'/legacy/{name}'),
+            "pré-encodé": lambda: client.get(path),
+            "304 (If-None-Match)": lambda: client.get(path, headers={'If-None-Match': etag})
+        }
+        for variant, request in variants.items():
+            results[(path, variant)] = measure(request, args.requests)
+            print(f"{path:<22}{variant:<22}{results[(path, variant)]:>10.0f}")
+
+    dynamic = {
+        '/chat': lambda: client.post('/chat', json={'message': "Quels sont vos produits de crédit ?",
+                                                    'user_id': 'bench'}),
+        '/api/simulate/batch': lambda: client.post('/api/simulate/batch', json=GRID)
+    }
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        for path, request in dynamic.items():
+            for backend in ('json', 'orjson'):
+                app.config['JSON_BACKEND'] = backend
+                request()
+                results[(path, backend)] = measure(request, max(args.requests // 10, 1))
+    for path in dynamic:
+        for backend in ('json', 'orjson'):
+            print(f"{path:<22}{backend:<22}{results[(path, backend)]:>10.0f}")
+
+    products = results[('/api/products', "pré-encodé")] / results[('/api/products', "jsonify")]
+    batch = results[('/api/simulate/batch', 'orjson')] / results[('/api/simulate/batch', 'json')]
+    print(f"\n⚡ /api/products pré-encodé : {products:.1f}x, /api/simulate/batch avec orjson : {batch:.1f}x "
+          f"plus de requêtes/s")
+
+if __name__ == "__main__":
+    main()
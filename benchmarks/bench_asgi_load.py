@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test de charge de /chat : serveur Flask actuel contre point d'entrée ASGI (app_asgi,
+servi par uvicorn) à 50 et 200 clients simultanés. Chaque serveur tourne dans son
+propre processus ; les clients sont des coroutines asyncio (une connexion par requête).
+Affiche p50 / p99 des réponses 200, le débit, et les refus 503 / erreurs.
+
+Usage :
+    python -m benchmarks.bench_asgi_load --model-path ./intent_model
+    python -m benchmarks.bench_asgi_load --concurrency 50 200 --requests 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+SERVERS = {
+    "flask": "import app_flask; app_flask.app.run(host='127.0.0.1', port={port}, threaded=True)",
+    "asgi": "import uvicorn, app_asgi; uvicorn.run(app_asgi.app, host='127.0.0.1', port={port}, "
+            "log_level='warning', backlog=2048)"
+}
+
+CREDIT_TYPES = ["personnel", "immobilier", "automobile", "travaux"]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(name, port, env):
+    """
+    Lance un serveur dans un processus neuf et attend qu'il réponde sur /health
+    """
+    process = subprocess.Popen(
+        [sys.executable, "-c", SERVERS[name].format(port=port)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=5) as response:
+                if json.loads(response.read()).get('chatbot_initialized'):
+                    return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"Le serveur {name} n'a pas démarré")
+
+
+def random_message(rng):
+    """
+    Message de simulation aux montants variés (pas de réponse servie par le cache d'analyse)
+    """
+    return (f"Je voudrais simuler un crédit {rng.choice(CREDIT_TYPES)} de "
+            f"{rng.randrange(5000, 300000, 500)} euros sur {rng.randint(2, 25)} ans")
+
+
+async def post_chat(port, message, user_id, timeout):
+    """
+    Envoie une requête POST /chat ; retourne (statut HTTP, latence en secondes)
+    """
+    body = json.dumps({'message': message, 'user_id': user_id}).encode('utf-8')
+    start = time.perf_counter()
+    writer = None
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), timeout)
+        writer.write(
+            b"POST /chat HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+            b"Content-Length: %d\r\nConnection: close\r\n\r\n%s" % (len(body), body)
+        )
+        await writer.drain()
+        data = await asyncio.wait_for(reader.read(), timeout)
+        status = int(data.split(b" ", 2)[1])
+    except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+        status = 0
+    finally:
+        if writer is not None:
+            writer.close()
+    return status, time.perf_counter() - start
+
+
+async def load(port, concurrency, requests_per_client, timeout, seed):
+    """
+    `concurrency` clients envoient chacun `requests_per_client` requêtes à la suite
+    """
+    rng = random.Random(seed)
+
+    async def client(index):
+        results = []
+        for _ in range(requests_per_client):
+            results.append(await post_chat(port, random_message(rng), f"user-{index}", timeout))
+        return results
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return [result for client_results in results for result in client_results], elapsed
+
+
+def summarize(results, elapsed):
+    latencies = sorted(latency * 1000 for status, latency in results if status == 200)
+    p99 = statistics.quantiles(latencies, n=100)[-1] if len(latencies) >= 2 else float('nan')
+    return {
+        'ok': len(latencies),
+        'rejected': sum(status == 503 for status, _ in results),
+        'errors': sum(status not in (200, 503) for status, _ in results),
+        'p50': statistics.median(latencies) if latencies else float('nan'),
+        'p99': p99,
+        'rps': len(latencies) / elapsed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-path", default="./intent_model")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--requests", type=int, default=5, help="requêtes par client")
+    parser.add_argument("--timeout", type=float, default=60.0, help="délai maximal d'une requête (s)")
+    parser.add_argument("--workers", type=int, default=4, help="ASGI_MAX_WORKERS")
+    parser.add_argument("--max-queue", type=int, default=64, help="ASGI_MAX_QUEUE")
+    args = parser.parse_args()
+
+    env = dict(os.environ, INTENT_MODEL_PATH=args.model_path, PRELOAD_MODELS="1",
+               ASGI_MAX_WORKERS=str(args.workers), ASGI_MAX_QUEUE=str(args.max_queue))
+
+    summaries = {}
+    print(f"{'serveur':<8}{'clients':>8}{'200':>7}{'503':>7}{'erreurs':>9}"
+          f"{'p50 (ms)':>10}{'p99 (ms)':>10}{'req/s':>8}")
+    for name in SERVERS:
+        port = free_port()
+        process = start_server(name, port, env)
+        try:
+            # Échauffement (premières passes du modèle)
+            asyncio.run(load(port, 4, 2, args.timeout, seed=0))
+            for concurrency in args.concurrency:
+                results, elapsed = asyncio.run(load(port, concurrency, args.requests, args.timeout, seed=concurrency))
+                summary = summaries[name, concurrency] = summarize(results, elapsed)
+                print(f"{name:<8}{concurrency:>8}{summary['ok']:>7}{summary['rejected']:>7}{summary['errors']:>9}"
+                      f"{summary['p50']:>10.0f}{summary['p99']:>10.0f}{summary['rps']:>8.1f}")
+        finally:
+            process.terminate()
+            process.wait()
+
+    print()
+    for concurrency in args.concurrency:
+        flask, asgi = summaries["flask", concurrency], summaries["asgi", concurrency]
+        print(f"⚡ {concurrency} clients : p99 {flask['p99']:.0f} ms -> {asgi['p99']:.0f} ms "
+              f"({flask['p99'] / asgi['p99']:.2f}x), {asgi['rejected']} requêtes refusées en 503")
+
+
+if __name__ == "__main__":
+    main()
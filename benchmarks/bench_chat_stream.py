@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Temps jusqu'au premier octet (TTFB), jusqu'au premier morceau de texte et total :
+/chat (réponse JSON complète) contre /chat/stream (server-sent events), sur le
+serveur Flask lancé dans le processus (werkzeug, un thread par requête).
+
+Usage :
+    python -m benchmarks.bench_chat_stream --model-path ./intent_model --runs 30
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import socket
+import statistics
+import threading
+import time
+
+MESSAGES = [
+    "Quels sont vos produits de crédit ?",
+    "Parlez-moi du crédit immobilier",
+    "Comment contacter un conseiller ?",
+    "Je voudrais simuler un crédit personnel de 15 000 euros sur 4 ans"
+]
+
+
+def timed_request(port, path, message, user_id):
+    """
+    Envoie POST `path` ; retourne (TTFB, premier morceau de texte, total) en ms
+    """
+    body = json.dumps({'message': message, 'user_id': user_id}).encode('utf-8')
+    start = time.perf_counter()
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        sock.sendall(
+            b"POST %s HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+            b"Content-Length: %d\r\nConnection: close\r\n\r\n%s" % (path.encode(), len(body), body)
+        )
+        first_byte = first_text = None
+        received = b""
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            now = time.perf_counter()
+            if first_byte is None:
+                first_byte = now
+            received += chunk
+            # Premier morceau de texte : événement token (SSE) ou corps JSON complet
+            if first_text is None and (b"event: token" in received or b'"response"' in received):
+                first_text = now
+    end = time.perf_counter()
+    return tuple((moment - start) * 1000 for moment in (first_byte, first_text or end, end))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-path", default="./intent_model")
+    parser.add_argument("--ner-model", default="dslim/bert-base-NER")
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    os.environ['INTENT_MODEL_PATH'] = args.model_path
+    os.environ['NER_MODEL'] = args.ner_model
+    os.environ['PRELOAD_MODELS'] = '1'
+
+    from werkzeug.serving import make_server
+
+    import app_flask
+
+    # Journaux du serveur et traces du chatbot masqués pendant les mesures
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    quiet = contextlib.redirect_stdout(open(os.devnull, 'w'))
+
+    server = make_server("127.0.0.1", 0, app_flask.app, threaded=True)
+    port = server.server_port
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with quiet:
+        chatbot = app_flask.initialize_chatbot()
+        for message in MESSAGES:
+            timed_request(port, "/chat", message, "warmup")
+
+    results = {}
+    print(f"{'endpoint':<14}{'TTFB (ms)':>11}{'1er texte (ms)':>16}{'total (ms)':>12}")
+    for path in ("/chat", "/chat/stream"):
+        timings = []
+        with quiet:
+            for run in range(args.runs):
+                for message in MESSAGES:
+                    # Sans cache d'analyse : chaque requête passe par les modèles
+                    chatbot.analysis_cache.clear()
+                    timings.append(timed_request(port, path, message, f"user-{run}"))
+        ttfb, first_text, total = (statistics.median(column) for column in zip(*timings))
+        results[path] = ttfb
+        print(f"{path:<14}{ttfb:>11.1f}{first_text:>16.1f}{total:>12.1f}")
+
+    server.shutdown()
+    print(f"\n⚡ TTFB : {results['/chat'] / results['/chat/stream']:.1f}x plus court en streaming")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Mémoire occupée par les contextes de conversation : ancien contexte (dict + liste
+de dicts de simulations) contre ConversationState (__slots__ + tampon circulaire
+de flottants), pour N sessions synthétiques ayant chacune 5 simulations.
+
+Usage :
+    python -m benchmarks.bench_context_memory --sessions 100000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from chatbot_bancaire import ChatbotBancaire
+from context_store import ConversationContextStore
+
+
+def legacy_context():
+    """
+    Contexte tel qu'il était créé avant ConversationState
+    """
+    return {
+        'last_intent': None,
+        'last_entities': {},
+        'simulation_history': [],
+        'conversation_count': 0
+    }
+
+
+def turn(context, i, n):
+    """
+    Un message de simulation : mise à jour du contexte et ajout d'une simulation
+    """
+    montant = 1000.0 + i + n
+    context['conversation_count'] += 1
+    context['last_intent'] = 'simulation_credit'
+    context['last_entities'] = {'montant': montant, 'duree': 5, 'type_credit': 'personnel'}
+    # Montants distincts par session, comme en production (pas de flottants partagés)
+    context['simulation_history'].append({
+        'mensualite': montant / 50.0,
+        'total_rembourse': montant * 1.2,
+        'interets': montant * 0.2
+    })
+    if isinstance(context['simulation_history'], list) and len(context['simulation_history']) > 5:
+        context['simulation_history'].pop(0)
+
+
+def measure(context_factory, sessions, simulations):
+    """
+    Retourne (octets alloués par session, durée de remplissage en secondes)
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    # Marge sur max_sessions : les partitions ne sont pas parfaitement équilibrées
+    store = ConversationContextStore(context_factory, max_sessions=2 * sessions)
+    for i in range(sessions):
+        with store.session(f"user-{i}") as context:
+            for n in range(simulations):
+                turn(context, i, n)
+
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert len(store) == sessions
+    return allocated / sessions, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--simulations", type=int, default=5, help="simulations par session")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'contexte':<20}{'o/session':>12}{'total (Mo)':>12}{'remplissage (s)':>17}")
+    for name, factory in (("dict", legacy_context), ("ConversationState", ChatbotBancaire.new_context)):
+        per_session, elapsed = measure(factory, args.sessions, args.simulations)
+        results[name] = per_session
+        print(f"{name:<20}{per_session:>12.0f}{per_session * args.sessions / 1e6:>12.1f}{elapsed:>17.2f}")
+
+    print(f"\n⚡ Mémoire par session : {results['dict'] / results['ConversationState']:.2f}x plus faible")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Coût par message de EntityExtractor.extract_entities_regex : implémentation
+d'origine (findall sur des patterns non compilées) vs patterns précompilées.
+
+Usage :
+    python -m benchmarks.bench_entity_regex
+"""
+
+import argparse
+import json
+import re
+import time
+
+from entity_extractor import EntityExtractor
+
+
+def legacy_extract_entities_regex(extractor, text):
+    """
+    Boucles d'origine : re.findall(pattern, text, re.IGNORECASE) pour chaque pattern
+    """
+    entities = {}
+    for slot, patterns in extractor.patterns.items():
+        for pattern in patterns:
+            matches = re.findall(pattern, text, re.IGNORECASE)
+            if matches:
+                entities[slot] = matches[0]
+                if slot == 'duree' and 'mois' in text.lower():
+                    entities[slot] = int(matches[0]) // 12
+                break
+    return entities
+
+
+def measure(func, texts, iterations):
+    """
+    Retourne le temps moyen par message (µs)
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - start) / (iterations * len(texts)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dataset", default="dataset_bancaire.json")
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+
+    with open(args.dataset, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    texts = [example for intent_data in data['intents'] for example in intent_data['examples']]
+
+    extractor = EntityExtractor()
+    before = measure(lambda text: legacy_extract_entities_regex(extractor, text), texts, args.iterations)
+    after = measure(extractor.extract_entities_regex, texts, args.iterations)
+
+    print(f"findall non compilé  : {before:8.2f} µs/message")
+    print(f"patterns compilées   : {after:8.2f} µs/message")
+    print(f"\n⚡ Accélération : x{before / after:.2f}")
+
+
+if __name__ == "__main__":
+    main()
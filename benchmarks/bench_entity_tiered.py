@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Mesure la latence par message de l'extraction d'entités avec le NER
+systématique ("always") et avec l'extraction à étages ("tiered").
+
+Usage :
+    python -m benchmarks.bench_entity_tiered --ner-model dslim/bert-base-NER
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from entity_extractor import EntityExtractor
+
+
+def load_messages(dataset_path):
+    """
+    Retourne tous les exemples du dataset
+    """
+    with open(dataset_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [example for intent_data in data['intents'] for example in intent_data['examples']]
+
+
+def measure(extractor, messages, iterations):
+    """
+    Retourne les latences (ms) de extract_entities_with_validation
+    """
+    latencies = []
+    for _ in range(iterations):
+        for message in messages:
+            start = time.perf_counter()
+            extractor.extract_entities_with_validation(message)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ner-model", default="dslim/bert-base-NER")
+    parser.add_argument("--dataset", default="dataset_bancaire.json")
+    parser.add_argument("--iterations", type=int, default=3)
+    args = parser.parse_args()
+
+    messages = load_messages(args.dataset)
+    extractor = EntityExtractor(model_name=args.ner_model)
+
+    results = {}
+    for mode in ("always", "tiered"):
+        extractor.ner_mode = mode
+        measure(extractor, messages[:5], 1)  # Échauffement
+        extractor.stats = dict.fromkeys(extractor.stats, 0)
+        results[mode] = measure(extractor, messages, args.iterations)
+        stats = extractor.get_stats()
+        print(f"{mode:<8} p50 = {statistics.median(results[mode]):7.3f} ms   "
+              f"NER appelé {stats['ner_calls']} fois, évité {stats['ner_skipped']} fois "
+              f"({stats['ner_skip_rate']:.0%})")
+
+    saving = statistics.median(results['always']) - statistics.median(results['tiered'])
+    print(f"\n⚡ Gain p50 par message : {saving:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compare les backends PyTorch et ONNX Runtime du classifieur d'intents sur CPU :
+latence d'un message (p50/p95), débit par lots et concordance des prédictions.
+
+Usage :
+    python -m benchmarks.bench_intent_onnx --model-path ./intent_model --threads 4
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from intent_classifier import IntentClassifier
+
+
+def measure_latency(classifier, texts, iterations):
+    """
+    Retourne les latences (ms) de predict_intent_with_confidence, message par message
+    """
+    latencies = []
+    for _ in range(iterations):
+        for text in texts:
+            start = time.perf_counter()
+            classifier.predict_intent_with_confidence(text)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def measure_throughput(classifier, texts, batch_size):
+    """
+    Retourne le débit (messages/s) de predict_batch
+    """
+    start = time.perf_counter()
+    classifier.predict_batch(texts, batch_size=batch_size)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model-path", default="./intent_model")
+    parser.add_argument("--dataset", default="dataset_bancaire.json")
+    parser.add_argument("--threads", type=int, default=0, help="threads intra-op ONNX (0 : cœurs physiques)")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    with open(args.dataset, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    texts = [example for intent_data in data['intents'] for example in intent_data['examples']]
+
+    classifiers = {}
+    for backend in ("torch", "onnx"):
+        classifier = IntentClassifier(model_name=args.model_path, backend=backend, onnx_threads=args.threads)
+        if not classifier.load_trained_model(args.model_path):
+            raise SystemExit(1)
+        classifier.predict_batch(texts[:args.batch_size])  # Échauffement
+        classifiers[backend] = classifier
+
+    print(f"\n{'':<10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'msg/s (lots)':>14}")
+    results = {}
+    for backend, classifier in classifiers.items():
+        latencies = measure_latency(classifier, texts[:50], args.iterations)
+        throughput = measure_throughput(classifier, texts, args.batch_size)
+        results[backend] = (statistics.median(latencies), throughput)
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        print(f"{backend:<10}{statistics.median(latencies):>10.2f}{p95:>10.2f}{throughput:>14.1f}")
+
+    torch_predictions = classifiers["torch"].predict_batch(texts)
+    onnx_predictions = classifiers["onnx"].predict_batch(texts)
+    agreement = sum(a['intent'] == b['intent'] for a, b in zip(torch_predictions, onnx_predictions)) / len(texts)
+    max_gap = max(abs(a['confidence'] - b['confidence']) for a, b in zip(torch_predictions, onnx_predictions))
+
+    print(f"\nConcordance des intents : {agreement:.1%} (écart max de confiance {max_gap:.2e})")
+    print(f"⚡ Gain p50 : x{results['torch'][0] / results['onnx'][0]:.2f}, "
+          f"débit : x{results['onnx'][1] / results['torch'][1]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compare la latence de predict_intent_with_confidence avant/après le passage
+à une seule passe du modèle (une tokenisation + un forward au lieu de deux).
+
+Usage :
+    python -m benchmarks.bench_intent_single_pass --model-path ./intent_model
+"""
+
+import argparse
+import statistics
+import time
+
+from intent_classifier import IntentClassifier
+
+MESSAGES = [
+    "Je voudrais simuler un crédit personnel de 50 000€ sur 5 ans",
+    "Qu'est-ce qu'un crédit immobilier ?",
+    "Je veux faire une demande de crédit",
+    "Calculez-moi le TAEG",
+    "Comment contacter un conseiller ?",
+    "Je voudrais changer la durée à 7 ans"
+]
+
+
+def double_pass(classifier, text):
+    """
+    Reproduit l'ancien comportement : une passe pour l'intent,
+    une seconde pour le vecteur complet de probabilités
+    """
+    top = classifier.predict_probabilities(text)[0]
+    full = classifier.predict_probabilities(text)[0]
+    result = classifier.format_prediction(full)
+    result['confidence'] = top[top.argmax()].item()
+    return result
+
+
+def measure(func, classifier, iterations):
+    """
+    Retourne les latences (ms) de func sur les messages de test
+    """
+    latencies = []
+    for _ in range(iterations):
+        for text in MESSAGES:
+            start = time.perf_counter()
+            func(classifier, text)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model-path", default="./intent_model")
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    classifier = IntentClassifier(model_name=args.model_path)
+    if not classifier.load_trained_model(args.model_path):
+        raise SystemExit(1)
+
+    # Échauffement
+    measure(double_pass, classifier, 1)
+
+    before = measure(double_pass, classifier, args.iterations)
+    after = measure(lambda c, t: c.predict_intent_with_confidence(t), classifier, args.iterations)
+
+    print(f"{'':<14}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+    for name, latencies in (("double passe", before), ("passe unique", after)):
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        print(f"{name:<14}{statistics.median(latencies):>10.2f}{p95:>10.2f}")
+    print(f"\n⚡ Gain p50 : x{statistics.median(before) / statistics.median(after):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compromis exactitude / latence entre le professeur DistilBERT et l'élève distillé
+(n-grammes de caractères + régression logistique).
+
+L'élève est distillé sur la partie entraînement du dataset (même découpage que
+IntentClassifier.train) puis les deux modèles sont évalués sur la partie test.
+
+Usage :
+    python -m benchmarks.bench_intent_student --model-path ./intent_model
+"""
+
+import argparse
+import io
+import statistics
+import time
+
+import joblib
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from intent_classifier import IntentClassifier
+from intent_student import CharNgramStudent
+from quantization import model_size_mb
+
+
+def p50_latency(predict, texts, iterations):
+    """
+    Latence médiane (ms) d'une prédiction message par message
+    """
+    latencies = []
+    for _ in range(iterations):
+        for text in texts:
+            start = time.perf_counter()
+            predict(text)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-path", default="./intent_model")
+    parser.add_argument("--dataset", default="dataset_bancaire.json")
+    parser.add_argument("--temperature", type=float, default=2.0)
+    parser.add_argument("--alpha", type=float, default=0.7)
+    parser.add_argument("--iterations", type=int, default=3)
+    args = parser.parse_args()
+
+    teacher = IntentClassifier(model_name=args.model_path)
+    if not teacher.load_trained_model(args.model_path):
+        raise SystemExit(1)
+    texts, labels = teacher.load_dataset(args.dataset)
+    train_texts, test_texts, train_labels, test_labels = train_test_split(
+        texts, labels, test_size=0.2, random_state=42, stratify=labels
+    )
+
+    student = CharNgramStudent(teacher.id2label).fit(
+        train_texts, teacher.predict_probabilities(train_texts).numpy(), train_labels,
+        temperature=args.temperature, alpha=args.alpha
+    )
+
+    teacher_test = teacher.predict_probabilities(test_texts).numpy().argmax(axis=1)
+    student_test = student.predict_proba(test_texts).argmax(axis=1)
+
+    buffer = io.BytesIO()
+    joblib.dump(student, buffer)
+    sizes = {"professeur": model_size_mb(teacher.model), "élève": buffer.tell() / 1024 / 1024}
+    latencies = {
+        "professeur": p50_latency(teacher.predict_intent_with_confidence, test_texts, args.iterations),
+        "élève": p50_latency(lambda text: student.predict_proba([text]), test_texts, args.iterations)
+    }
+    accuracies = {
+        "professeur": np.mean(teacher_test == np.array(test_labels)),
+        "élève": np.mean(student_test == np.array(test_labels))
+    }
+
+    print(f"\n{'modèle':<12}{'exactitude':>12}{'taille (Mo)':>13}{'p50 (ms)':>10}")
+    for name in ("professeur", "élève"):
+        print(f"{name:<12}{accuracies[name]:>12.1%}{sizes[name]:>13.2f}{latencies[name]:>10.2f}")
+    print(f"\nAccord élève / professeur (test) : {np.mean(student_test == teacher_test):.1%}")
+    print(f"⚡ Latence : x{latencies['professeur'] / latencies['élève']:.1f}, "
+          f"taille : x{sizes['professeur'] / sizes['élève']:.0f} plus petit")
+
+
+if __name__ == "__main__":
+    main()
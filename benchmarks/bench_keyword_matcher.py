@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmark de SimpleIntentClassifier.classify_intent sur dataset_bancaire.json :
+boucle mot-clé par mot-clé (une regex compilée par mot-clé trouvé) vs matcher compilé.
+
+Usage :
+    python -m benchmarks.bench_keyword_matcher
+"""
+
+import argparse
+import json
+import re
+import time
+
+from simple_intent_classifier import SimpleIntentClassifier
+
+
+def legacy_classify_intent(classifier, text):
+    """
+    Implémentation d'origine de classify_intent
+    """
+    text_lower = text.lower()
+    intent_scores = {}
+    for intent, keywords in classifier.intent_keywords.items():
+        score = 0
+        for keyword in keywords:
+            if keyword.lower() in text_lower:
+                if re.search(r'\b' + re.escape(keyword.lower()) + r'\b', text_lower):
+                    score += 2
+                else:
+                    score += 1
+        normalized_score = score / len(keywords)
+        if normalized_score > 0.3:
+            normalized_score = min(normalized_score * 1.5, 1.0)
+        intent_scores[intent] = normalized_score
+
+    best_intent = max(intent_scores, key=intent_scores.get)
+    confidence = min(intent_scores[best_intent], 1.0)
+    if confidence >= 0.1:
+        return best_intent, confidence
+    return 'support_client', 0.1
+
+
+def measure(func, texts, iterations):
+    """
+    Retourne le temps moyen par message (µs)
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - start) / (iterations * len(texts)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dataset", default="dataset_bancaire.json")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with open(args.dataset, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    texts = [example for intent_data in data['intents'] for example in intent_data['examples']]
+
+    classifier = SimpleIntentClassifier()
+    assert all(legacy_classify_intent(classifier, text) == classifier.classify_intent(text) for text in texts)
+
+    before = measure(lambda text: legacy_classify_intent(classifier, text), texts, args.iterations)
+    after = measure(classifier.classify_intent, texts, args.iterations)
+
+    print(f"Boucle de mots-clés : {before:8.2f} µs/message")
+    print(f"Matcher compilé     : {after:8.2f} µs/message")
+    print(f"\n⚡ Accélération : x{before / after:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Mémoire et débit de gunicorn (gunicorn.conf.py) avec N workers : modèles chargés
+par chaque worker (SHARED_MODELS=0) contre chargés une fois par le maître puis
+partagés en copie à l'écriture (SHARED_MODELS=1).
+
+La mémoire est lue dans /proc/<pid>/smaps_rollup du maître et des workers :
+RSS cumulé (les pages partagées y sont comptées plusieurs fois), PSS cumulé
+(pages partagées réparties entre processus : mémoire réellement occupée) et
+USS (pages privées) moyen par worker. Mesures après démarrage puis après charge.
+
+Usage :
+    python -m benchmarks.bench_prefork --model-path ./intent_model --workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+from benchmarks.bench_asgi_load import free_port, load, summarize
+
+
+def children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def memory_kb(pid):
+    """
+    Rss, Pss et pages privées (Ko) d'un processus
+    """
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        'rss': values.get('Rss', 0),
+        'pss': values.get('Pss', 0),
+        'uss': values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+    }
+
+
+def memory_report(master, workers):
+    per_process = [memory_kb(pid) for pid in [master] + workers]
+    worker_uss = [memory['uss'] for memory in per_process[1:]]
+    return {
+        'rss': sum(memory['rss'] for memory in per_process) / 1024,
+        'pss': sum(memory['pss'] for memory in per_process) / 1024,
+        'uss_worker': sum(worker_uss) / len(worker_uss) / 1024
+    }
+
+
+def wait_ready(process, port, workers, timeout=300):
+    """
+    Attend que les N workers aient répondu sur /health (modèles chargés)
+    """
+    seen = set()
+    deadline = time.time() + timeout
+    while len(seen) < workers:
+        if time.time() > deadline or process.poll() is not None:
+            raise RuntimeError("gunicorn n'a pas démarré tous ses workers")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=30) as response:
+                health = json.loads(response.read())
+            if health.get('chatbot_initialized'):
+                seen.add(health['pid'])
+        except OSError:
+            time.sleep(0.5)
+    # Laisse les workers retardataires terminer leur chargement
+    while len(children(process.pid)) < workers:
+        time.sleep(0.2)
+
+
+def run_mode(shared, args):
+    port = free_port()
+    env = dict(os.environ, SHARED_MODELS="1" if shared else "0", WEB_CONCURRENCY=str(args.workers),
+               GUNICORN_BIND=f"127.0.0.1:{port}", INTENT_MODEL_PATH=args.model_path, NER_MODEL=args.ner_model,
+               QUANTIZE_MODELS="1" if args.quantize else "0")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app_flask:app"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        start = time.perf_counter()
+        wait_ready(process, port, args.workers)
+        ready = time.perf_counter() - start
+        workers = children(process.pid)
+
+        idle = memory_report(process.pid, workers)
+        results, elapsed = asyncio.run(load(port, args.concurrency, args.requests, 120.0, seed=1))
+        loaded = memory_report(process.pid, workers)
+        return ready, idle, loaded, summarize(results, elapsed)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-path", default="./intent_model")
+    parser.add_argument("--ner-model", default="dslim/bert-base-NER")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=4, help="requêtes par client")
+    parser.add_argument("--quantize", action="store_true", help="modèles quantifiés en int8 (QUANTIZE_MODELS=1)")
+    args = parser.parse_args()
+
+    reports = {}
+    print(f"{'mode':<12}{'démarrage (s)':>14}{'RSS cumulé':>12}{'PSS cumulé':>12}{'USS/worker':>12}"
+          f"{'PSS chargé':>12}{'req/s':>8}{'p99 (ms)':>10}")
+    for name, shared in (("par worker", False), ("partagé", True)):
+        ready, idle, loaded, summary = reports[name] = run_mode(shared, args)
+        print(f"{name:<12}{ready:>14.1f}{idle['rss']:>10.0f}Mo{idle['pss']:>10.0f}Mo{idle['uss_worker']:>10.0f}Mo"
+              f"{loaded['pss']:>10.0f}Mo{summary['rps']:>8.1f}{summary['p99']:>10.0f}")
+
+    separate, shared = reports["par worker"], reports["partagé"]
+    print(f"\n⚡ {args.workers} workers : PSS {separate[1]['pss']:.0f} Mo -> {shared[1]['pss']:.0f} Mo "
+          f"({separate[1]['pss'] / shared[1]['pss']:.2f}x moins), "
+          f"débit {separate[3]['rps']:.1f} -> {shared[3]['rps']:.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Modèles float32 vs quantification dynamique int8 (intent et NER), un processus
+neuf par mode pour mesurer la mémoire d'un worker :
+  - exactitude du classifieur d'intents sur dataset_bancaire.json,
+  - concordance des intents et des entités NER entre les deux modes,
+  - taille des poids, RSS et mémoire anonyme du processus après inférence,
+  - latence p50 d'un message (intent, NER).
+
+Usage :
+    python -m benchmarks.bench_quantization --model-path ./intent_model
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+TRIAL = """
+import gc, json, statistics, time
+from intent_classifier import IntentClassifier
+from entity_extractor import EntityExtractor
+from quantization import model_size_mb
+
+def memory_mb():
+    # RSS et mémoire anonyme (privée au processus, hors pages de fichiers partageables)
+    with open('/proc/self/smaps_rollup') as f:
+        fields = dict(line.split(':', 1) for line in f if line.rstrip().endswith('kB'))
+    return {{key: int(fields[key].split()[0]) / 1024 for key in ('Rss', 'Anonymous')}}
+
+def p50(func, texts, iterations=3):
+    latencies = []
+    for _ in range(iterations):
+        for text in texts:
+            start = time.perf_counter()
+            func(text)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+with open({dataset!r}, 'r', encoding='utf-8') as f:
+    data = json.load(f)
+texts = [example for intent_data in data['intents'] for example in intent_data['examples']]
+labels = [intent_data['intent'] for intent_data in data['intents'] for _ in intent_data['examples']]
+
+memory_start = memory_mb()
+classifier = IntentClassifier(model_name={model_path!r}, quantize={quantize})
+assert classifier.load_trained_model({model_path!r})
+extractor = EntityExtractor(model_name={ner_model!r}, quantize={quantize})
+extractor.load_model()
+
+intents = [result['intent'] for result in classifier.predict_batch(texts)]
+entities = [[(e['text'], e['type']) for e in found] for found in extractor.extract_entities_ner_batch(texts)]
+intent_ms = p50(classifier.predict_intent_with_confidence, texts[:30])
+ner_ms = p50(lambda text: extractor.extract_entities_ner_batch([text]), texts[:30])
+
+# RSS en régime établi : après inférence (poids mmappés effectivement chargés)
+gc.collect()
+memory = memory_mb()
+print("RESULT " + json.dumps({{
+    'accuracy': sum(i == l for i, l in zip(intents, labels)) / len(labels),
+    'intents': intents,
+    'entities': entities,
+    'size_mb': model_size_mb(classifier.model) + model_size_mb(extractor.model),
+    'rss_mb': memory['Rss'] - memory_start['Rss'],
+    'anon_mb': memory['Anonymous'] - memory_start['Anonymous'],
+    'intent_ms': intent_ms,
+    'ner_ms': ner_ms
+}}))
+"""
+
+
+def run_trial(args, quantize):
+    """
+    Lance la mesure d'un mode dans un processus neuf et retourne ses résultats
+    """
+    code = TRIAL.format(dataset=args.dataset, model_path=args.model_path, ner_model=args.ner_model, quantize=quantize)
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    line = next(line for line in output.splitlines() if line.startswith("RESULT "))
+    return json.loads(line[len("RESULT "):])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-path", default="./intent_model")
+    parser.add_argument("--ner-model", default="dslim/bert-base-NER")
+    parser.add_argument("--dataset", default="dataset_bancaire.json")
+    args = parser.parse_args()
+
+    results = {"float32": run_trial(args, False), "int8": run_trial(args, True)}
+
+    print(f"{'mode':<10}{'exactitude':>12}{'poids (Mo)':>12}{'RSS (Mo)':>10}{'anonyme (Mo)':>14}"
+          f"{'intent p50':>12}{'NER p50':>10}")
+    for mode, result in results.items():
+        print(f"{mode:<10}{result['accuracy']:>12.1%}{result['size_mb']:>12.1f}{result['rss_mb']:>10.1f}"
+              f"{result['anon_mb']:>14.1f}{result['intent_ms']:>10.2f}ms{result['ner_ms']:>8.2f}ms")
+
+    reference, quantized = results["float32"], results["int8"]
+    intent_agreement = sum(a == b for a, b in zip(reference['intents'], quantized['intents'])) / len(reference['intents'])
+    entity_agreement = sum(a == b for a, b in zip(reference['entities'], quantized['entities'])) / len(reference['entities'])
+    print(f"\nConcordance float32/int8 : intents {intent_agreement:.1%}, entités NER {entity_agreement:.1%}")
+    print(f"⚡ RSS par worker : {quantized['rss_mb'] - reference['rss_mb']:+.0f} Mo, "
+          f"latence intent : x{reference['intent_ms'] / quantized['intent_ms']:.2f}, "
+          f"NER : x{reference['ner_ms'] / quantized['ner_ms']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmark de la génération des réponses : construction à chaque appel
+(concaténations sur self.product_info, chaîne littérale reconstruite) vs réponses
+rendues une fois par ResponseTemplates (seuls les montants des simulations sont formatés).
+
+Usage :
+    python -m benchmarks.bench_response_templates --iterations 100000
+"""
+
+import argparse
+import time
+
+from chatbot_bancaire import ChatbotBancaire
+
+SIMULATION = {'mensualite': 994.78, 'total_rembourse': 59687.08, 'interets': 9687.08}
+
+
+def legacy_product_info(product_info, credit_type):
+    """
+    Implémentation d'origine de generate_product_info_response
+    """
+    if credit_type and credit_type in product_info:
+        product = product_info[credit_type]
+        response = f"""🏦 **{product['name']}**
+
+📝 **Description :**
+{product['description']}
+
+📊 **Caractéristiques :**
+"""
+        for feature in product['features']:
+            response += f"• {feature}\n"
+        response += "\n✅ **Avantages :**\n"
+        for advantage in product['advantages']:
+            response += f"• {advantage}\n"
+        response += f"\n💡 **Conseil :** Souhaitez-vous une simulation personnalisée pour ce type de crédit ?"
+        return response
+
+    response = "🏦 **Tous nos produits de crédit :**\n\n"
+    for product in product_info.values():
+        response += f"**{product['name']}**\n"
+        response += f"📝 Description : {product['description']}\n"
+        response += "📊 Caractéristiques :\n"
+        for feature in product['features']:
+            response += f"• {feature}\n"
+        response += "✅ Avantages :\n"
+        for advantage in product['advantages']:
+            response += f"• {advantage}\n"
+        response += "\n"
+    return response
+
+
+def legacy_simulation(simulation):
+    """
+    Formatage d'origine d'une simulation (f-string puis ajout de la proposition d'assurance)
+    """
+    response = (
+        f"💰 Mensualité : {simulation['mensualite']} €\n"
+        f"💵 Total remboursé : {simulation['total_rembourse']} €\n"
+        f"📊 Intérêts : {simulation['interets']} €"
+    )
+    response += "\n\nSouhaitez-vous ajouter une assurance emprunteur à cette simulation ?"
+    return response
+
+
+def measure(function, iterations):
+    """
+    Retourne la durée moyenne d'un appel en µs
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+
+    chatbot = ChatbotBancaire()
+    context = ChatbotBancaire.new_context()
+    templates = chatbot.templates
+    cases = {
+        "tous les produits": (
+            lambda: legacy_product_info(chatbot.product_info, None),
+            lambda: chatbot.generate_product_info_response({}, context)
+        ),
+        "fiche produit": (
+            lambda: legacy_product_info(chatbot.product_info, 'immobilier'),
+            lambda: chatbot.generate_product_info_response({'type_credit': 'immobilier'}, context)
+        ),
+        "simulation": (
+            lambda: legacy_simulation(SIMULATION),
+            lambda: templates.format_simulation(SIMULATION, insurance_offer=True)
+        )
+    }
+
+    speedups = {}
+    print(f"\n{'réponse':<20}{'avant (µs)':>12}{'après (µs)':>12}{'gain':>8}")
+    for name, (legacy, current) in cases.items():
+        assert legacy() == current()
+        before = measure(legacy, args.iterations)
+        after = measure(current, args.iterations)
+        speedups[name] = before / after
+        print(f"{name:<20}{before:>12.2f}{after:>12.2f}{speedups[name]:>7.1f}x")
+
+    print(f"\n⚡ Liste des produits : {speedups['tous les produits']:.0f}x plus rapide "
+          f"(chaîne rendue une fois, aucune construction par requête)")
+
+
+if __name__ == "__main__":
+    main()
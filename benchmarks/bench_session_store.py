@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Latence aller-retour (lecture + écriture) d'un contexte de conversation par backend :
+mémoire du processus, sérialisation seule, SQLite et Redis (serveur RESP local
+ou --redis-url). Affiche aussi la taille sérialisée d'un contexte.
+
+Usage :
+    python -m benchmarks.bench_session_store --sessions 1000
+    python -m benchmarks.bench_session_store --redis-url redis://localhost:6379/0
+"""
+
+import argparse
+import json
+import os
+import pickle
+import statistics
+import tempfile
+import time
+
+from chatbot_bancaire import ChatbotBancaire
+from context_store import ConversationContextStore
+from fake_redis import FakeRedisServer
+from session_store import (ExternalContextStore, MemorySessionBackend, RedisSessionBackend,
+                           SQLiteSessionBackend, serialize_context)
+
+SIMULATION = {'mensualite': 994.78, 'total_rembourse': 59687.08, 'interets': 9687.08}
+
+
+def turn(store, user_id):
+    """
+    Un message : lecture du contexte, mise à jour, enregistrement
+    """
+    with store.session(user_id) as context:
+        context['conversation_count'] += 1
+        context['last_intent'] = 'simulation_credit'
+        context['last_entities'] = {'montant': 50000.0, 'duree': 5, 'type_credit': 'personnel'}
+        context['simulation_history'].append(dict(SIMULATION))
+
+
+def measure(store, sessions, rounds):
+    """
+    Retourne les latences (µs) d'un message, sur `rounds` messages par session
+    """
+    latencies = []
+    for _ in range(rounds):
+        for i in range(sessions):
+            start = time.perf_counter()
+            turn(store, f"user-{i}")
+            latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=6)
+    parser.add_argument("--redis-url", default=None, help="serveur Redis réel (sinon serveur RESP local)")
+    args = parser.parse_args()
+
+    server = None
+    redis_url = args.redis_url
+    if redis_url is None:
+        server = FakeRedisServer().start()
+        redis_url = server.url
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stores = {
+            "mémoire": ConversationContextStore(ChatbotBancaire.new_context),
+            "sérialisation": ExternalContextStore(MemorySessionBackend(), ChatbotBancaire.new_context),
+            "sqlite": ExternalContextStore(SQLiteSessionBackend(os.path.join(tmp, "sessions.db")),
+                                           ChatbotBancaire.new_context),
+            "redis": ExternalContextStore(RedisSessionBackend(redis_url), ChatbotBancaire.new_context)
+        }
+
+        print(f"{'backend':<16}{'p50 (µs)':>10}{'p95 (µs)':>10}")
+        for name, store in stores.items():
+            latencies = measure(store, args.sessions, args.rounds)
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            print(f"{name:<16}{statistics.median(latencies):>10.1f}{p95:>10.1f}")
+
+    if server is not None:
+        server.stop()
+
+    context = stores["mémoire"].get("user-0")
+    print(f"\nTaille d'un contexte (5 simulations) : compacte {len(serialize_context(context))} o, "
+          f"JSON {len(json.dumps(context.to_dict()).encode('utf-8'))} o, "
+          f"pickle {len(pickle.dumps(context.to_dict()))} o")
+
+
+if __name__ == "__main__":
+    main()
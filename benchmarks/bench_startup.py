@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Mesure reproductible du démarrage à froid du chatbot.
+
+Chaque essai s'exécute dans un nouveau processus Python et mesure :
+  - l'import des modules,
+  - ChatbotBancaire() + load_models() (différé ou --preload),
+  - la première réponse à une question de support,
+  - la première simulation de crédit.
+
+Usage :
+    python -m benchmarks.bench_startup --runs 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+TRIAL = """
+import json, time
+start = time.perf_counter()
+from chatbot_bancaire import ChatbotBancaire
+imported = time.perf_counter()
+chatbot = ChatbotBancaire()
+chatbot.load_models({model_path!r}, preload={preload})
+ready = time.perf_counter()
+chatbot.process_message("Comment contacter un conseiller ?", verbose=False)
+first_answer = time.perf_counter()
+chatbot.process_message("Je voudrais simuler un crédit personnel de 50 000€ sur 5 ans", verbose=False)
+first_simulation = time.perf_counter()
+print("RESULT " + json.dumps({{
+    'import': imported - start,
+    'ready': ready - imported,
+    'first_answer': first_answer - ready,
+    'first_simulation': first_simulation - first_answer,
+    'total': first_simulation - start
+}}))
+"""
+
+
+def run_trial(model_path, preload):
+    """
+    Lance un essai dans un processus neuf et retourne ses temps (s)
+    """
+    code = TRIAL.format(model_path=model_path, preload=preload)
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    line = next(line for line in output.splitlines() if line.startswith("RESULT "))
+    return json.loads(line[len("RESULT "):])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-path", default="./intent_model")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    phases = ['import', 'ready', 'first_answer', 'first_simulation', 'total']
+    print(f"{'mode':<10}" + "".join(f"{phase:>18}" for phase in phases))
+    for preload in (False, True):
+        trials = [run_trial(args.model_path, preload) for _ in range(args.runs)]
+        medians = [statistics.median(trial[phase] for trial in trials) for phase in phases]
+        mode = "preload" if preload else "lazy"
+        print(f"{mode:<10}" + "".join(f"{value:>17.3f}s" for value in medians))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Résolution du TAEG actuariel sur une grille montants × durées × taux :
+boucle scalaire (une résolution par cellule) vs Newton vectorisé en un appel.
+
+Usage :
+    python -m benchmarks.bench_taeg
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from credit_calculator import CreditCalculator, _taeg_memoise
+
+
+def measure(func, iterations):
+    """
+    Retourne le temps moyen par appel (ms)
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--amounts", type=int, default=50)
+    parser.add_argument("--durations", type=int, default=25)
+    parser.add_argument("--rates", type=int, default=40)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    calculator = CreditCalculator(10000, 20, 3.5)
+    amounts = np.linspace(5000, 500000, args.amounts)
+    durations = np.arange(1, args.durations + 1)
+    rates = np.linspace(0.5, 12, args.rates)
+    cells = amounts.size * durations.size * rates.size
+
+    def scalar_loop():
+        _taeg_memoise.cache_clear()
+        for amount in amounts:
+            for duration in durations:
+                for rate in rates:
+                    calculator.calculer_taeg(amount, duration, rate, 300, 10)
+
+    def vectorized():
+        calculator.calculer_taeg_grid(
+            amounts[:, None, None], durations[None, :, None], rates[None, None, :], 300, 10
+        )
+
+    scalar = measure(scalar_loop, 1)
+    grid = measure(vectorized, args.iterations)
+    cached = measure(lambda: calculator.calculer_taeg(200000, 20, 3.5, 300, 10), 10000)
+
+    print(f"Grille : {cells} cellules")
+    print(f"boucle scalaire      : {scalar:10.2f} ms")
+    print(f"Newton vectorisé     : {grid:10.2f} ms")
+    print(f"appel mémoïsé        : {cached * 1000:10.2f} µs")
+    print(f"\n⚡ Accélération : x{scalar / grid:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,76 @@
 import json
+import threading
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from intent_classifier import IntentClassifier
 from entity_extractor import EntityExtractor
 from credit_calculator import CreditCalculator
 from simple_intent_classifier import SimpleIntentClassifier
+from intent_router import CascadeIntentRouter
+from message_cache import MessageAnalysisCache
+from context_store import ConversationContextStore
+from conversation_state import ConversationState
+from response_templates import ResponseTemplates
 
 class ChatbotBancaire:
-    def __init__(self):
+    def __init__(self, routing_mode: str = "transformer", cascade_threshold: float = 0.25,
+                 cache_size: int = 1024, cache_ttl: float = 3600.0,
+                 intent_backend: str = "torch", onnx_threads: int = 0, quantize_models: bool = False,
+                 session_ttl: float = 3600.0, max_sessions: int = 100000, context_store=None,
+                 ner_model: str = "dslim/bert-base-NER"):
         """
-        Initialise le chatbot bancaire avec tous ses composants
+        Initialise le chatbot bancaire avec tous ses composants.
+        Les modèles Hugging Face ne sont chargés qu'à leur première utilisation
+        (ou par load_models(preload=True))
+        
+        Args:
+            routing_mode: "transformer" (DistilBERT pour chaque message) ou "cascade"
+                (classificateur par mots-clés d'abord, DistilBERT si le message est ambigu)
+            cascade_threshold: écart de score minimal pour le chemin rapide en mode cascade
+            cache_size: nombre d'analyses de messages gardées en cache (0 pour désactiver)
+            cache_ttl: durée de vie d'une analyse en cache, en secondes
+            intent_backend: "torch", "onnx" (ONNX Runtime), "student" (élève distillé)
+                ou "knn" (plus proches voisins) pour le modèle d'intent
+            onnx_threads: threads intra-op d'ONNX Runtime (0 : nombre de cœurs physiques)
+            quantize_models: quantification dynamique int8 des modèles PyTorch (intent et NER)
+            session_ttl: durée d'inactivité avant expiration d'un contexte de conversation, en secondes
+            max_sessions: nombre maximal de contextes de conversation conservés
+            context_store: store de contextes à utiliser à la place du store en mémoire
+                (voir session_store.create_context_store pour SQLite et Redis)
+            ner_model: modèle NER Hugging Face (nom ou dossier local)
         """
         print("🏦 Initialisation du Chatbot Bancaire...")
         
-        # Initialisation des composants
-        self.intent_classifier = IntentClassifier()
+        # Initialisation des composants (modèles chargés à la demande)
+        self._intent_classifier = None
+        self._entity_extractor = None
+        self._load_lock = threading.RLock()
+        self.intent_backend = intent_backend
+        self.onnx_threads = onnx_threads
+        self.quantize_models = quantize_models
+        self.ner_model = ner_model
+        self.intent_model_path = "./intent_model"
+        self.intent_model_loaded = False
         self.simple_classifier = SimpleIntentClassifier()  # Classificateur de secours
-        self.entity_extractor = EntityExtractor()
         self.credit_calculator = CreditCalculator(10000,20,3.5)
         self.use_simple_classifier = False  # Flag pour basculer vers le classificateur simple
         
-        # Contexte de conversation
-        self.conversation_context = {}
+        # Cache des analyses (intent + entités) des messages répétés
+        self.analysis_cache = MessageAnalysisCache(max_size=cache_size, ttl=cache_ttl)
+        
+        # Routage en cascade (mots-clés puis Transformer)
+        self.intent_router = None
+        if routing_mode == "cascade":
+            self.intent_router = CascadeIntentRouter(
+                self.simple_classifier,
+                lambda: self.intent_classifier,
+                threshold=cascade_threshold
+            )
+        
+        # Contexte de conversation (partagé entre threads, sessions inactives expirées)
+        self.conversation_context = context_store or ConversationContextStore(
+            self.new_context, ttl=session_ttl, max_sessions=max_sessions
+        )
         
         # Réponses types pour chaque intent
         self.responses = {
@@ -46,7 +95,7 @@ class ChatbotBancaire:
             }
         }
         
-        # Informations sur les produits
+        # Informations sur les produits (les réponses produits sont rendues à l'affectation)
         self.product_info = {
             'personnel': {
                 'name': 'Crédit Personnel',
@@ -76,100 +125,269 @@ class ChatbotBancaire:
         
         print("✅ Chatbot Bancaire initialisé avec succès !")
     
-    def load_models(self, intent_model_path: str = "./intent_model") -> bool:
+    @property
+    def product_info(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Catalogue des produits de crédit
+        """
+        return self._product_info
+    
+    @product_info.setter
+    def product_info(self, product_info: Dict[str, Dict[str, Any]]):
+        self._product_info = product_info
+        self.reload_product_catalog()
+    
+    def reload_product_catalog(self, product_info: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Rend à nouveau les réponses précompilées (nouveau catalogue, ou catalogue
+        courant modifié en place)
         """
-        Charge les modèles entraînés avec fallback vers le classificateur simple
+        if product_info is not None:
+            self._product_info = product_info
+        # Incrémentée à chaque rechargement (invalidation des réponses /api/products encodées)
+        self.catalog_version = getattr(self, 'catalog_version', 0) + 1
+        if getattr(self, 'templates', None) is None:
+            self.templates = ResponseTemplates(self._product_info)
+        else:
+            self.templates.render(self._product_info)
+    
+    @property
+    def intent_classifier(self) -> IntentClassifier:
         """
-        print("🔄 Chargement des modèles...")
+        Classifieur d'intents, créé à la première utilisation
+        """
+        if self._intent_classifier is None:
+            with self._load_lock:
+                if self._intent_classifier is None:
+                    self._intent_classifier = IntentClassifier(
+                        backend=self.intent_backend, onnx_threads=self.onnx_threads,
+                        quantize=self.quantize_models
+                    )
+        return self._intent_classifier
+    
+    @property
+    def entity_extractor(self) -> EntityExtractor:
+        """
+        Extracteur d'entités, créé à la première utilisation
+        """
+        if self._entity_extractor is None:
+            with self._load_lock:
+                if self._entity_extractor is None:
+                    self._entity_extractor = EntityExtractor(self.ner_model, quantize=self.quantize_models)
+        return self._entity_extractor
+    
+    def load_models(self, intent_model_path: str = "./intent_model", preload: bool = False) -> bool:
+        """
+        Prépare le chargement des modèles entraînés (différé jusqu'au premier message).
+        Avec preload=True, les modèles sont chargés immédiatement (échauffement des workers)
+        """
+        self.intent_model_path = intent_model_path
+        self.intent_model_loaded = False
+        self.use_simple_classifier = False
         
-        # Tentative de chargement du modèle d'intent avancé
-        try:
-            intent_loaded = self.intent_classifier.load_trained_model(intent_model_path)
+        # Les analyses en cache viennent peut-être d'un autre modèle
+        self.analysis_cache.clear()
+        
+        if preload:
+            self.ensure_intent_model()
+            if not self.use_simple_classifier:
+                try:
+                    self.entity_extractor.preload()
+                except Exception as e:
+                    print(f"⚠️  Erreur lors du chargement du modèle NER : {e}")
+            print("✅ Modèles chargés avec succès !")
+        else:
+            print("✅ Modèles prêts (chargement à la première utilisation)")
+        return True
+    
+    def ensure_intent_model(self):
+        """
+        Charge le modèle d'intent avec fallback vers le classificateur simple (une seule fois)
+        """
+        if self.intent_model_loaded:
+            return
+        
+        with self._load_lock:
+            if self.intent_model_loaded:
+                return
             
-            if not intent_loaded:
-                print("⚠️  Modèle d'intent non trouvé. Entraînement en cours...")
-                self.intent_classifier.train()
-                intent_loaded = True
-                
-            if intent_loaded:
-                print("✅ Modèle d'intent avancé chargé !")
-                self.use_simple_classifier = False
+            print("🔄 Chargement des modèles...")
+            
+            # Tentative de chargement du modèle d'intent avancé
+            try:
+                intent_loaded = self.intent_classifier.load_trained_model(self.intent_model_path)
                 
+                if not intent_loaded:
+                    print("⚠️  Modèle d'intent non trouvé. Entraînement en cours...")
+                    self.intent_classifier.train()
+                    intent_loaded = True
+                    
+                if intent_loaded:
+                    print("✅ Modèle d'intent avancé chargé !")
+                    self.use_simple_classifier = False
+                    
+            except Exception as e:
+                print(f"⚠️  Erreur avec le modèle avancé : {e}")
+                print("🔄 Basculement vers le classificateur simple...")
+                self.use_simple_classifier = True
+            
+            if self.use_simple_classifier:
+                print("✅ Classificateur simple activé !")
+            
+            self.intent_model_loaded = True
+    
+    def analyze_message(self, message: str) -> Dict[str, Any]:
+        """
+        Classifie l'intent et extrait les entités d'un message (sans contexte).
+        Les messages déjà vus (après normalisation) sont servis par le cache
+        """
+        self.ensure_intent_model()
+        
+        analysis = self.analysis_cache.get(message)
+        if analysis is None:
+            analysis = self._analyze_uncached(message)
+            # Les analyses dégradées (modèle indisponible, NER en erreur) ne sont pas
+            # conservées : le message sera réanalysé quand les modèles répondront
+            if not analysis.get('degraded'):
+                self.analysis_cache.put(message, analysis)
+        return analysis
+    
+    def _analyze_uncached(self, message: str) -> Dict[str, Any]:
+        """
+        Analyse d'un message par les modèles
+        """
+        # Classification de l'intent avec fallback
+        if self.use_simple_classifier:
+            return self._analyze_simple(message)
+        
+        # Tentative avec le modèle avancé (précédé du chemin rapide en mode cascade)
+        try:
+            if self.intent_router is not None:
+                intent_result = self.intent_router.route(message)
+            else:
+                intent_result = self.intent_classifier.predict_intent_with_confidence(message)
         except Exception as e:
-            print(f"⚠️  Erreur avec le modèle avancé : {e}")
+            print(f"❌ Erreur lors de la classification d'intent : {e}")
             print("🔄 Basculement vers le classificateur simple...")
             self.use_simple_classifier = True
+            return self._analyze_simple(message)
         
-        if self.use_simple_classifier:
-            print("✅ Classificateur simple activé !")
-        
-        print("✅ Modèles chargés avec succès !")
-        return True
+        return self._analyze_with_intent(message, intent_result)
     
-    def process_message(self, message: str, user_id: str = "default") -> Dict[str, Any]:
+    def analyze_messages(self, messages: List[str], batch_size: int = 32) -> List[Dict[str, Any]]:
         """
-        Traite un message utilisateur et retourne la réponse
+        Analyse une liste de messages par lots (intents puis entités NER) ;
+        seuls les messages absents du cache passent par les modèles
         """
-        print(f"\n👤 Utilisateur ({user_id}): {message}")
-        
-        # Initialisation du contexte utilisateur si nécessaire
-        if user_id not in self.conversation_context:
-            self.conversation_context[user_id] = {
-                'last_intent': None,
-                'last_entities': {},
-                'simulation_history': [],
-                'conversation_count': 0
-            }
-        
-        context = self.conversation_context[user_id]
-        context['conversation_count'] += 1
-        
-        # Classification de l'intent avec fallback
-        if self.use_simple_classifier:
-            # Utilisation du classificateur simple
-            simple_result = self.simple_classifier.predict(message)
-            intent = simple_result['intent']
-            confidence = simple_result['confidence']
-            entities = simple_result['entities']
-            entity_confidence = confidence  # Même confiance pour les entités simples
-        else:
-            # Tentative avec le modèle avancé
+        self.ensure_intent_model()
+        
+        analyses = [self.analysis_cache.get(message) for message in messages]
+        missing = [i for i, analysis in enumerate(analyses) if analysis is None]
+        if missing:
+            missing_analyses = self._analyze_batch_uncached([messages[i] for i in missing], batch_size)
+            for i, analysis in zip(missing, missing_analyses):
+                analyses[i] = analysis
+                if not analysis.get('degraded'):
+                    self.analysis_cache.put(messages[i], analysis)
+        return analyses
+    
+    def _analyze_batch_uncached(self, messages: List[str], batch_size: int) -> List[Dict[str, Any]]:
+        """
+        Analyse d'une liste de messages par les modèles
+        """
+        if not self.use_simple_classifier:
             try:
-                intent_result = self.intent_classifier.predict_intent_with_confidence(message)
-                intent = intent_result['intent']
-                confidence = intent_result['confidence']
+                if self.intent_router is not None:
+                    intent_results = self.intent_router.route_batch(messages, batch_size=batch_size)
+                else:
+                    intent_results = self.intent_classifier.predict_batch(messages, batch_size=batch_size)
             except Exception as e:
-                print(f"❌ Erreur lors de la classification d'intent : {e}")
+                print(f"❌ Erreur lors de la classification d'intent par lots : {e}")
                 print("🔄 Basculement vers le classificateur simple...")
                 self.use_simple_classifier = True
-                simple_result = self.simple_classifier.predict(message)
-                intent = simple_result['intent']
-                confidence = simple_result['confidence']
-                entities = simple_result['entities']
-                entity_confidence = confidence
-            
-            # Extraction des entités (seulement si modèle avancé fonctionne)
-            if not self.use_simple_classifier:
+            else:
                 try:
-                    entity_result = self.entity_extractor.extract_entities_with_validation(message)
-                    entities = entity_result['validated_entities']
-                    entity_confidence = entity_result['confidence']
+                    entity_results = self.entity_extractor.extract_entities_with_validation_batch(
+                        messages, batch_size=batch_size
+                    )
                 except Exception as e:
-                    print(f"❌ Erreur lors de l'extraction d'entités : {e}")
-                    # Fallback vers l'extraction simple
-                    entities = self.simple_classifier.extract_entities(message)
-                    entity_confidence = 0.5
+                    print(f"❌ Erreur lors de l'extraction d'entités par lots : {e}")
+                    entity_results = [None] * len(messages)
+                
+                return [
+                    self._analyze_with_intent(message, intent_result, entity_result)
+                    for message, intent_result, entity_result in zip(messages, intent_results, entity_results)
+                ]
+        
+        return [self._analyze_simple(message) for message in messages]
+    
+    def _analyze_simple(self, message: str) -> Dict[str, Any]:
+        """
+        Analyse d'un message avec le classificateur simple
+        """
+        simple_result = self.simple_classifier.predict(message)
+        return {
+            'intent': simple_result['intent'],
+            'confidence': simple_result['confidence'],
+            'entities': simple_result['entities'],
+            'entity_confidence': simple_result['confidence'],  # Même confiance pour les entités simples
+            'classifier': 'simple',
+            'degraded': True  # Repli faute de modèle avancé
+        }
+    
+    def _analyze_with_intent(self, message: str, intent_result: Dict[str, Any],
+                             entity_result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Complète le résultat du modèle avancé avec l'extraction d'entités
+        """
+        degraded = False
+        try:
+            if entity_result is None:
+                entity_result = self.entity_extractor.extract_entities_with_validation(message)
+            entities = entity_result['validated_entities']
+            entity_confidence = entity_result['confidence']
+        except Exception as e:
+            print(f"❌ Erreur lors de l'extraction d'entités : {e}")
+            # Fallback vers l'extraction simple
+            entities = self.simple_classifier.extract_entities(message)
+            entity_confidence = 0.5
+            degraded = True
         
-        # Mise à jour du contexte
-        context['last_intent'] = intent
-        context['last_entities'] = entities
+        return {
+            'intent': intent_result['intent'],
+            'confidence': intent_result['confidence'],
+            'entities': entities,
+            'entity_confidence': entity_confidence,
+            'classifier': intent_result.get('classifier', 'transformer'),
+            'degraded': degraded
+        }
+    
+    @staticmethod
+    def new_context() -> ConversationState:
+        """
+        Contexte d'une nouvelle conversation (objet à __slots__, accessible comme un dict)
+        """
+        return ConversationState()
+    
+    def process_message(self, message: str, user_id: str = "default",
+                        analysis: Optional[Dict[str, Any]] = None, verbose: bool = True) -> Dict[str, Any]:
+        """
+        Traite un message utilisateur et retourne la réponse.
+        Une analyse déjà calculée (intent, entités) peut être fournie
+        """
+        if verbose:
+            print(f"\n👤 Utilisateur ({user_id}): {message}")
         
-        # Génération de la réponse
-        response = self.generate_response(intent, entities, context, confidence, entity_confidence,user_id)
+        # L'analyse ne dépend pas du contexte : elle se fait hors du verrou de la session
+        if analysis is None:
+            analysis = self.analyze_message(message)
+        intent = analysis['intent']
+        confidence = analysis['confidence']
+        entities = analysis['entities']
+        entity_confidence = analysis['entity_confidence']
         
-        # Sauvegarde de la simulation si applicable
-        if intent == 'simulation_credit' and entities:
-            self.save_simulation(user_id, entities, response)
+        chunks, context_snapshot = self.respond(user_id, analysis)
+        response = ''.join(chunks)
         
         result = {
             'intent': intent,
@@ -177,42 +395,127 @@ class ChatbotBancaire:
             'entities': entities,
             'entity_confidence': entity_confidence,
             'response': response,
-            'context': context
+            'context': context_snapshot
         }
         
-        print(f"🤖 Chatbot: {response}")
+        if verbose:
+            print(f"🤖 Chatbot: {response}")
         return result
     
+    def respond(self, user_id: str, analysis: Dict[str, Any]) -> tuple:
+        """
+        Met à jour le contexte de l'utilisateur avec une analyse et génère la réponse.
+        Retourne (morceaux de la réponse, copie du contexte)
+        """
+        intent = analysis['intent']
+        entities = analysis['entities']
+        
+        # Accès exclusif au contexte de l'utilisateur (créé si nécessaire)
+        with self.conversation_context.session(user_id) as context:
+            context['conversation_count'] += 1
+            
+            # Mise à jour du contexte
+            context['last_intent'] = intent
+            context['last_entities'] = entities
+            
+            # Génération de la réponse (morceaux assemblés sous le verrou, envoyés après)
+            chunks = list(self.iter_response(intent, entities, context, analysis['confidence'],
+                                             analysis['entity_confidence'], user_id,
+                                             classifier=analysis.get('classifier')))
+            
+            # Sauvegarde de la simulation si applicable
+            if intent == 'simulation_credit' and entities:
+                self.save_simulation(user_id, entities, ''.join(chunks))
+            
+            # Copie du contexte : il peut être modifié par une autre requête après la sortie du verrou
+            return chunks, context.to_dict()
+    
+    def stream_message(self, message: str, user_id: str = "default",
+                       analysis: Optional[Dict[str, Any]] = None) -> Iterator[tuple]:
+        """
+        Traite un message et produit la réponse sous forme d'événements (event, données) :
+        ('analysis', intent et entités), puis ('token', morceau) pour chaque morceau
+        de la réponse, puis ('done', contexte)
+        """
+        if analysis is None:
+            analysis = self.analyze_message(message)
+        yield 'analysis', {
+            'intent': analysis['intent'],
+            'confidence': analysis['confidence'],
+            'entities': analysis['entities'],
+            'entity_confidence': analysis['entity_confidence']
+        }
+        
+        chunks, context_snapshot = self.respond(user_id, analysis)
+        for chunk in chunks:
+            yield 'token', chunk
+        yield 'done', {'context': context_snapshot}
+    
+    def process_messages(self, messages: List[str], user_ids: Optional[List[str]] = None,
+                         batch_size: int = 32) -> List[Dict[str, Any]]:
+        """
+        Traite une liste de messages (rejeu de logs, scoring hors ligne).
+        Les intents sont classifiés par lots puis les messages sont traités
+        dans l'ordre, afin de conserver l'évolution du contexte de chaque utilisateur
+        """
+        messages = list(messages)
+        if user_ids is None:
+            user_ids = ["default"] * len(messages)
+        user_ids = list(user_ids)
+        if len(user_ids) != len(messages):
+            raise ValueError(
+                f"user_ids doit contenir un identifiant par message ({len(user_ids)} pour {len(messages)} messages)"
+            )
+        
+        analyses = self.analyze_messages(messages, batch_size=batch_size)
+        
+        return [
+            self.process_message(message, user_id, analysis=analysis, verbose=False)
+            for message, user_id, analysis in zip(messages, user_ids, analyses)
+        ]
+    
     def generate_response(self, intent: str, entities: Dict[str, Any], context: Dict[str, Any], 
-                         intent_confidence: float, entity_confidence: float, user_id: str) -> str:
+                         intent_confidence: float, entity_confidence: float, user_id: str,
+                         classifier: Optional[str] = None) -> str:
         """
         Génère une réponse adaptée selon l'intent et les entités
         """
+        return ''.join(self.iter_response(intent, entities, context, intent_confidence, entity_confidence,
+                                          user_id, classifier=classifier))
+    
+    def iter_response(self, intent: str, entities: Dict[str, Any], context: Dict[str, Any], 
+                      intent_confidence: float, entity_confidence: float, user_id: str,
+                      classifier: Optional[str] = None) -> Iterator[str]:
+        """
+        Génère la réponse par morceaux (paragraphes, blocs produits) pour l'envoi en streaming
+        """
         # Vérification de la confiance (seuil adapté selon le classificateur utilisé)
-        confidence_threshold = 0.1 if self.use_simple_classifier else 0.5
+        if classifier is None:
+            classifier = 'simple' if self.use_simple_classifier else 'transformer'
+        confidence_threshold = 0.1 if classifier == 'simple' else 0.5
         if intent_confidence < confidence_threshold:
-            return "Je ne suis pas sûr de bien comprendre votre demande. Pouvez-vous reformuler ?"
+            yield "Je ne suis pas sûr de bien comprendre votre demande. Pouvez-vous reformuler ?"
         
-        if intent == 'simulation_credit':
-            return self.generate_simulation_response(user_id,entities, context)
+        elif intent == 'simulation_credit':
+            yield self.generate_simulation_response(user_id,entities, context)
         
         elif intent == 'demande_credit':
-            return self.generate_credit_request_response(entities, context)
+            yield self.generate_credit_request_response(entities, context)
         
         elif intent == 'information_produit':
-            return self.generate_product_info_response(entities, context)
+            yield from self.iter_product_info_response(entities, context)
         
         elif intent == 'calcul_financier':
-            return self.generate_financial_calc_response(entities, context)
+            yield self.generate_financial_calc_response(entities, context)
         
         elif intent == 'support_client':
-            return self.generate_support_response(entities, context)
+            yield from self.iter_support_response(entities, context)
         
         elif intent == 'modification_simulation':
-            return self.generate_modification_response(entities, context)
+            yield self.generate_modification_response(entities, context)
         
         else:
-            return "Je ne comprends pas votre demande. Pouvez-vous reformuler ?"
+            yield "Je ne comprends pas votre demande. Pouvez-vous reformuler ?"
     
     def generate_simulation_response(self,user_id: str, entities: Dict[str, Any], context: Dict[str, Any]) -> str:
         """
@@ -244,12 +547,10 @@ class ChatbotBancaire:
                 with_insurance=with_insurance
             )
             
-            # Formatage de la réponse
-            response = self.credit_calculator.format_simulation_result(simulation)
-            
-            # Ajout d'une proposition d'assurance si pas déjà incluse
-            if not with_insurance and credit_type != 'immobilier':
-                response += "\n\nSouhaitez-vous ajouter une assurance emprunteur à cette simulation ?"
+            # Formatage de la réponse, avec proposition d'assurance si pas déjà incluse
+            response = self.templates.format_simulation(
+                simulation, insurance_offer=not with_insurance and credit_type != 'immobilier'
+            )
             # ✅ Sauvegarde de la simulation dans l'historique
             self.save_simulation(
             user_id,
@@ -273,70 +574,30 @@ class ChatbotBancaire:
         """
         Génère une réponse pour une demande de crédit
         """
-        response = """📋 **Étapes de la demande de crédit :**
-
-1️⃣ **Vérification d'éligibilité**
-   - Revenus minimum : 1500€/mois
-   - Âge : 18-75 ans
-   - Résidence en France
-
-2️⃣ **Documents nécessaires :**
-   - Pièce d'identité
-   - Justificatifs de revenus (3 derniers bulletins)
-   - Justificatif de domicile
-   - RIB
-
-3️⃣ **Rendez-vous conseiller :**
-   Souhaitez-vous prendre rendez-vous avec un conseiller pour finaliser votre demande ?
-
-⏰ **Durée de traitement :** 48-72h après réception du dossier complet
-
-💡 **Conseil :** Avez-vous déjà fait une simulation ? C'est recommandé avant de faire votre demande."""
-        
-        return response
+        return self.templates.credit_request
     
     def generate_product_info_response(self, entities: Dict[str, Any], context: Dict[str, Any]) -> str:
         """
         Génère une réponse pour les informations sur les produits
         """
         credit_type = entities.get('type_credit', None)
+        templates = self.templates
         
-        if credit_type and credit_type in self.product_info:
-            product = self.product_info[credit_type]
-            
-            response = f"""🏦 **{product['name']}**
-
-📝 **Description :**
-{product['description']}
-
-📊 **Caractéristiques :**
-"""
-            for feature in product['features']:
-                response += f"• {feature}\n"
-            
-            response += "\n✅ **Avantages :**\n"
-            for advantage in product['advantages']:
-                response += f"• {advantage}\n"
-            
-            response += f"\n💡 **Conseil :** Souhaitez-vous une simulation personnalisée pour ce type de crédit ?"
-            
-            return response
-        else:
-            # Affiche tous les produits si aucun type précis n'est donné
-            response = "🏦 **Tous nos produits de crédit :**\n\n"
-            for product in self.product_info.values():
-                response += f"**{product['name']}**\n"
-                response += f"📝 Description : {product['description']}\n"
-                response += "📊 Caractéristiques :\n"
-                for feature in product['features']:
-                    response += f"• {feature}\n"
-                response += "✅ Avantages :\n"
-                for advantage in product['advantages']:
-                    response += f"• {advantage}\n"
-                response += "\n"
-            return response
-
-
+        if credit_type and credit_type in templates.products:
+            return templates.products[credit_type]
+        return templates.all_products
+    
+    def iter_product_info_response(self, entities: Dict[str, Any], context: Dict[str, Any]) -> Iterator[str]:
+        """
+        Réponse sur les produits, bloc par bloc (blocs rendus à l'avance)
+        """
+        credit_type = entities.get('type_credit', None)
+        templates = self.templates
+        
+        if credit_type and credit_type in templates.product_chunks:
+            return iter(templates.product_chunks[credit_type])
+        # Affiche tous les produits si aucun type précis n'est donné
+        return iter(templates.all_products_chunks)
     
     def generate_financial_calc_response(self, entities: Dict[str, Any], context: Dict[str, Any]) -> str:
         """
@@ -346,19 +607,7 @@ class ChatbotBancaire:
         if context.get('simulation_history'):
             last_simulation = context['simulation_history'][-1]
             
-            response = """💰 **Calculs financiers :**
-
-📊 **Détail des coûts :**
-• Coût du crédit (hors assurance) : {total_interest:,.0f}€
-• Frais de dossier : {filing_fees}€
-• Coût total : {total_cost:,.0f}€
-
-📈 **Comparaisons possibles :**
-• Avec/sans assurance
-• Différentes durées
-• Différents montants
-
-Que souhaitez-vous calculer précisément ?""".format(
+            response = self.templates.financial_calc.format(
                 total_interest=last_simulation.get('total_interest', 0),
                 filing_fees=last_simulation.get('filing_fees', 0),
                 total_cost=last_simulation.get('total_paid', 0)
@@ -370,7 +619,7 @@ Que souhaitez-vous calculer précisément ?""".format(
          try:
             montant = int(entities['montant'])
             duree = int(entities['duree'])
-            taux = self.credit_calculator.taux_annuel
+            taux = self.credit_calculator.get_rate(entities.get('type_credit', 'personnel'), duree)
             taeg = self.credit_calculator.calculer_taeg(montant, duree, taux)
             return f"📈 Le TAEG pour un crédit de {montant}€ sur {duree} ans à {taux}% est de **{taeg}%**."
          except Exception as e:
@@ -383,30 +632,13 @@ Que souhaitez-vous calculer précisément ?""".format(
         """
         Génère une réponse pour le support client
         """
-        response = """🔧 **Support Client**
-
-Je suis là pour vous aider ! Voici les options disponibles :
-
-📞 **Contact conseiller :**
-• Téléphone : 01 23 45 67 89
-• Horaires : Lun-Ven 9h-18h, Sam 9h-12h
-• Email : conseiller@banque.fr
-
-💬 **Chat en direct :**
-• Disponible 24h/24
-• Temps de réponse : < 2 minutes
-
-📧 **Email support :**
-• support@banque.fr
-• Réponse sous 24h
-
-🔐 **Mot de passe oublié :**
-• Cliquez sur "Mot de passe oublié" sur la page de connexion
-• Un lien de réinitialisation vous sera envoyé par email
-
-Que puis-je faire pour vous aider davantage ?"""
-        
-        return response
+        return self.templates.support
+    
+    def iter_support_response(self, entities: Dict[str, Any], context: Dict[str, Any]) -> Iterator[str]:
+        """
+        Réponse du support client, paragraphe par paragraphe
+        """
+        return iter(self.templates.support_chunks)
     
     def generate_modification_response(self, entities: Dict[str, Any], context: Dict[str, Any]) -> str:
         """
@@ -451,11 +683,9 @@ Que puis-je faire pour vous aider davantage ?"""
             )
             print(f"💾 Sauvegarde simulation pour {user_id} | montant={entities['montant']} | durée={entities['duree']}")
             
-            self.conversation_context[user_id]['simulation_history'].append(simulation)
-            
-            # Limitation de l'historique à 5 simulations
-            if len(self.conversation_context[user_id]['simulation_history']) > 5:
-                self.conversation_context[user_id]['simulation_history'].pop(0)
+            with self.conversation_context.session(user_id) as context:
+                # L'historique est un tampon circulaire : seules les 5 dernières simulations sont conservées
+                context['simulation_history'].append(simulation)
                 
         except Exception as e:
             print(f"❌ Erreur lors de la sauvegarde de la simulation : {e}")
@@ -467,14 +697,13 @@ Que puis-je faire pour vous aider davantage ?"""
         if user_id not in self.conversation_context:
             return {}
         
-        context = self.conversation_context[user_id]
-        
-        return {
-            'conversation_count': context['conversation_count'],
-            'last_intent': context['last_intent'],
-            'simulation_count': len(context['simulation_history']),
-            'last_simulation': context['simulation_history'][-1] if context['simulation_history'] else None
-        }
+        with self.conversation_context.session(user_id) as context:
+            return {
+                'conversation_count': context['conversation_count'],
+                'last_intent': context['last_intent'],
+                'simulation_count': len(context['simulation_history']),
+                'last_simulation': context['simulation_history'][-1] if context['simulation_history'] else None
+            }
 
 # Fonction pour tester le chatbot
 def test_chatbot():
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+class _Shard:
+    """
+    Partition du store : sessions dans l'ordre du dernier accès, protégées par un verrou
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.sessions = OrderedDict()  # user_id -> (dernier accès, contexte)
+
+
+class ConversationContextStore:
+    """
+    Contextes de conversation par utilisateur, partagés entre threads.
+
+    Les sessions sont réparties sur `num_shards` partitions ayant chacune son
+    verrou (lock striping) : les requêtes d'un même utilisateur sont sérialisées,
+    celles d'utilisateurs de partitions différentes s'exécutent en parallèle.
+    Les sessions inactives depuis `ttl` secondes expirent, et chaque partition
+    évince ses sessions les moins récentes au-delà de sa part de `max_sessions`.
+    """
+
+    def __init__(self, context_factory: Callable[[], Any], num_shards: int = 16,
+                 ttl: float = 3600.0, max_sessions: int = 100000):
+        """
+        Args:
+            context_factory: crée le contexte d'une nouvelle session
+            num_shards: nombre de partitions (et de verrous)
+            ttl: durée d'inactivité avant expiration d'une session, en secondes
+            max_sessions: nombre maximal de sessions conservées
+        """
+        self.context_factory = context_factory
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._shards = [_Shard() for _ in range(num_shards)]
+        self._max_per_shard = max(1, -(-max_sessions // num_shards))
+
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'created': 0,
+            'expired': 0,
+            'evicted': 0
+        }
+
+    def _shard(self, user_id: str) -> _Shard:
+        # crc32 plutôt que hash() : répartition stable d'un processus à l'autre
+        return self._shards[zlib.crc32(str(user_id).encode('utf-8')) % len(self._shards)]
+
+    def _count(self, key: str, value: int = 1):
+        if value:
+            with self._stats_lock:
+                self.stats[key] += value
+
+    def _expire(self, shard: _Shard, now: float):
+        """
+        Retire les sessions expirées d'une partition (les plus anciennes sont en tête)
+        """
+        expired = 0
+        while shard.sessions:
+            user_id, (last_access, _) = next(iter(shard.sessions.items()))
+            if now - last_access < self.ttl:
+                break
+            del shard.sessions[user_id]
+            expired += 1
+        self._count('expired', expired)
+
+    @contextmanager
+    def session(self, user_id: str) -> Iterator[Any]:
+        """
+        Donne accès exclusif au contexte d'un utilisateur (créé s'il n'existe pas) :
+
+            with store.session(user_id) as context:
+                context['conversation_count'] += 1
+        """
+        shard = self._shard(user_id)
+        with shard.lock:
+            now = time.monotonic()
+            self._expire(shard, now)
+
+            entry = shard.sessions.get(user_id)
+            if entry is None:
+                context = self.context_factory()
+                self._count('created')
+                evicted = 0
+                while len(shard.sessions) >= self._max_per_shard:
+                    shard.sessions.popitem(last=False)
+                    evicted += 1
+                self._count('evicted', evicted)
+            else:
+                context = entry[1]
+
+            shard.sessions[user_id] = (now, context)
+            shard.sessions.move_to_end(user_id)
+            yield context
+
+    def get(self, user_id: str) -> Optional[Any]:
+        """
+        Retourne le contexte d'un utilisateur sans le créer (None si absent ou expiré)
+        """
+        shard = self._shard(user_id)
+        with shard.lock:
+            entry = shard.sessions.get(user_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= self.ttl:
+                del shard.sessions[user_id]
+                self._count('expired')
+                return None
+            return entry[1]
+
+    def delete(self, user_id: str):
+        """
+        Supprime la session d'un utilisateur
+        """
+        shard = self._shard(user_id)
+        with shard.lock:
+            shard.sessions.pop(user_id, None)
+
+    def evict_expired(self):
+        """
+        Retire les sessions expirées de toutes les partitions
+        """
+        now = time.monotonic()
+        for shard in self._shards:
+            with shard.lock:
+                self._expire(shard, now)
+
+    def __contains__(self, user_id: str) -> bool:
+        return self.get(user_id) is not None
+
+    def __getitem__(self, user_id: str) -> Any:
+        context = self.get(user_id)
+        if context is None:
+            raise KeyError(user_id)
+        return context
+
+    def __len__(self) -> int:
+        return sum(len(shard.sessions) for shard in self._shards)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne les métriques du store (sessions actives, créées, expirées, évincées)
+        """
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['live_sessions'] = len(self)
+        stats['max_sessions'] = self.max_sessions
+        stats['ttl'] = self.ttl
+        stats['shards'] = len(self._shards)
+        return stats
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator
+
+# Montants d'une simulation (résultat de CreditCalculator.simulate_credit)
+SIMULATION_FIELDS = ('mensualite', 'total_rembourse', 'interets')
+
+
+class SimulationHistory:
+    """
+    Les dernières simulations d'un utilisateur dans un tampon circulaire de flottants.
+
+    Une simulation occupe trois doubles dans un seul tableau `array('d')` au lieu d'un
+    dict et de trois objets float ; les dicts ne sont reconstruits qu'à la lecture.
+    Au-delà de `MAXLEN` simulations, la plus ancienne est écrasée.
+    """
+
+    MAXLEN = 5
+    __slots__ = ('_values', '_start', '_size')
+
+    def __init__(self, simulations: Iterable[Dict[str, float]] = ()):
+        self._values = array('d', bytes(8 * 3 * self.MAXLEN))
+        self._start = 0
+        self._size = 0
+        for simulation in simulations:
+            self.append(simulation)
+
+    def append(self, simulation: Dict[str, float]):
+        """
+        Ajoute une simulation (écrase la plus ancienne si le tampon est plein)
+        """
+        if self._size < self.MAXLEN:
+            slot = (self._start + self._size) % self.MAXLEN
+            self._size += 1
+        else:
+            slot = self._start
+            self._start = (self._start + 1) % self.MAXLEN
+
+        offset = slot * 3
+        values = self._values
+        values[offset] = simulation['mensualite']
+        values[offset + 1] = simulation['total_rembourse']
+        values[offset + 2] = simulation['interets']
+
+    def extend(self, simulations: Iterable[Dict[str, float]]):
+        for simulation in simulations:
+            self.append(simulation)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Dict[str, float]:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("index de simulation hors limites")
+        offset = (self._start + index) % self.MAXLEN * 3
+        return dict(zip(SIMULATION_FIELDS, self._values[offset:offset + 3]))
+
+    def __iter__(self) -> Iterator[Dict[str, float]]:
+        for index in range(self._size):
+            yield self[index]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (SimulationHistory, list)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"SimulationHistory({list(self)!r})"
+
+
+class ConversationState:
+    """
+    Contexte de conversation d'un utilisateur, sans dict d'instance (__slots__).
+
+    S'utilise comme l'ancien dict (`context['conversation_count'] += 1`,
+    `context.get('simulation_history')`) pour ne pas changer les générateurs de réponses.
+    """
+
+    __slots__ = ('last_intent', 'last_entities', 'simulation_history', 'conversation_count')
+
+    def __init__(self):
+        self.last_intent = None
+        self.last_entities = {}
+        self.simulation_history = SimulationHistory()
+        self.conversation_count = 0
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        if key == 'simulation_history' and not isinstance(value, SimulationHistory):
+            value = SimulationHistory(value)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Copie du contexte au format dict (réponses JSON, résultat de process_message)
+        """
+        return {
+            'last_intent': self.last_intent,
+            'last_entities': dict(self.last_entities),
+            'simulation_history': list(self.simulation_history),
+            'conversation_count': self.conversation_count
+        }
+
+    def __eq__(self, other) -> bool:
+        other_dict = other.to_dict() if isinstance(other, ConversationState) else other
+        return self.to_dict() == other_dict
+
+    def __repr__(self) -> str:
+        return f"ConversationState({self.to_dict()!r})"
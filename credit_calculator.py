@@ -1,19 +1,125 @@
+import copy
+from functools import lru_cache
+
+import numpy as np
+
+
+# Taux annuels (%) par type de crédit et par tranche de durée :
+# chaque tranche s'applique jusqu'à 'max_annees' inclus
+DEFAULT_RATES = {
+    'personnel': {
+        'min': 4.5, 'max': 7.2, 'default': 5.8,
+        'tranches': [{'max_annees': 2, 'taux': 4.5}, {'max_annees': 4, 'taux': 5.8}, {'max_annees': 7, 'taux': 7.2}]
+    },
+    'immobilier': {
+        'min': 2.8, 'max': 4.1, 'default': 3.2,
+        'tranches': [{'max_annees': 10, 'taux': 2.8}, {'max_annees': 15, 'taux': 3.2},
+                     {'max_annees': 20, 'taux': 3.6}, {'max_annees': 25, 'taux': 4.1}]
+    },
+    'automobile': {
+        'min': 3.2, 'max': 5.8, 'default': 4.2,
+        'tranches': [{'max_annees': 2, 'taux': 3.2}, {'max_annees': 4, 'taux': 4.2}, {'max_annees': 7, 'taux': 5.8}]
+    },
+    'travaux': {
+        'min': 5.1, 'max': 8.3, 'default': 6.5,
+        'tranches': [{'max_annees': 2, 'taux': 5.1}, {'max_annees': 3, 'taux': 6.5}, {'max_annees': 5, 'taux': 8.3}]
+    }
+}
+
+# Résultat d'une simulation affiché au client : mensualité, total remboursé, intérêts
+SIMULATION_RESULT_TEMPLATE = (
+    "💰 Mensualité : %s €\n"
+    "💵 Total remboursé : %s €\n"
+    "📊 Intérêts : %s €"
+)
+
+# Bornes des taux annuels (%) acceptés par simulate_grid
+MIN_ANNUAL_RATE = -100.0
+MAX_ANNUAL_RATE = 100.0
+
+
 class CreditCalculator:
-    def __init__(self, montant, duree_annees, taux_annuel):
+    def __init__(self, montant, duree_annees, taux_annuel, rates=None):
         self.montant = montant
         self.duree_annees = duree_annees
         self.taux_annuel = taux_annuel
+        self.load_rates(rates if rates is not None else DEFAULT_RATES)
+
+    def load_rates(self, rates):
+        """
+        Charge la grille de taux par type de crédit et précalcule, pour chaque type,
+        le facteur d'annuité r / (1 - (1 + r)^-n) de chaque durée n (en mois)
+        couverte par ses tranches.
+        """
+        self.rates = copy.deepcopy(rates)
+        self.annuity_factors = {}
+        # Incrémentée à chaque chargement (invalidation des réponses /api/rates encodées)
+        self.rates_version = getattr(self, 'rates_version', 0) + 1
+
+        for credit_type, grille in self.rates.items():
+            tranches = grille['tranches'] = sorted(grille.get('tranches') or [], key=lambda tranche: tranche['max_annees'])
+            max_mois = int(round(tranches[-1]['max_annees'] * 12)) if tranches else 0
+            n = np.arange(max_mois + 1, dtype=float)
+
+            # Taux de la tranche de chaque durée (mois 0 inclus pour indexer directement par n)
+            taux_annuels = np.full(max_mois + 1, float(grille.get('default', self.taux_annuel)))
+            borne_inf = 0
+            for tranche in tranches:
+                borne_sup = int(round(tranche['max_annees'] * 12))
+                taux_annuels[borne_inf:borne_sup + 1] = tranche['taux']
+                borne_inf = borne_sup + 1
+
+            taux_mensuels = taux_annuels / 12 / 100
+            with np.errstate(divide='ignore', invalid='ignore'):
+                facteurs = np.where(taux_mensuels == 0, 1 / n, taux_mensuels / (1 - (1 + taux_mensuels) ** -n))
+            facteurs[0] = np.nan
+
+            self.annuity_factors[credit_type] = facteurs
+
+    def get_rate(self, credit_type, duree_annees):
+        """
+        Taux annuel (%) appliqué à un type de crédit pour une durée donnée.
+        Au-delà de la dernière tranche, le taux de la dernière tranche s'applique ;
+        sans grille pour ce type, le taux par défaut du calculateur.
+        """
+        grille = self.rates.get(credit_type)
+        if grille is None:
+            return self.taux_annuel
+
+        tranches = grille['tranches']
+        if not tranches:
+            return grille.get('default', self.taux_annuel)
+        for tranche in tranches:
+            if duree_annees <= tranche['max_annees']:
+                return tranche['taux']
+        return tranches[-1]['taux']
+
+    def annuity_factor(self, credit_type, n_mois):
+        """
+        Facteur d'annuité d'un type de crédit sur n_mois : lecture dans la table
+        précalculée si la durée y figure, calcul direct sinon.
+        """
+        facteurs = self.annuity_factors.get(credit_type)
+        if facteurs is not None and float(n_mois).is_integer() and 0 < n_mois < len(facteurs):
+            return float(facteurs[int(n_mois)])
+
+        taux_mensuel = self.get_rate(credit_type, n_mois / 12) / 12 / 100
+        if taux_mensuel == 0:
+            return 1 / n_mois
+        return taux_mensuel / (1 - (1 + taux_mensuel) ** -n_mois)
 
     def simulate_credit(self, capital=None, duration_years=None, credit_type=None, with_insurance=False):
         # Utilise les valeurs par défaut de l'objet si aucun paramètre n'est passé
         montant = capital if capital is not None else self.montant
         duree_annees = duration_years if duration_years is not None else self.duree_annees
-        taux_annuel = self.taux_annuel  # tu peux adapter selon credit_type
-
-        # Calcul
-        taux_mensuel = taux_annuel / 12 / 100
         n = duree_annees * 12
-        mensualite = montant * taux_mensuel / (1 - (1 + taux_mensuel) ** -n)
+
+        # Taux de la grille pour ce type de crédit (taux par défaut de l'objet sans type connu)
+        if credit_type in self.rates:
+            mensualite = montant * self.annuity_factor(credit_type, n)
+        else:
+            taux_mensuel = self.taux_annuel / 12 / 100
+            mensualite = montant * taux_mensuel / (1 - (1 + taux_mensuel) ** -n)
         total = mensualite * n
         interets = total - montant
 
@@ -23,20 +129,157 @@ class CreditCalculator:
             "interets": round(interets, 2)
         }
 
+    def simulate_grid(self, amounts, durations_years, rates=None):
+        """
+        Simule toute la grille montants × durées × taux en un seul calcul NumPy.
+        Retourne des tableaux de forme (len(amounts), len(durations_years), len(rates)).
+
+        Raises:
+            ValueError: montant ou durée non strictement positifs, taux hors de ]-100, 100]
+        """
+        montants = np.asarray(amounts, dtype=float)
+        durees = np.asarray(durations_years, dtype=float)
+        taux_annuels = np.asarray(rates if rates is not None else [self.taux_annuel], dtype=float)
+        # Hors de ces bornes, la grille contient des infinis, des NaN ou des montants négatifs
+        if not np.all(np.isfinite(montants) & (montants > 0)):
+            raise ValueError("Les montants doivent être strictement positifs")
+        if not np.all(np.isfinite(durees) & (durees > 0)):
+            raise ValueError("Les durées doivent être strictement positives")
+        if not np.all(np.isfinite(taux_annuels) & (taux_annuels > MIN_ANNUAL_RATE) & (taux_annuels <= MAX_ANNUAL_RATE)):
+            raise ValueError(f"Les taux doivent être compris entre {MIN_ANNUAL_RATE:g} (exclu) et {MAX_ANNUAL_RATE:g} %")
+
+        montants = montants[:, None, None]
+        n = durees[None, :, None] * 12
+        taux_mensuels = (taux_annuels / 12 / 100)[None, None, :]
+
+        # Facteur d'annuité r / (1 - (1 + r)^-n), et 1 / n pour un taux nul
+        with np.errstate(divide='ignore', invalid='ignore'):
+            facteur = np.where(
+                taux_mensuels == 0,
+                1 / n,
+                taux_mensuels / (1 - (1 + taux_mensuels) ** -n)
+            )
+        mensualite = montants * facteur
+        total = mensualite * n
+        interets = total - montants
+
+        return {
+            "mensualite": mensualite.round(2),
+            "total_rembourse": total.round(2),
+            "interets": interets.round(2)
+        }
+
+    def amortization_schedule(self, capital, years, rate=None, insurance=0.0):
+        """
+        Tableau d'amortissement mensuel, calculé en vectoriel (une ligne par mois).
+
+        insurance est le taux annuel de l'assurance emprunteur en % du capital
+        emprunté (cotisation mensuelle constante). Retourne un dict de tableaux NumPy.
+        """
+        taux_annuel = rate if rate is not None else self.taux_annuel
+        taux_mensuel = taux_annuel / 12 / 100
+        n = int(round(years * 12))
+        mois = np.arange(1, n + 1)
+
+        if taux_mensuel == 0:
+            mensualite = capital / n
+            capital_restant = capital - mensualite * mois
+        else:
+            mensualite = capital * taux_mensuel / (1 - (1 + taux_mensuel) ** -n)
+            # Capital restant dû après k mois : C(1+r)^k - M((1+r)^k - 1)/r
+            croissance = (1 + taux_mensuel) ** mois
+            capital_restant = capital * croissance - mensualite * (croissance - 1) / taux_mensuel
+
+        capital_restant[-1] = 0.0  # Évite un résidu d'arrondi flottant
+        capital_debut = np.concatenate(([capital], capital_restant[:-1]))
+        interets = capital_debut * taux_mensuel
+        capital_rembourse = mensualite - interets
+        assurance = np.full(n, capital * insurance / 100 / 12)
+
+        return {
+            "mois": mois,
+            "mensualite": np.full(n, mensualite) + assurance,
+            "interets": interets,
+            "capital_rembourse": capital_rembourse,
+            "assurance": assurance,
+            "capital_restant": capital_restant
+        }
+
     def format_simulation_result(self, simulation):
-        return (
-            f"💰 Mensualité : {simulation['mensualite']} €\n"
-            f"💵 Total remboursé : {simulation['total_rembourse']} €\n"
-            f"📊 Intérêts : {simulation['interets']} €"
+        return SIMULATION_RESULT_TEMPLATE % (
+            simulation['mensualite'], simulation['total_rembourse'], simulation['interets']
         )
     def calculer_taeg(self, montant, duree_annees, taux_annuel, frais_dossier=0, assurance_mensuelle=0):
-        taux_mensuel = taux_annuel / 12 / 100
-        n = duree_annees * 12
-        mensualite_hors_frais = montant * taux_mensuel / (1 - (1 + taux_mensuel) ** -n)
-        mensualite_totale = mensualite_hors_frais + assurance_mensuelle
-        total_paye = mensualite_totale * n + frais_dossier
-    # Ici, formule simplifiée du TAEG
-        taeg = ((total_paye / montant) ** (1 / duree_annees) - 1) * 100
-        return round(taeg, 2)
-    
+        """
+        TAEG actuariel exact (en %, arrondi à 2 décimales), mémoïsé sur les entrées arrondies.
+        """
+        return _taeg_memoise(
+            round(float(montant), 2), round(float(duree_annees), 4), round(float(taux_annuel), 6),
+            round(float(frais_dossier), 2), round(float(assurance_mensuelle), 2)
+        )
+
+    @staticmethod
+    def calculer_taeg_grid(montants, durees_annees, taux_annuels, frais_dossier=0, assurance_mensuelle=0):
+        """
+        TAEG (en %) de toute une grille d'entrées (tableaux diffusables entre eux),
+        résolu en une fois par itérations de Newton vectorisées.
+        """
+        montants = np.asarray(montants, dtype=float)
+        n = np.asarray(durees_annees, dtype=float) * 12
+        taux_mensuels = np.asarray(taux_annuels, dtype=float) / 12 / 100
+
+        # Échéance réelle de l'emprunteur (crédit + assurance) et capital net reçu
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mensualite = np.where(
+                taux_mensuels == 0,
+                montants / n,
+                montants * taux_mensuels / (1 - (1 + taux_mensuels) ** -n)
+            )
+        echeance = mensualite + np.asarray(assurance_mensuelle, dtype=float)
+        net = montants - np.asarray(frais_dossier, dtype=float)
+
+        taux_periodique = resoudre_taux_periodique(echeance, net, n, estimation=taux_mensuels)
+        return ((1 + taux_periodique) ** 12 - 1) * 100
+
+
+def resoudre_taux_periodique(echeance, net, n, estimation=None, tolerance=1e-12, max_iterations=50):
+    """
+    Résout net = échéance × (1 - (1 + i)^-n) / i en i (taux périodique), élément par élément.
+
+    Méthode de Newton vectorisée, démarrée au taux nominal : convergence en
+    quelques itérations pour des frais et une assurance réalistes.
+    """
+    echeance, net, n = np.broadcast_arrays(
+        np.asarray(echeance, dtype=float), np.asarray(net, dtype=float), np.asarray(n, dtype=float)
+    )
+    # Hors de ces bornes, Newton diverge (nan) : erreur plutôt qu'un résultat mémoïsé invalide
+    if np.any(n <= 0):
+        raise ValueError("La durée du crédit doit être strictement positive")
+    if np.any(net <= 0):
+        raise ValueError("Les frais de dossier doivent être inférieurs au montant emprunté")
+    if estimation is None:
+        estimation = np.full(echeance.shape, 0.005)
+    i = np.array(np.broadcast_to(estimation, echeance.shape), dtype=float)
+    i = np.where(i > 1e-9, i, 1e-4)  # Évite la singularité en 0 au départ
+
+    for _ in range(max_iterations):
+        actualisation = (1 + i) ** -n
+        annuite = (1 - actualisation) / i
+        f = echeance * annuite - net
+        # d(annuité)/di = (n (1 + i)^-(n+1) - annuité) / i
+        derivee = echeance * (n * actualisation / (1 + i) - annuite) / i
+        pas = f / derivee
+        i = i - pas
+        if np.all(np.abs(pas) < tolerance):
+            break
+
+    # Sans intérêts ni frais (échéance × n == net), le taux est nul
+    return np.where(np.isclose(echeance * n, net, rtol=0, atol=1e-9), 0.0, i)
+
 
+@lru_cache(maxsize=4096)
+def _taeg_memoise(montant, duree_annees, taux_annuel, frais_dossier, assurance_mensuelle):
+    taeg = CreditCalculator.calculer_taeg_grid(
+        montant, duree_annees, taux_annuel, frais_dossier, assurance_mensuelle
+    )
+    return round(float(taeg), 2)
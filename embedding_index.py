@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+
+# Sous-dossier du modèle entraîné où est rangé l'index
+INDEX_SUBDIR = "embedding_index"
+VECTORS_FILENAME = "vectors.npy"
+EXAMPLES_FILENAME = "examples.json"
+
+
+def embedding_index_path(model_path: str) -> str:
+    """
+    Dossier de l'index d'embeddings associé à un modèle entraîné
+    """
+    return os.path.join(model_path, INDEX_SUBDIR)
+
+
+class SentenceEmbedder:
+    """
+    Embeddings de phrases : moyenne des états cachés de l'encodeur (hors padding),
+    normalisée L2. Utilise l'encodeur du modèle d'intent entraîné, sans sa tête de classification.
+    """
+
+    def __init__(self, model_path: str = "./intent_model", tokenizer=None, batch_size: int = 32):
+        from transformers import AutoModel, AutoTokenizer
+
+        self.model_path = model_path
+        self.tokenizer = tokenizer or AutoTokenizer.from_pretrained(model_path)
+        self.model = AutoModel.from_pretrained(model_path).eval()
+        self.batch_size = batch_size
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Retourne la matrice des embeddings normalisés (une ligne par texte, float32)
+        """
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + self.batch_size],
+                truncation=True,
+                padding=True,
+                max_length=128,
+                return_tensors="pt"
+            )
+            with torch.no_grad():
+                hidden = self.model(**inputs).last_hidden_state
+            mask = inputs['attention_mask'].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+            vectors.append(torch.nn.functional.normalize(pooled, dim=-1).numpy())
+        return np.concatenate(vectors).astype(np.float32) if vectors else np.zeros((0, 0), dtype=np.float32)
+
+
+class IntentEmbeddingIndex:
+    """
+    Index des plus proches voisins pour classifier les intents.
+
+    Chaque exemple du dataset est encodé une seule fois ; les vecteurs normalisés
+    sont stockés dans un fichier .npy ouvert en mémoire mappée. Un message est
+    classé par similarité cosinus (un seul produit matriciel) puis vote pondéré
+    de ses k plus proches voisins, qui servent aussi d'explication.
+
+    La reconstruction est incrémentale : seuls les exemples nouveaux ou modifiés
+    sont encodés, ceux qui ont disparu du dataset sont retirés.
+    """
+
+    def __init__(self, embedder: SentenceEmbedder, index_dir: str, k: int = 5):
+        """
+        Args:
+            embedder: encodeur de phrases (méthode encode)
+            index_dir: dossier de l'index (vectors.npy + examples.json)
+            k: nombre de voisins consultés par message
+        """
+        self.embedder = embedder
+        self.index_dir = index_dir
+        self.k = k
+        self._lock = threading.RLock()  # Mises à jour (sync, add_examples) sérialisées
+        # (exemples {'text', 'intent', 'key'}, vecteurs alignés sur les exemples, intents,
+        # indice de l'intent de chaque exemple) : publiés ensemble en une seule affectation,
+        # pour qu'une classification concurrente ne voie jamais un mélange ancien/nouveau
+        self._state = ([], np.zeros((0, 0), dtype=np.float32), [], np.zeros(0, dtype=np.int64))
+        self.load()
+
+    @property
+    def examples(self) -> List[Dict[str, str]]:
+        return self._state[0]
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._state[1]
+
+    @property
+    def intents(self) -> List[str]:
+        return self._state[2]
+
+    @staticmethod
+    def example_key(text: str, intent: str) -> str:
+        """
+        Empreinte d'un exemple : un exemple modifié ou déplacé est réencodé
+        """
+        return hashlib.sha1(f"{intent}\x00{text}".encode('utf-8')).hexdigest()
+
+    def load(self):
+        """
+        Ouvre l'index sauvegardé (vecteurs en mémoire mappée), s'il existe
+        """
+        vectors_path = os.path.join(self.index_dir, VECTORS_FILENAME)
+        examples_path = os.path.join(self.index_dir, EXAMPLES_FILENAME)
+        if not (os.path.exists(vectors_path) and os.path.exists(examples_path)):
+            return
+
+        with open(examples_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        # Un index construit avec un autre encodeur n'est pas réutilisable
+        if metadata.get('embedder') != self.embedder.model_path:
+            return
+
+        self._set(metadata['examples'], np.load(vectors_path, mmap_mode='r'))
+
+    def _set(self, examples: List[Dict[str, str]], vectors: np.ndarray):
+        intents = list(dict.fromkeys(example['intent'] for example in examples))
+        intent_ids = np.array([intents.index(example['intent']) for example in examples], dtype=np.int64)
+        self._state = (examples, vectors, intents, intent_ids)
+
+    def _save(self, examples: List[Dict[str, str]], vectors: np.ndarray):
+        """
+        Écrit l'index (remplacement atomique des fichiers) puis le rouvre en mémoire mappée
+        """
+        os.makedirs(self.index_dir, exist_ok=True)
+        vectors_path = os.path.join(self.index_dir, VECTORS_FILENAME)
+        examples_path = os.path.join(self.index_dir, EXAMPLES_FILENAME)
+
+        with open(vectors_path + ".tmp", 'wb') as f:
+            np.save(f, np.ascontiguousarray(vectors, dtype=np.float32))
+        with open(examples_path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump({'embedder': self.embedder.model_path, 'examples': examples}, f, ensure_ascii=False)
+        os.replace(vectors_path + ".tmp", vectors_path)
+        os.replace(examples_path + ".tmp", examples_path)
+
+        self._set(examples, np.load(vectors_path, mmap_mode='r'))
+
+    def sync(self, labelled_examples: List[Tuple[str, str]]) -> Dict[str, int]:
+        """
+        Aligne l'index sur une liste de couples (texte, intent) en n'encodant que
+        les exemples absents de l'index. Retourne le nombre d'exemples encodés,
+        réutilisés et retirés
+        """
+        with self._lock:
+            rows = {example['key']: row for row, example in enumerate(self.examples)}
+            examples = []
+            seen = set()
+            for text, intent in labelled_examples:
+                key = self.example_key(text, intent)
+                if key not in seen:
+                    seen.add(key)
+                    examples.append({'text': text, 'intent': intent, 'key': key})
+
+            missing = [example for example in examples if example['key'] not in rows]
+            reused = len(examples) - len(missing)
+            removed = len(rows) - reused
+            if not missing and not removed:
+                return {'encoded': 0, 'reused': reused, 'removed': 0}
+
+            new_vectors = self.embedder.encode([example['text'] for example in missing]) if missing else None
+            new_rows = {example['key']: i for i, example in enumerate(missing)}
+            vectors = np.stack([
+                self.vectors[rows[example['key']]] if example['key'] in rows else new_vectors[new_rows[example['key']]]
+                for example in examples
+            ]) if examples else np.zeros((0, 0), dtype=np.float32)
+
+            self._save(examples, vectors)
+            return {'encoded': len(missing), 'reused': reused, 'removed': removed}
+
+    def build(self, dataset_path: str = "dataset_bancaire.json") -> Dict[str, int]:
+        """
+        Construit ou met à jour l'index à partir du dataset (format dataset_bancaire.json)
+        """
+        with open(dataset_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return self.sync([
+            (example, intent_data['intent'])
+            for intent_data in data['intents']
+            for example in intent_data['examples']
+        ])
+
+    def add_examples(self, intent: str, texts: List[str]) -> Dict[str, int]:
+        """
+        Ajoute des exemples (éventuellement d'un nouvel intent) sans réentraîner
+        """
+        with self._lock:
+            labelled = [(example['text'], example['intent']) for example in self.examples]
+            return self.sync(labelled + [(text, intent) for text in texts])
+
+    def classify(self, text: str, k: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Classifie un message ; même format que predict_intent_with_confidence,
+        plus les voisins qui justifient la décision
+        """
+        return self.classify_batch([text], k)[0]
+
+    def classify_batch(self, texts: List[str], k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Classifie une liste de messages avec un seul produit matriciel
+        """
+        examples, vectors, intents, intent_ids = self._state
+        if len(examples) == 0:
+            raise ValueError("L'index est vide. Utilisez build()")
+
+        k = min(k or self.k, len(examples))
+
+        similarities = self.embedder.encode(list(texts)) @ vectors.T
+        top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+
+        results = []
+        for row, neighbours in enumerate(top):
+            neighbours = neighbours[np.argsort(-similarities[row, neighbours])]
+            scores = similarities[row, neighbours]
+
+            # Vote des voisins pondéré par leur similarité (ramenée dans [0, 1])
+            weights = np.clip(scores, 0, None) + 1e-9
+            votes = np.bincount(intent_ids[neighbours], weights=weights, minlength=len(intents))
+            votes /= votes.sum()
+            best = int(votes.argmax())
+
+            results.append({
+                'intent': intents[best],
+                'confidence': float(votes[best]),
+                'all_confidences': {intent: float(vote) for intent, vote in zip(intents, votes)},
+                'neighbors': [
+                    {'text': examples[i]['text'], 'intent': examples[i]['intent'], 'similarity': float(score)}
+                    for i, score in zip(neighbours, scores)
+                ]
+            })
+        return results
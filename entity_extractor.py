@@ -1,17 +1,47 @@
 import re
 import json
+import threading
 import torch
-from transformers import AutoTokenizer, AutoModelForTokenClassification
-from typing import Dict, List, Any, Tuple
+from transformers import AutoConfig, AutoTokenizer, AutoModelForTokenClassification
+from typing import Dict, List, Any, Optional, Tuple
+from quantization import quantize_dynamic_int8
+
+# Chiffre au sens des patterns regex (\d), utilisé pour sauter regex numériques et NER
+DIGIT_PATTERN = re.compile(r'\d')
 
 class EntityExtractor:
-    def __init__(self, model_name="dslim/bert-base-NER"):
+    def __init__(self, model_name="dslim/bert-base-NER", ner_mode="tiered", quantize=False):
         """
         Initialise l'extracteur d'entités avec un modèle Hugging Face
+        
+        Args:
+            model_name: modèle NER Hugging Face
+            ner_mode: "tiered" (NER seulement si un créneau requis manque et que
+                le modèle peut le remplir) ou "always" (NER à chaque message)
+            quantize: quantification dynamique int8 des couches Linear au chargement
         """
         self.model_name = model_name
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-        self.model = AutoModelForTokenClassification.from_pretrained(model_name)
+        self.ner_mode = ner_mode
+        self.quantize = quantize
+        self._tokenizer = None  # Chargés à la première passe NER
+        self._model = None
+        self._ner_entity_types = None
+        self._load_lock = threading.Lock()
+        
+        # Créneaux indispensables à une simulation et labels NER capables de les remplir
+        self.required_slot_labels = {
+            'montant': 'MONEY',
+            'duree': 'CARDINAL'
+        }
+        
+        # Compteurs de l'extraction à étages (mis à jour par le thread du micro-batching
+        # et par les threads des requêtes)
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'messages': 0,
+            'ner_calls': 0,
+            'ner_skipped': 0
+        }
         
         # Patterns regex pour l'extraction d'entités spécifiques au domaine bancaire
         self.patterns = {
@@ -49,78 +79,160 @@ class EntityExtractor:
             ]
         }
         
+        # Créneaux dont toutes les patterns exigent un chiffre : inutile de les essayer
+        # sur un texte qui n'en contient aucun (à tenir à jour avec self.patterns)
+        self.numeric_slots = {'montant', 'duree', 'taux_interet', 'revenus'}
+        
         # Mapping des types de crédit
         self.credit_type_mapping = {
             'auto': 'automobile',
             'voiture': 'automobile',
             'rénovation': 'renovation'
         }
+        
+        self.compile_patterns()
+    
+    def load_model(self):
+        """
+        Charge le tokenizer et le modèle NER (une seule fois)
+        """
+        with self._load_lock:
+            if self._model is None:
+                self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                model = AutoModelForTokenClassification.from_pretrained(self.model_name)
+                self._model = quantize_dynamic_int8(model) if self.quantize else model
+    
+    @property
+    def tokenizer(self):
+        """
+        Tokenizer du modèle NER, chargé à la première utilisation
+        """
+        if self._model is None:
+            self.load_model()
+        return self._tokenizer
+    
+    @property
+    def model(self):
+        """
+        Modèle NER, chargé à la première utilisation
+        """
+        if self._model is None:
+            self.load_model()
+        return self._model
+    
+    @property
+    def ner_entity_types(self):
+        """
+        Types d'entités que le modèle NER sait produire (PER, ORG, LOC, MISC...).
+        Lus dans la configuration du modèle, sans charger ses poids
+        """
+        if self._ner_entity_types is None:
+            config = self._model.config if self._model is not None else AutoConfig.from_pretrained(self.model_name)
+            self._ner_entity_types = {
+                label.split('-', 1)[-1] for label in config.id2label.values()
+            }
+        return self._ner_entity_types
+    
+    def ner_can_fill_slots(self) -> bool:
+        """
+        Indique si la passe NER peut être utile (mode "always" ou label utile disponible)
+        """
+        if self.ner_mode == "always":
+            return True
+        return bool(set(self.required_slot_labels.values()) & self.ner_entity_types)
+    
+    def preload(self):
+        """
+        Charge à l'avance ce dont l'extraction aura besoin (modèle NER seulement s'il peut servir)
+        """
+        if self.ner_can_fill_slots():
+            self.load_model()
+    
+    def compile_patterns(self):
+        """
+        Compile une fois pour toutes les patterns de self.patterns
+        (à rappeler après toute modification de self.patterns)
+        """
+        self.compiled_patterns = {
+            slot: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for slot, patterns in self.patterns.items()
+        }
+    
+    @staticmethod
+    def has_digit(text: str) -> bool:
+        """
+        Indique si le texte contient un chiffre (même définition que \\d dans les patterns)
+        """
+        return DIGIT_PATTERN.search(text) is not None
+    
+    def _search_slot(self, slot: str, text: str) -> Optional[str]:
+        """
+        Retourne la valeur capturée par la première pattern du créneau qui
+        trouve une correspondance (même résultat que findall(...)[0])
+        """
+        for pattern in self.compiled_patterns[slot]:
+            match = pattern.search(text)
+            if match:
+                return match.group(1)
+        return None
     
     def extract_entities_regex(self, text: str) -> Dict[str, Any]:
         """
         Extrait les entités en utilisant des patterns regex
         """
         entities = {}
+        has_digit = self.has_digit(text)
+        
+        def search(slot):
+            if slot in self.numeric_slots and not has_digit:
+                return None
+            return self._search_slot(slot, text)
         
         # Extraction du montant
-        for pattern in self.patterns['montant']:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                # Nettoyage et conversion du montant
-                montant_str = matches[0].replace(' ', '').replace(',', '.')
-                if 'k' in montant_str.lower():
-                    montant_str = montant_str.lower().replace('k', '000')
-                entities['montant'] = float(montant_str)
-                break
+        montant_str = search('montant')
+        if montant_str is not None:
+            # Nettoyage et conversion du montant
+            montant_str = montant_str.replace(' ', '').replace(',', '.')
+            if 'k' in montant_str.lower():
+                montant_str = montant_str.lower().replace('k', '000')
+            entities['montant'] = float(montant_str)
         
         # Extraction de la durée
-        for pattern in self.patterns['duree']:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                duree = int(matches[0])
-                # Si la durée est en mois, convertir en années
-                if 'mois' in text.lower():
-                    duree = duree // 12
-                entities['duree'] = duree
-                break
+        duree_str = search('duree')
+        if duree_str is not None:
+            duree = int(duree_str)
+            # Si la durée est en mois, convertir en années
+            if 'mois' in text.lower():
+                duree = duree // 12
+            entities['duree'] = duree
         
         # Extraction du type de crédit
-        for pattern in self.patterns['type_credit']:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                credit_type = matches[0].lower()
-                # Mapping des synonymes
-                if credit_type in self.credit_type_mapping:
-                    credit_type = self.credit_type_mapping[credit_type]
-                entities['type_credit'] = credit_type
-                break
+        credit_type = search('type_credit')
+        if credit_type is not None:
+            credit_type = credit_type.lower()
+            # Mapping des synonymes
+            if credit_type in self.credit_type_mapping:
+                credit_type = self.credit_type_mapping[credit_type]
+            entities['type_credit'] = credit_type
         
         # Extraction du taux d'intérêt
-        for pattern in self.patterns['taux_interet']:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                taux_str = matches[0].replace(',', '.')
-                entities['taux_interet'] = float(taux_str)
-                break
+        taux_str = search('taux_interet')
+        if taux_str is not None:
+            entities['taux_interet'] = float(taux_str.replace(',', '.'))
         
         # Extraction de l'assurance
-        for pattern in self.patterns['assurance']:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                assurance = matches[0].lower()
-                if assurance in ['oui', 'avec']:
-                    entities['assurance'] = True
-                elif assurance in ['non', 'sans']:
-                    entities['assurance'] = False
-                break
+        assurance = search('assurance')
+        if assurance is not None:
+            assurance = assurance.lower()
+            if assurance in ['oui', 'avec']:
+                entities['assurance'] = True
+            elif assurance in ['non', 'sans']:
+                entities['assurance'] = False
         
         # Extraction des revenus
-        for pattern in self.patterns['revenus']:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                revenus_str = matches[0].replace(',', '.')
-                entities['revenus'] = float(revenus_str)
-                break
+        revenus_str = search('revenus')
+        if revenus_str is not None:
+            entities['revenus'] = float(revenus_str.replace(',', '.'))
         
         return entities
     
@@ -128,32 +240,47 @@ class EntityExtractor:
         """
         Extrait les entités en utilisant le modèle NER de Hugging Face
         """
-        # Tokenisation
+        return self.extract_entities_ner_batch([text])[0]
+    
+    def extract_entities_ner_batch(self, texts: List[str]) -> List[List[Dict[str, Any]]]:
+        """
+        Extrait les entités NER d'une liste de textes en une seule passe du modèle
+        """
+        # Tokenisation (les positions de padding ont un offset (0, 0) et sont ignorées)
         inputs = self.tokenizer(
-            text,
+            texts,
             return_tensors="pt",
             truncation=True,
+            padding=True,
             max_length=512,
             return_offsets_mapping=True
         )
+        offset_mapping = inputs.pop('offset_mapping')
         
         # Prédiction
         with torch.no_grad():
             outputs = self.model(**inputs)
             predictions = torch.argmax(outputs.logits, dim=-1)
         
-        # Extraction des entités
+        return [
+            self._decode_ner_predictions(text, predictions[row], offset_mapping[row])
+            for row, text in enumerate(texts)
+        ]
+    
+    def _decode_ner_predictions(self, text: str, predictions, offset_mapping) -> List[Dict[str, Any]]:
+        """
+        Convertit les labels BIO prédits pour chaque token en entités
+        """
         entities = []
-        offset_mapping = inputs['offset_mapping'][0]
         
         current_entity = None
         current_text = ""
         
-        for i, (prediction, offset) in enumerate(zip(predictions[0], offset_mapping)):
+        for i, (prediction, offset) in enumerate(zip(predictions.tolist(), offset_mapping.tolist())):
             if offset[0] == 0 and offset[1] == 0:  # Token spécial
                 continue
             
-            label = self.model.config.id2label[prediction.item()]
+            label = self.model.config.id2label[prediction]
             
             if label.startswith('B-'):  # Beginning of entity
                 if current_entity:
@@ -201,9 +328,50 @@ class EntityExtractor:
         # Extraction avec regex (spécifique au domaine bancaire)
         regex_entities = self.extract_entities_regex(text)
         
-        # Extraction avec NER (entités générales)
-        ner_entities = self.extract_entities_ner(text)
+        # Extraction avec NER (entités générales), seulement si utile
+        ner_entities = []
+        if self.needs_ner(text, regex_entities):
+            ner_entities = self.extract_entities_ner(text)
         
+        return self.combine_entities(text, regex_entities, ner_entities)
+    
+    def needs_ner(self, text: str, regex_entities: Dict[str, Any]) -> bool:
+        """
+        Indique si la passe NER peut apporter une information et met à jour les compteurs.
+        En mode "tiered", le NER n'est appelé que si un créneau requis manque après
+        les regex, que le modèle produit le label capable de le remplir et que le
+        texte contient un chiffre
+        """
+        if self.ner_mode == "always":
+            needed = True
+        else:
+            missing_labels = {
+                label for slot, label in self.required_slot_labels.items() if slot not in regex_entities
+            }
+            needed = (
+                bool(missing_labels & self.ner_entity_types)
+                and self.has_digit(text)
+            )
+        
+        with self._stats_lock:
+            self.stats['messages'] += 1
+            self.stats['ner_calls' if needed else 'ner_skipped'] += 1
+        return needed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne les compteurs de l'extraction à étages
+        """
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['ner_skip_rate'] = stats['ner_skipped'] / stats['messages'] if stats['messages'] else 0.0
+        return stats
+    
+    def combine_entities(self, text: str, regex_entities: Dict[str, Any],
+                         ner_entities: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Combine les entités regex avec les entités NER
+        """
         # Combinaison des résultats
         entities = regex_entities.copy()
         
@@ -271,6 +439,35 @@ class EntityExtractor:
         Extrait et valide les entités d'un texte
         """
         entities = self.extract_entities(text)
+        return self._build_validation_result(entities)
+    
+    def extract_entities_with_validation_batch(self, texts: List[str], batch_size: int = 32) -> List[Dict[str, Any]]:
+        """
+        Extrait et valide les entités d'une liste de textes (une passe NER par lot,
+        limitée aux textes qui en ont besoin)
+        """
+        regex_results = [self.extract_entities_regex(text) for text in texts]
+        ner_indices = [
+            i for i, (text, regex_entities) in enumerate(zip(texts, regex_results))
+            if self.needs_ner(text, regex_entities)
+        ]
+        
+        ner_results = [[] for _ in texts]
+        for start in range(0, len(ner_indices), batch_size):
+            batch_indices = ner_indices[start:start + batch_size]
+            batch_entities = self.extract_entities_ner_batch([texts[i] for i in batch_indices])
+            for index, ner_entities in zip(batch_indices, batch_entities):
+                ner_results[index] = ner_entities
+        
+        return [
+            self._build_validation_result(self.combine_entities(text, regex_entities, ner_entities))
+            for text, regex_entities, ner_entities in zip(texts, regex_results, ner_results)
+        ]
+    
+    def _build_validation_result(self, entities: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Valide les entités et calcule la confiance de l'extraction
+        """
         validated_entities = self.validate_entities(entities)
         
         return {
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import re
+import socketserver
+import threading
+import time
+from typing import Optional, Tuple
+
+
+def glob_to_regex(pattern: bytes) -> re.Pattern:
+    """
+    Motif glob de Redis (*, ?, échappement par \\) converti en expression régulière
+    """
+    parts = []
+    escaped = False
+    for char in pattern:
+        char = bytes([char])
+        if escaped:
+            parts.append(re.escape(char))
+            escaped = False
+        elif char == b'\\':
+            escaped = True
+        elif char == b'*':
+            parts.append(b'.*')
+        elif char == b'?':
+            parts.append(b'.')
+        else:
+            parts.append(re.escape(char))
+    return re.compile(b''.join(parts), re.DOTALL)
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    """
+    Lit des commandes RESP (tableaux de chaînes) et répond comme Redis
+    """
+
+    def read_command(self) -> Optional[list]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b'*'):
+            # Commande « inline » (telnet, redis-cli basique)
+            return line.split()
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self):
+        while True:
+            try:
+                command = self.read_command()
+            except (ConnectionError, ValueError):
+                return
+            if command is None:
+                return
+            if command:
+                self.wfile.write(self.server.execute(command))
+
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    """
+    Serveur local parlant le protocole Redis (RESP) pour les tests et les benchmarks :
+    PING, GET, SET (options EX / PX), DEL, EXISTS, SCAN (MATCH, en une seule page), FLUSHDB,
+    SELECT, AUTH.
+
+        server = FakeRedisServer().start()
+        backend = RedisSessionBackend(server.url)
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int] = ("127.0.0.1", 0)):
+        super().__init__(address, _RespHandler)
+        self._data = {}  # clé -> (expiration ou None, valeur)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start(self) -> "FakeRedisServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-redis", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires is not None and expires <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def execute(self, command: list) -> bytes:
+        name = command[0].upper()
+        args = command[1:]
+        with self._lock:
+            if name == b'PING':
+                return b'+PONG\r\n'
+            if name in (b'SELECT', b'AUTH'):
+                return b'+OK\r\n'
+            if name == b'GET' and len(args) == 1:
+                value = self._get(args[0])
+                return b'$-1\r\n' if value is None else b'$%d\r\n%s\r\n' % (len(value), value)
+            if name == b'SET' and len(args) >= 2:
+                expires = None
+                options = [option.upper() for option in args[2:]]
+                if len(options) == 2 and options[0] in (b'EX', b'PX'):
+                    scale = 1.0 if options[0] == b'EX' else 0.001
+                    expires = time.monotonic() + int(args[3]) * scale
+                elif options:
+                    return b'-ERR syntax error\r\n'
+                self._data[args[0]] = (expires, args[1])
+                return b'+OK\r\n'
+            if name in (b'DEL', b'EXISTS'):
+                found = [key for key in args if self._get(key) is not None]
+                if name == b'DEL':
+                    for key in found:
+                        del self._data[key]
+                return b':%d\r\n' % len(found)
+            if name == b'SCAN' and args:
+                options = dict(zip((option.upper() for option in args[1::2]), args[2::2]))
+                match = glob_to_regex(options.get(b'MATCH', b'*'))
+                keys = [key for key in list(self._data) if match.fullmatch(key) and self._get(key) is not None]
+                return b'*2\r\n$1\r\n0\r\n*%d\r\n%s' % (
+                    len(keys), b''.join(b'$%d\r\n%s\r\n' % (len(key), key) for key in keys)
+                )
+            if name == b'FLUSHDB':
+                self._data.clear()
+                return b'+OK\r\n'
+        return b"-ERR unknown command '%s'\r\n" % command[0]
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+"""
+Configuration gunicorn de l'API Flask (lue automatiquement depuis le dossier courant) :
+
+    gunicorn app_flask:app
+
+Avec SHARED_MODELS=1 (défaut), le maître charge les modèles avant de forker les
+workers, qui partagent les poids en copie à l'écriture (voir prefork.py).
+Avec SHARED_MODELS=0, chaque worker charge ses propres modèles.
+"""
+
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+# Quelques threads par worker pour que le micro-batching regroupe les requêtes concurrentes
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = 120
+
+preload_app = os.environ.get('SHARED_MODELS', '1') == '1'
+
+# Threads torch par worker (0 : cœurs / workers)
+torch_threads = int(os.environ.get('TORCH_THREADS_PER_WORKER', 0))
+
+# prefork est importé dans les hooks : sans partage, le maître n'importe ni torch ni l'application
+
+
+def when_ready(server):
+    # Maître, avant le premier fork
+    if preload_app:
+        import prefork
+        prefork.load_shared_models()
+
+
+def post_fork(server, worker):
+    import prefork
+    prefork.configure_worker(prefork.worker_threads(workers, torch_threads))
+
+
+def post_worker_init(worker):
+    import prefork
+    if preload_app:
+        prefork.load_worker_sessions()
+    else:
+        prefork.load_worker_models()
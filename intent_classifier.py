@@ -1,23 +1,57 @@
 import json
+import os
 import torch
 import numpy as np
 from transformers import AutoTokenizer, AutoModelForSequenceClassification, TrainingArguments, Trainer
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
 from datasets import Dataset
+from onnx_backend import load_onnx_intent_model
+from quantization import quantize_dynamic_int8
+from intent_student import CharNgramStudent, student_model_path
+from embedding_index import IntentEmbeddingIndex, SentenceEmbedder, embedding_index_path
 import re
 
 class IntentClassifier:
-    def __init__(self, model_name="distilbert-base-uncased"):
+    def __init__(self, model_name="distilbert-base-uncased", backend="torch", onnx_threads=0, quantize=False,
+                 dataset_path="dataset_bancaire.json"):
         """
         Initialise le classifieur d'intents avec un modèle Hugging Face
+        
+        Args:
+            backend: "torch" (PyTorch), "onnx" (ONNX Runtime, export automatique du modèle entraîné)
+                "student" (élève distillé par distill(), sans modèle Transformer)
+                ou "knn" (plus proches voisins dans l'index d'embeddings des exemples du dataset)
+            onnx_threads: threads intra-op d'ONNX Runtime (0 : nombre de cœurs physiques)
+            quantize: quantification dynamique int8 des couches Linear au chargement (backend torch)
+            dataset_path: exemples indexés par le backend "knn" (index mis à jour au chargement)
         """
         self.model_name = model_name
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.backend = backend
+        self.onnx_threads = onnx_threads
+        self.quantize = quantize
+        self.student = None
+        self.dataset_path = dataset_path
+        self.embedding_index = None
+        self._tokenizer = None  # Chargé à la première utilisation
         self.model = None
         self.intent_labels = []
         self.label2id = {}
         self.id2label = {}
+    
+    @property
+    def tokenizer(self):
+        """
+        Tokenizer du modèle de base, chargé seulement s'il est utilisé
+        (load_trained_model le remplace par celui du modèle entraîné)
+        """
+        if self._tokenizer is None:
+            self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        return self._tokenizer
+    
+    @tokenizer.setter
+    def tokenizer(self, tokenizer):
+        self._tokenizer = tokenizer
         
     def load_dataset(self, dataset_path="dataset_bancaire.json"):
         """
@@ -141,19 +175,77 @@ class IntentClassifier:
         print(f"✅ Modèle sauvegardé dans {output_dir}")
         return results
     
+    def distill(self, dataset_path="dataset_bancaire.json", model_path="./intent_model",
+                temperature=2.0, alpha=0.7):
+        """
+        Distille le modèle entraîné (professeur) dans un élève à n-grammes de caractères,
+        sauvegardé dans {model_path}/student et chargé ensuite avec backend="student"
+        """
+        if self.model is None:
+            raise ValueError("Le professeur n'est pas chargé. Utilisez load_trained_model() ou train()")
+        
+        print("🔄 Distillation du modèle d'intent...")
+        texts, labels = self.load_dataset(dataset_path)
+        
+        # Probabilités du professeur, colonnes dans l'ordre des identifiants
+        predictions = self.predict_batch(texts)
+        teacher_probabilities = np.array([
+            [prediction['all_confidences'][self.id2label[i]] for i in range(len(self.id2label))]
+            for prediction in predictions
+        ])
+        
+        student = CharNgramStudent(self.id2label).fit(
+            texts, teacher_probabilities, labels, temperature=temperature, alpha=alpha
+        )
+        student.save(student_model_path(model_path))
+        
+        agreement = np.mean(student.predict_proba(texts).argmax(axis=1) == teacher_probabilities.argmax(axis=1))
+        print(f"✅ Élève sauvegardé dans {student_model_path(model_path)} (accord avec le professeur : {agreement:.1%})")
+        return student
+    
     def load_trained_model(self, model_path="./intent_model"):
         """
         Charge un modèle entraîné
         """
         try:
-            self.model = AutoModelForSequenceClassification.from_pretrained(model_path)
-            self.tokenizer = AutoTokenizer.from_pretrained(model_path)
+            self.model = None
+            self.student = None
+            self.embedding_index = None
+            if self.backend == "knn":
+                self.tokenizer = AutoTokenizer.from_pretrained(model_path)
+                self.embedding_index = IntentEmbeddingIndex(
+                    SentenceEmbedder(model_path, tokenizer=self.tokenizer),
+                    embedding_index_path(model_path)
+                )
+                changes = self.embedding_index.build(self.dataset_path)
+                print(f"⚡ Index d'embeddings prêt ({changes['encoded']} exemples encodés, "
+                      f"{changes['reused']} réutilisés, {changes['removed']} retirés)")
+            elif self.backend == "student":
+                if os.path.exists(student_model_path(model_path)):
+                    self.student = CharNgramStudent.load(student_model_path(model_path))
+                    print("⚡ Élève distillé activé")
+                else:
+                    print("⚠️  Élève distillé absent (voir distill()), utilisation de PyTorch")
+            elif self.backend == "onnx":
+                try:
+                    self.model = load_onnx_intent_model(model_path, intra_op_threads=self.onnx_threads)
+                    print("⚡ Backend ONNX Runtime activé")
+                except ImportError as e:
+                    print(f"⚠️  ONNX Runtime indisponible ({e}), utilisation de PyTorch")
+            if self.student is None and self.embedding_index is None:
+                if self.model is None:
+                    self.model = AutoModelForSequenceClassification.from_pretrained(model_path)
+                    if self.quantize:
+                        self.model = quantize_dynamic_int8(self.model)
+                        print("⚡ Modèle d'intent quantifié en int8")
+                self.tokenizer = AutoTokenizer.from_pretrained(model_path)
             
             # Chargement des mappings
             with open(f"{model_path}/label_mappings.json", 'r', encoding='utf-8') as f:
                 mappings = json.load(f)
                 self.label2id = mappings['label2id']
-                self.id2label = mappings['id2label']
+                # Les clés JSON sont des chaînes : on les remet en entiers
+                self.id2label = {int(k): v for k, v in mappings['id2label'].items()}
                 self.intent_labels = mappings['intent_labels']
             
             print(f"✅ Modèle chargé depuis {model_path}")
@@ -163,16 +255,20 @@ class IntentClassifier:
             print(f"❌ Erreur lors du chargement du modèle : {e}")
             return False
     
-    def predict_intent(self, text, return_confidence=False):
+    def predict_probabilities(self, texts):
         """
-        Prédit l'intent d'un texte donné
+        Tokenise une fois et exécute une seule passe du modèle.
+        Retourne la matrice des probabilités (une ligne par texte)
         """
+        if self.student is not None:
+            return torch.from_numpy(self.student.predict_proba([texts] if isinstance(texts, str) else list(texts)))
+        
         if self.model is None:
             raise ValueError("Le modèle n'est pas chargé. Utilisez load_trained_model() ou train()")
         
         # Tokenisation
         inputs = self.tokenizer(
-            text,
+            texts,
             truncation=True,
             padding=True,
             max_length=128,
@@ -183,46 +279,97 @@ class IntentClassifier:
         with torch.no_grad():
             outputs = self.model(**inputs)
             probabilities = torch.softmax(outputs.logits, dim=-1)
-            predicted_id = torch.argmax(probabilities, dim=-1).item()
-            confidence = probabilities[0][predicted_id].item()
-        
-        predicted_intent = self.id2label[predicted_id]
         
-        if return_confidence:
-            return predicted_intent, confidence
-        else:
-            return predicted_intent
+        return probabilities
     
-    def predict_intent_with_confidence(self, text):
+    def format_prediction(self, probabilities):
         """
-        Prédit l'intent avec le niveau de confiance
+        Construit le résultat (intent, confiance, toutes les confiances)
+        à partir du vecteur de probabilités d'un texte
         """
-        intent, confidence = self.predict_intent(text, return_confidence=True)
-        
-        # Récupération des probabilités pour tous les intents
-        inputs = self.tokenizer(
-            text,
-            truncation=True,
-            padding=True,
-            max_length=128,
-            return_tensors="pt"
-        )
-        
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            probabilities = torch.softmax(outputs.logits, dim=-1)
+        scores = probabilities.tolist()
+        predicted_id = max(range(len(scores)), key=scores.__getitem__)
         
         # Création du dictionnaire des confiances
         confidences = {}
         for intent_id, intent_name in self.id2label.items():
-            confidences[intent_name] = probabilities[0][intent_id].item()
+            confidences[intent_name] = scores[intent_id]
         
         return {
-            'intent': intent,
-            'confidence': confidence,
+            'intent': self.id2label[predicted_id],
+            'confidence': scores[predicted_id],
             'all_confidences': confidences
         }
     
+    def predict_batch(self, texts, batch_size=32):
+        """
+        Prédit l'intent d'une liste de textes par lots.
+        Les textes sont triés par longueur (en tokens) puis regroupés, afin que
+        chaque lot ne soit complété (padding) que jusqu'à son plus long texte.
+        Retourne les mêmes dictionnaires que predict_intent_with_confidence,
+        dans l'ordre des textes d'entrée
+        """
+        if self.embedding_index is not None:
+            return self.embedding_index.classify_batch(list(texts))
+        
+        if self.student is not None:
+            return [self.format_prediction(row) for row in self.predict_probabilities(list(texts))]
+        
+        if self.model is None:
+            raise ValueError("Le modèle n'est pas chargé. Utilisez load_trained_model() ou train()")
+        
+        texts = list(texts)
+        if not texts:
+            return []
+        
+        # Tokenisation unique, sans padding
+        encodings = self.tokenizer(texts, truncation=True, max_length=128)
+        
+        # Regroupement par longueur pour limiter le padding
+        order = sorted(range(len(texts)), key=lambda i: len(encodings['input_ids'][i]))
+        results = [None] * len(texts)
+        
+        for start in range(0, len(order), batch_size):
+            batch_indices = order[start:start + batch_size]
+            batch = self.tokenizer.pad(
+                {
+                    'input_ids': [encodings['input_ids'][i] for i in batch_indices],
+                    'attention_mask': [encodings['attention_mask'][i] for i in batch_indices]
+                },
+                return_tensors="pt"
+            )
+            
+            with torch.no_grad():
+                outputs = self.model(**batch)
+                probabilities = torch.softmax(outputs.logits, dim=-1)
+            
+            for row, index in enumerate(batch_indices):
+                results[index] = self.format_prediction(probabilities[row])
+        
+        return results
+    
+    def predict_intent(self, text, return_confidence=False):
+        """
+        Prédit l'intent d'un texte donné
+        """
+        result = self.predict_intent_with_confidence(text)
+        
+        if return_confidence:
+            return result['intent'], result['confidence']
+        else:
+            return result['intent']
+    
+    def predict_intent_with_confidence(self, text):
+        """
+        Prédit l'intent avec le niveau de confiance (une seule passe du modèle).
+        Avec le backend "knn", le résultat contient aussi les exemples voisins ('neighbors')
+        """
+        if self.embedding_index is not None:
+            return self.embedding_index.classify(text)
+        
+        probabilities = self.predict_probabilities(text)
+        return self.format_prediction(probabilities[0])
+    
     def compute_metrics(self, eval_pred):
         """
         Calcule les métriques d'évaluation
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import random
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+
+class CascadeIntentRouter:
+    """
+    Routage en cascade des intents : le classificateur par mots-clés répond seul
+    quand son écart de score avec le deuxième intent dépasse le seuil, sinon
+    le message est envoyé au modèle Transformer.
+
+    Chaque fois que les deux classificateurs ont été exécutés sur un même message
+    (messages ambigus, et une fraction échantillonnée des messages du chemin rapide),
+    le couple est enregistré pour mesurer leur accord et recalibrer le seuil.
+    """
+
+    def __init__(self, simple_classifier, get_transformer: Callable[[], Any],
+                 threshold: float = 0.25, shadow_rate: float = 0.05, max_samples: int = 10000):
+        """
+        Args:
+            simple_classifier: SimpleIntentClassifier utilisé en premier étage
+            get_transformer: retourne l'IntentClassifier (chargé à la demande)
+            threshold: écart de score minimal pour se passer du Transformer
+            shadow_rate: fraction des messages du chemin rapide également
+                envoyés au Transformer pour mesurer l'accord
+            max_samples: nombre d'échantillons d'accord conservés
+        """
+        self.simple_classifier = simple_classifier
+        self.get_transformer = get_transformer
+        self.threshold = threshold
+        self.shadow_rate = shadow_rate
+
+        self._lock = threading.Lock()
+        self.samples = deque(maxlen=max_samples)  # (margin, simple_intent, transformer_intent)
+        self.stats = {
+            'messages': 0,
+            'fast_path': 0,
+            'transformer': 0,
+            'compared': 0,
+            'agreed': 0
+        }
+
+    def route(self, message: str) -> Dict[str, Any]:
+        """
+        Classifie un message ; le résultat indique le classificateur retenu
+        """
+        return self.route_batch([message])[0]
+
+    def route_batch(self, messages: List[str], batch_size: int = 32) -> List[Dict[str, Any]]:
+        """
+        Classifie une liste de messages ; les messages ambigus (et l'échantillon
+        de contrôle) passent par le Transformer en un seul appel par lots
+        """
+        fast_results = [self.simple_classifier.classify_intent_with_margin(message) for message in messages]
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+        transformer_indices = []
+        shadow_indices = []
+        for i, (intent, confidence, margin) in enumerate(fast_results):
+            if margin >= self.threshold:
+                results[i] = {
+                    'intent': intent,
+                    'confidence': confidence,
+                    'classifier': 'simple'
+                }
+                if random.random() < self.shadow_rate:
+                    shadow_indices.append(i)
+            else:
+                transformer_indices.append(i)
+
+        to_score = transformer_indices + shadow_indices
+        transformer_results = []
+        if to_score:
+            transformer_results = self.get_transformer().predict_batch(
+                [messages[i] for i in to_score], batch_size=batch_size
+            )
+
+        with self._lock:
+            self.stats['messages'] += len(messages)
+            self.stats['fast_path'] += len(messages) - len(transformer_indices)
+            self.stats['transformer'] += len(transformer_indices)
+
+            for i, transformer_result in zip(to_score, transformer_results):
+                intent, _, margin = fast_results[i]
+                agreed = intent == transformer_result['intent']
+                self.stats['compared'] += 1
+                self.stats['agreed'] += agreed
+                self.samples.append((margin, intent, transformer_result['intent']))
+
+        for i, transformer_result in zip(transformer_indices, transformer_results):
+            results[i] = dict(transformer_result, classifier='transformer')
+
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne les statistiques du routage et de l'accord entre classificateurs
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        stats['threshold'] = self.threshold
+        stats['fast_path_rate'] = stats['fast_path'] / stats['messages'] if stats['messages'] else 0.0
+        stats['agreement_rate'] = stats['agreed'] / stats['compared'] if stats['compared'] else None
+        return stats
+
+    def calibrate_threshold(self, target_agreement: float = 0.97, min_samples: int = 50) -> Optional[float]:
+        """
+        Calcule le plus petit seuil pour lequel l'accord observé sur les messages
+        au-dessus du seuil atteint target_agreement, et l'applique.
+        Retourne None (seuil inchangé) si les échantillons sont insuffisants
+        """
+        with self._lock:
+            samples = sorted(self.samples, reverse=True)
+
+        if len(samples) < min_samples:
+            return None
+
+        # Parcours des marges décroissantes : accord cumulé au-dessus de chaque seuil
+        best_threshold = None
+        agreed = 0
+        for count, (margin, simple_intent, transformer_intent) in enumerate(samples, 1):
+            agreed += simple_intent == transformer_intent
+            # Seuil évalué après le dernier échantillon de chaque marge
+            if count < len(samples) and samples[count][0] == margin:
+                continue
+            if count >= min_samples and agreed / count >= target_agreement:
+                best_threshold = margin
+
+        if best_threshold is not None:
+            self.threshold = best_threshold
+        return best_threshold
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+from typing import Dict, List
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+# Sous-dossier du modèle entraîné où est rangé l'élève distillé
+STUDENT_SUBDIR = "student"
+STUDENT_FILENAME = "student.joblib"
+
+
+def student_model_path(model_path: str) -> str:
+    """
+    Chemin du fichier de l'élève associé à un modèle entraîné
+    """
+    return os.path.join(model_path, STUDENT_SUBDIR, STUDENT_FILENAME)
+
+
+class CharNgramStudent:
+    """
+    Élève distillé du classifieur DistilBERT : n-grammes de caractères (TF-IDF)
+    et régression logistique multinomiale.
+
+    L'élève apprend les probabilités du professeur (adoucies par une température)
+    mélangées aux vrais labels : chaque exemple est répété une fois par intent,
+    pondéré par sa probabilité cible, ce qui revient à minimiser l'entropie
+    croisée avec les cibles douces.
+    """
+
+    def __init__(self, id2label: Dict[int, str], ngram_range=(2, 5), C: float = 10.0):
+        """
+        Args:
+            id2label: correspondance identifiant -> intent (celle du professeur)
+            ngram_range: tailles des n-grammes de caractères
+            C: inverse de la régularisation de la régression logistique
+        """
+        self.id2label = dict(id2label)
+        self.vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=ngram_range, sublinear_tf=True)
+        self.classifier = LogisticRegression(C=C, max_iter=2000)
+
+    def fit(self, texts: List[str], teacher_probabilities: np.ndarray, labels: List[int],
+            temperature: float = 2.0, alpha: float = 0.7):
+        """
+        Entraîne l'élève
+
+        Args:
+            texts: exemples d'entraînement
+            teacher_probabilities: probabilités du professeur (une ligne par texte)
+            labels: vrais identifiants d'intents
+            temperature: adoucissement des probabilités du professeur
+            alpha: poids des cibles du professeur face aux vrais labels
+        """
+        # softmax(logits / T) à partir de softmax(logits) : p^(1/T) renormalisé
+        soft = np.power(np.asarray(teacher_probabilities, dtype=float), 1.0 / temperature)
+        soft /= soft.sum(axis=1, keepdims=True)
+        targets = alpha * soft + (1 - alpha) * np.eye(len(self.id2label))[labels]
+
+        features = self.vectorizer.fit_transform(texts)
+        n_texts, n_labels = targets.shape
+        rows = np.repeat(np.arange(n_texts), n_labels)
+        self.classifier.fit(
+            features[rows],
+            np.tile(np.arange(n_labels), n_texts),
+            sample_weight=targets.ravel()
+        )
+        return self
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        """
+        Probabilités des intents, colonnes dans l'ordre des identifiants
+        """
+        probabilities = np.zeros((len(texts), len(self.id2label)), dtype=np.float32)
+        probabilities[:, self.classifier.classes_] = self.classifier.predict_proba(self.vectorizer.transform(texts))
+        return probabilities
+
+    def save(self, path: str):
+        """
+        Sauvegarde l'élève (un seul fichier joblib)
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path: str) -> "CharNgramStudent":
+        """
+        Charge un élève sauvegardé
+        """
+        return joblib.load(path)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson est optionnel (JSON_BACKEND=orjson)
+    orjson = None
+
+JSON_BACKENDS = ("json", "orjson")
+
+
+def _numpy_default(value: Any) -> Any:
+    """
+    Valeurs que le module json ne sait pas encoder (scalaires et tableaux NumPy)
+    """
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"Type non sérialisable en JSON : {type(value).__name__}")
+
+
+def dumps(data: Any, backend: str = "json") -> bytes:
+    """
+    Encode en JSON UTF-8. Avec backend="orjson" (si installé), l'encodage est fait
+    en C, sans échappement des caractères non ASCII ; sinon module json standard
+    """
+    if backend == "orjson" and orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, default=_numpy_default).encode('utf-8')
+
+
+def resolve_backend(backend: str) -> str:
+    """
+    Backend effectivement utilisé ("orjson" retombe sur "json" s'il n'est pas installé)
+    """
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"Backend JSON inconnu : {backend}")
+    if backend == "orjson" and orjson is None:
+        print("⚠️  orjson n'est pas installé : encodage JSON standard")
+        return "json"
+    return backend
+
+
+class StaticPayloadCache:
+    """
+    Réponses JSON de données statiques, encodées une seule fois avec leur ETag.
+
+    Chaque entrée est associée à une version de ses données (par exemple
+    ChatbotBancaire.catalog_version) : elle n'est réencodée que si la version change.
+    """
+
+    def __init__(self, encode: Callable[[Any], bytes] = dumps):
+        """
+        Args:
+            encode: encodeur des données (par défaut json standard)
+        """
+        self.encode = encode
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[Hashable, bytes, str]] = {}  # clé -> (version, corps, ETag)
+
+    def get(self, key: Hashable, version: Hashable, build: Callable[[], Any]) -> Tuple[bytes, str]:
+        """
+        Retourne (corps encodé, ETag) ; `build` fournit les données si l'entrée est absente ou périmée
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1], entry[2]
+
+        body = self.encode(build())
+        etag = hashlib.sha1(body).hexdigest()
+        with self._lock:
+            self._entries[key] = (version, body, etag)
+        return body, etag
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class MessageAnalysisCache:
+    """
+    Cache LRU + TTL des analyses de messages (intent, confiance, entités).
+
+    La clé est le message normalisé ; seul le résultat sans état est stocké,
+    jamais le contexte de conversation de l'utilisateur.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 3600.0):
+        """
+        Args:
+            max_size: nombre maximal d'entrées (0 désactive le cache)
+            ttl: durée de vie d'une entrée en secondes
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # clé -> (expiration, analyse)
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+
+    @staticmethod
+    def normalize(message: str) -> str:
+        """
+        Normalise un message pour la clé du cache (Unicode NFC, minuscules, sans espaces aux bords).
+        Les espaces internes sont conservés : les patterns d'extraction en dépendent
+        """
+        return unicodedata.normalize('NFC', message).strip().lower()
+
+    @staticmethod
+    def _copy(analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copie une analyse pour que l'appelant ne modifie pas l'entrée du cache
+        """
+        return dict(analysis, entities=dict(analysis['entities']))
+
+    def get(self, message: str) -> Optional[Dict[str, Any]]:
+        """
+        Retourne l'analyse en cache pour ce message, ou None
+        """
+        if self.max_size <= 0:
+            return None
+
+        key = self.normalize(message)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+
+            expires_at, analysis = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return self._copy(analysis)
+
+    def put(self, message: str, analysis: Dict[str, Any]):
+        """
+        Enregistre l'analyse d'un message
+        """
+        if self.max_size <= 0:
+            return
+
+        key = self.normalize(message)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, self._copy(analysis))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def clear(self):
+        """
+        Vide le cache (par exemple quand un nouveau modèle est chargé)
+        """
+        with self._lock:
+            self._entries.clear()
+            self.stats['invalidations'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne les métriques du cache
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self._entries)
+        stats['max_size'] = self.max_size
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
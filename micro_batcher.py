@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+
+
+class MicroBatchScheduler:
+    """
+    Regroupe les requêtes concurrentes en micro-lots avant de les envoyer aux modèles.
+
+    Le premier élément reçu ouvre une fenêtre de `max_wait_ms` millisecondes ;
+    le lot part dès que la fenêtre expire ou que `max_batch_size` éléments
+    sont réunis. `process_batch` reçoit la liste des éléments et doit retourner
+    la liste des résultats dans le même ordre.
+    """
+
+    def __init__(self, process_batch: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 16, max_wait_ms: float = 5.0, max_queue_size: int = 1024):
+        """
+        Initialise le planificateur et démarre le thread de traitement
+
+        Args:
+            process_batch: fonction de traitement d'un lot
+            max_batch_size: taille maximale d'un lot (débit)
+            max_wait_ms: attente maximale pour compléter un lot (latence)
+            max_queue_size: nombre maximal de requêtes en attente
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue(maxsize=max_queue_size)
+
+        # Métriques
+        self._metrics_lock = threading.Lock()
+        self._batch_count = 0
+        self._item_count = 0
+        self._max_queue_depth = 0
+        self._total_wait = 0.0
+        self._total_batch_time = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any, timeout: float = 30.0) -> Any:
+        """
+        Soumet un élément et attend son résultat
+
+        Raises:
+            queue.Full: si la file d'attente est pleine
+            TimeoutError: si le résultat n'est pas disponible à temps
+        """
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()), block=False)
+
+        depth = self._queue.qsize()
+        with self._metrics_lock:
+            if depth > self._max_queue_depth:
+                self._max_queue_depth = depth
+
+        return future.result(timeout=timeout)
+
+    def _collect_batch(self) -> List[Any]:
+        """
+        Attend un premier élément puis complète le lot jusqu'à la fin de la fenêtre
+        """
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        """
+        Boucle du thread de traitement
+        """
+        while True:
+            batch = self._collect_batch()
+            started = time.perf_counter()
+            items = [item for item, _, _ in batch]
+
+            try:
+                results = self.process_batch(items)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+
+            finished = time.perf_counter()
+            with self._metrics_lock:
+                self._batch_count += 1
+                self._item_count += len(batch)
+                self._total_wait += sum(started - enqueued for _, _, enqueued in batch)
+                self._total_batch_time += finished - started
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Retourne les métriques du planificateur (profondeur de file, taille des lots, temps)
+        """
+        with self._metrics_lock:
+            batch_count = self._batch_count
+            item_count = self._item_count
+            return {
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self._max_queue_depth,
+                'batch_count': batch_count,
+                'item_count': item_count,
+                'avg_batch_size': item_count / batch_count if batch_count else 0.0,
+                'avg_queue_wait_ms': self._total_wait / item_count * 1000 if item_count else 0.0,
+                'avg_batch_time_ms': self._total_batch_time / batch_count * 1000 if batch_count else 0.0,
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000
+            }
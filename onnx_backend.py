@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+from types import SimpleNamespace
+from typing import Optional
+
+import torch
+
+# Sous-dossier du modèle entraîné où est rangé l'export ONNX
+ONNX_SUBDIR = "onnx"
+ONNX_FILENAME = "model.onnx"
+
+
+def onnx_model_path(model_path: str) -> str:
+    """
+    Chemin du fichier ONNX associé à un modèle entraîné
+    """
+    return os.path.join(model_path, ONNX_SUBDIR, ONNX_FILENAME)
+
+
+def _weights_mtime(model_path: str) -> float:
+    """
+    Date de dernière modification des poids PyTorch (0 si absents)
+    """
+    mtimes = [
+        os.path.getmtime(os.path.join(model_path, name))
+        for name in ("model.safetensors", "pytorch_model.bin")
+        if os.path.exists(os.path.join(model_path, name))
+    ]
+    return max(mtimes, default=0.0)
+
+
+def export_intent_model(model_path: str = "./intent_model", onnx_path: Optional[str] = None) -> str:
+    """
+    Exporte le modèle d'intent entraîné au format ONNX (axes batch et séquence dynamiques).
+    Retourne le chemin du fichier exporté
+    """
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    onnx_path = onnx_path or onnx_model_path(model_path)
+    os.makedirs(os.path.dirname(onnx_path), exist_ok=True)
+
+    model = AutoModelForSequenceClassification.from_pretrained(model_path).eval()
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    sample = tokenizer(["Je voudrais simuler un crédit"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask") if name in sample]
+
+    # Export dans un fichier temporaire propre au processus, puis remplacement atomique :
+    # un lecteur concurrent (autre worker) ne voit jamais de fichier tronqué
+    tmp_path = f"{onnx_path}.{os.getpid()}.tmp"
+    print(f"🔄 Export ONNX du modèle d'intent vers {onnx_path}...")
+    try:
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                tuple(sample[name] for name in input_names),
+                tmp_path,
+                input_names=input_names,
+                output_names=["logits"],
+                dynamic_axes={
+                    **{name: {0: "batch", 1: "sequence"} for name in input_names},
+                    "logits": {0: "batch"}
+                },
+                opset_version=17,
+                dynamo=False
+            )
+        os.replace(tmp_path, onnx_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    print("✅ Export ONNX terminé")
+    return onnx_path
+
+
+class OnnxIntentModel:
+    """
+    Modèle d'intent servi par ONNX Runtime (CPU).
+
+    S'appelle comme le modèle PyTorch (`model(**inputs).logits`), ce qui permet
+    à IntentClassifier de l'utiliser sans changer ses méthodes de prédiction.
+    """
+
+    def __init__(self, onnx_path: str, intra_op_threads: int = 0):
+        """
+        Args:
+            onnx_path: fichier ONNX exporté
+            intra_op_threads: threads par opérateur (0 : nombre de cœurs physiques)
+        """
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = 1  # Un seul graphe séquentiel : le parallélisme est intra-op
+
+        self.onnx_path = onnx_path
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+
+    def __call__(self, **inputs):
+        feeds = {name: inputs[name].numpy().astype("int64", copy=False) for name in self.input_names}
+        logits = self.session.run(["logits"], feeds)[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+
+def ensure_onnx_export(model_path: str = "./intent_model") -> str:
+    """
+    Exporte le modèle d'intent si l'export ONNX est absent ou plus ancien
+    que les poids PyTorch. Retourne le chemin du fichier ONNX
+    """
+    onnx_path = onnx_model_path(model_path)
+    if not os.path.exists(onnx_path) or os.path.getmtime(onnx_path) < _weights_mtime(model_path):
+        export_intent_model(model_path, onnx_path)
+    return onnx_path
+
+
+def load_onnx_intent_model(model_path: str = "./intent_model", intra_op_threads: int = 0) -> OnnxIntentModel:
+    """
+    Charge le modèle d'intent dans ONNX Runtime, en l'exportant d'abord si nécessaire
+    """
+    return OnnxIntentModel(ensure_onnx_export(model_path), intra_op_threads=intra_op_threads)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Service multi-processus pré-forké : le processus maître charge les modèles
+(IntentClassifier et EntityExtractor) une seule fois, puis les workers forkés
+partagent ces poids en lecture seule par copie à l'écriture (copy-on-write).
+Utilisé par les hooks de gunicorn.conf.py.
+"""
+
+import gc
+import os
+
+import torch
+
+import app_flask
+from app_flask import initialize_chatbot
+from onnx_backend import ensure_onnx_export
+
+
+def worker_threads(workers: int, threads: int = 0) -> int:
+    """
+    Threads torch par worker : `threads` s'il est fixé, sinon les cœurs répartis
+    entre les workers (pas de sursouscription des cœurs)
+    """
+    if threads > 0:
+        return threads
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def load_shared_models():
+    """
+    Dans le maître, avant le premier fork : charge les modèles puis gèle le tas Python
+    """
+    config = app_flask.app.config
+
+    # Aucun pool de threads OpenMP dans le maître : il ne serait pas utilisable après le fork
+    torch.set_num_threads(1)
+
+    if config['INTENT_BACKEND'] == 'onnx':
+        # Les threads d'une session ONNX Runtime ne survivent pas au fork :
+        # le maître exporte le modèle une seule fois (pas d'exports concurrents
+        # entre workers), chaque worker crée ensuite sa session (load_worker_sessions)
+        # et seul le modèle NER est partagé
+        try:
+            ensure_onnx_export(config['INTENT_MODEL_PATH'])
+        except ImportError as e:
+            print(f"⚠️  Export ONNX impossible ({e}), les workers utiliseront PyTorch")
+        config['PRELOAD_MODELS'] = False
+        initialize_chatbot().entity_extractor.preload()
+    else:
+        config['PRELOAD_MODELS'] = True
+        initialize_chatbot()
+
+    freeze_heap()
+
+
+def freeze_heap():
+    """
+    Déplace les objets existants dans la génération permanente du ramasse-miettes :
+    les collectes des workers ne les parcourent plus et ne réécrivent donc pas
+    les pages partagées avec le maître
+    """
+    gc.collect()
+    gc.freeze()
+
+
+def configure_worker(threads: int):
+    """
+    Dans un worker, juste après le fork : fixe ses threads d'inférence
+    """
+    torch.set_num_threads(threads)
+
+
+def load_worker_sessions():
+    """
+    Dans un worker, avec les modèles partagés : crée ce qui ne peut pas être hérité
+    du maître, c'est-à-dire la session ONNX Runtime (le fichier est déjà exporté)
+    """
+    if app_flask.app.config['INTENT_BACKEND'] == 'onnx':
+        initialize_chatbot().ensure_intent_model()
+
+
+def load_worker_models():
+    """
+    Chargement par worker (sans partage) : chaque worker charge ses propres modèles
+    """
+    app_flask.app.config['PRELOAD_MODELS'] = True
+    initialize_chatbot()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import ctypes
+import gc
+import io
+import itertools
+import sys
+import warnings
+
+import torch
+
+
+def quantize_dynamic_int8(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Quantification dynamique int8 des couches Linear d'un modèle (inférence CPU).
+
+    Les poids sont stockés en int8 et les activations quantifiées à la volée :
+    aucun jeu de calibration n'est nécessaire, la conversion se fait au chargement.
+    """
+    model.eval()
+    with torch.no_grad():
+        # Les poids safetensors sont des vues sur le fichier mappé en mémoire : tant qu'un
+        # tenseur float (embeddings, biais) y fait référence, tout le fichier reste résident.
+        # On les recopie d'abord pour que la quantification libère réellement la mémoire
+        for tensor in itertools.chain(model.parameters(), model.buffers()):
+            tensor.data = tensor.data.clone()
+        if hasattr(getattr(torch.ao, 'quantization', None), 'quantize_dynamic'):
+            model = _quantize_torch_ao(model)
+        else:
+            model = _quantize_torchao(model)
+    gc.collect()
+    release_free_memory()
+    return model
+
+
+def _quantize_torch_ao(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Quantification eager de torch.ao : noyaux int8 natifs (fbgemm / qnnpack), les plus
+    rapides sur CPU. L'API est dépréciée au profit de torchao ; l'avertissement est
+    masqué ici seulement, tant qu'elle reste disponible dans la version de torch installée
+    """
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=DeprecationWarning, message=r"torch\.ao\.quantization")
+        warnings.filterwarnings("ignore", category=UserWarning, message=r"torch\.quantize_per_tensor")
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def _quantize_torchao(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Quantification par l'API quantize_ de torchao (poids et activations int8),
+    pour les versions de torch sans torch.ao.quantization.quantize_dynamic
+    """
+    from torchao.quantization import Int8DynamicActivationInt8WeightConfig, quantize_
+
+    quantize_(model, Int8DynamicActivationInt8WeightConfig())
+    return model
+
+
+def release_free_memory():
+    """
+    Rend au système la mémoire libérée par les poids float32 (glibc la garde sinon
+    dans le tas du processus). Sans effet hors de Linux/glibc (macOS, musl)
+    """
+    if not sys.platform.startswith('linux'):
+        return
+    try:
+        libc = ctypes.CDLL("libc.so.6")
+    except OSError:
+        return
+    malloc_trim = getattr(libc, 'malloc_trim', None)
+    if malloc_trim is not None:
+        malloc_trim(0)
+
+
+def model_size_mb(model: torch.nn.Module) -> float:
+    """
+    Taille des poids d'un modèle une fois sérialisés (Mo)
+    """
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 1024 / 1024
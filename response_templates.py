@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+from typing import Any, Dict, Tuple
+
+from credit_calculator import SIMULATION_RESULT_TEMPLATE
+
+# Fragments des réponses produits
+PRODUCT_DETAIL_HEADER = "🏦 **{name}**\n\n📝 **Description :**\n{description}\n\n📊 **Caractéristiques :**\n"
+PRODUCT_DETAIL_ADVANTAGES = "\n✅ **Avantages :**\n"
+PRODUCT_DETAIL_FOOTER = "\n💡 **Conseil :** Souhaitez-vous une simulation personnalisée pour ce type de crédit ?"
+ALL_PRODUCTS_HEADER = "🏦 **Tous nos produits de crédit :**\n\n"
+PRODUCT_SUMMARY_HEADER = "**{name}**\n📝 Description : {description}\n📊 Caractéristiques :\n"
+PRODUCT_SUMMARY_ADVANTAGES = "✅ Avantages :\n"
+BULLET = "• {}\n"
+
+CREDIT_REQUEST_RESPONSE = """📋 **Étapes de la demande de crédit :**
+
+1️⃣ **Vérification d'éligibilité**
+   - Revenus minimum : 1500€/mois
+   - Âge : 18-75 ans
+   - Résidence en France
+
+2️⃣ **Documents nécessaires :**
+   - Pièce d'identité
+   - Justificatifs de revenus (3 derniers bulletins)
+   - Justificatif de domicile
+   - RIB
+
+3️⃣ **Rendez-vous conseiller :**
+   Souhaitez-vous prendre rendez-vous avec un conseiller pour finaliser votre demande ?
+
+⏰ **Durée de traitement :** 48-72h après réception du dossier complet
+
+💡 **Conseil :** Avez-vous déjà fait une simulation ? C'est recommandé avant de faire votre demande."""
+
+SUPPORT_RESPONSE = """🔧 **Support Client**
+
+Je suis là pour vous aider ! Voici les options disponibles :
+
+📞 **Contact conseiller :**
+• Téléphone : 01 23 45 67 89
+• Horaires : Lun-Ven 9h-18h, Sam 9h-12h
+• Email : conseiller@banque.fr
+
+💬 **Chat en direct :**
+• Disponible 24h/24
+• Temps de réponse : < 2 minutes
+
+📧 **Email support :**
+• support@banque.fr
+• Réponse sous 24h
+
+🔐 **Mot de passe oublié :**
+• Cliquez sur "Mot de passe oublié" sur la page de connexion
+• Un lien de réinitialisation vous sera envoyé par email
+
+Que puis-je faire pour vous aider davantage ?"""
+
+FINANCIAL_CALC_TEMPLATE = """💰 **Calculs financiers :**
+
+📊 **Détail des coûts :**
+• Coût du crédit (hors assurance) : {total_interest:,.0f}€
+• Frais de dossier : {filing_fees}€
+• Coût total : {total_cost:,.0f}€
+
+📈 **Comparaisons possibles :**
+• Avec/sans assurance
+• Différentes durées
+• Différents montants
+
+Que souhaitez-vous calculer précisément ?"""
+
+INSURANCE_OFFER = "\n\nSouhaitez-vous ajouter une assurance emprunteur à cette simulation ?"
+
+
+def split_paragraphs(text: str) -> Tuple[str, ...]:
+    """
+    Découpe un texte en paragraphes (séparateurs conservés) pour l'envoyer par morceaux
+    """
+    paragraphs = text.split("\n\n")
+    return tuple(paragraph + "\n\n" for paragraph in paragraphs[:-1]) + (paragraphs[-1],)
+
+
+def intern_all(chunks) -> Tuple[str, ...]:
+    return tuple(sys.intern(chunk) for chunk in chunks)
+
+
+def bullets(items) -> str:
+    return ''.join(map(BULLET.format, items))
+
+
+class ResponseTemplates:
+    """
+    Réponses du chatbot rendues une fois pour toutes : textes constants (support,
+    demande de crédit) et blocs produits, calculés à la construction ou au
+    rechargement du catalogue (`render`), sous forme de chaînes internées.
+
+    Chaque réponse existe en morceaux (pour /chat/stream) et en texte complet.
+    Seuls les montants des simulations et des calculs sont formatés à chaque requête.
+    """
+
+    simulation_result = SIMULATION_RESULT_TEMPLATE
+    simulation_result_with_offer = SIMULATION_RESULT_TEMPLATE + INSURANCE_OFFER
+    financial_calc = FINANCIAL_CALC_TEMPLATE
+
+    def __init__(self, product_info: Dict[str, Dict[str, Any]]):
+        self.support_chunks = intern_all(split_paragraphs(SUPPORT_RESPONSE))
+        self.support = sys.intern(SUPPORT_RESPONSE)
+        self.credit_request = sys.intern(CREDIT_REQUEST_RESPONSE)
+        self.render(product_info)
+
+    def render(self, product_info: Dict[str, Dict[str, Any]]):
+        """
+        Rend les réponses produits du catalogue (fiche de chaque produit et liste complète)
+        """
+        product_chunks = {}
+        for credit_type, product in product_info.items():
+            product_chunks[credit_type] = intern_all((
+                PRODUCT_DETAIL_HEADER.format(name=product['name'], description=product['description']),
+                bullets(product['features']),
+                PRODUCT_DETAIL_ADVANTAGES,
+                bullets(product['advantages']),
+                PRODUCT_DETAIL_FOOTER
+            ))
+
+        all_products_chunks = intern_all((ALL_PRODUCTS_HEADER,) + tuple(
+            PRODUCT_SUMMARY_HEADER.format(name=product['name'], description=product['description'])
+            + bullets(product['features'])
+            + PRODUCT_SUMMARY_ADVANTAGES
+            + bullets(product['advantages'])
+            + "\n"
+            for product in product_info.values()
+        ))
+
+        # Chaque table est remplacée d'un bloc, jamais modifiée en place pendant qu'elle est servie
+        self.product_chunks = product_chunks
+        self.products = {credit_type: sys.intern(''.join(chunks)) for credit_type, chunks in product_chunks.items()}
+        self.all_products_chunks = all_products_chunks
+        self.all_products = sys.intern(''.join(all_products_chunks))
+
+    def format_simulation(self, simulation: Dict[str, float], insurance_offer: bool = False) -> str:
+        """
+        Résultat d'une simulation : seuls les trois montants sont formatés
+        """
+        template = self.simulation_result_with_offer if insurance_offer else self.simulation_result
+        return template % (simulation['mensualite'], simulation['total_rembourse'], simulation['interets'])
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import re
+import socket
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+from urllib.parse import urlparse
+
+from context_store import ConversationContextStore
+
+# Clés des simulations (résultat de CreditCalculator.simulate_credit), sérialisées par position
+SIMULATION_KEYS = ('mensualite', 'total_rembourse', 'interets')
+
+
+def serialize_context(context: Dict[str, Any]) -> bytes:
+    """
+    Sérialisation compacte d'un contexte : tableau JSON positionnel, sans espaces,
+    chaque simulation réduite à ses trois montants
+    """
+    simulations = [
+        [simulation[key] for key in SIMULATION_KEYS] if simulation.keys() == set(SIMULATION_KEYS) else simulation
+        for simulation in context['simulation_history']
+    ]
+    return json.dumps(
+        [context['conversation_count'], context['last_intent'], context['last_entities'], simulations],
+        ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+def deserialize_context(data: bytes, context: Optional[Any] = None) -> Any:
+    """
+    Inverse de serialize_context. Sans `context`, retourne un dict ; sinon remplit
+    le contexte fourni (par exemple un ConversationState neuf) et le retourne
+    """
+    conversation_count, last_intent, last_entities, simulations = json.loads(data)
+    simulation_history = [
+        dict(zip(SIMULATION_KEYS, simulation)) if isinstance(simulation, list) else simulation
+        for simulation in simulations
+    ]
+    if context is None:
+        context = {'simulation_history': simulation_history}
+    else:
+        context['simulation_history'].extend(simulation_history)
+    context['last_intent'] = last_intent
+    context['last_entities'] = last_entities
+    context['conversation_count'] = conversation_count
+    return context
+
+
+class SessionBackend(ABC):
+    """
+    Stockage clé -> octets avec expiration, partagé entre workers
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Valeur d'une clé (None si absente ou expirée)
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float):
+        """
+        Enregistre une valeur qui expire après `ttl` secondes
+        """
+
+    @abstractmethod
+    def delete(self, key: str):
+        """
+        Supprime une clé
+        """
+
+    @abstractmethod
+    def count(self, prefix: str) -> int:
+        """
+        Nombre de clés non expirées commençant par `prefix`
+        """
+
+    def close(self):
+        pass
+
+
+class MemorySessionBackend(SessionBackend):
+    """
+    Stockage en mémoire du processus (tests, mesure du coût de la sérialisation seule)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}  # clé -> (expiration, valeur)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.time():
+                self._data.pop(key, None)
+                return None
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def count(self, prefix: str) -> int:
+        now = time.time()
+        with self._lock:
+            return sum(1 for key, (expires, _) in self._data.items() if expires > now and key.startswith(prefix))
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """
+    Stockage dans une base SQLite (mode WAL), partageable par les workers d'une même machine.
+    Une connexion par thread
+    """
+
+    def __init__(self, path: str = "sessions.db"):
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sessions (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._connection().execute(
+            "SELECT value FROM sessions WHERE key = ? AND expires > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO sessions (key, value, expires) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl)
+        )
+
+    def delete(self, key: str):
+        self._connection().execute("DELETE FROM sessions WHERE key = ?", (key,))
+
+    def count(self, prefix: str) -> int:
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM sessions WHERE substr(key, 1, ?) = ? AND expires > ?",
+            (len(prefix), prefix, time.time())
+        ).fetchone()[0]
+
+    def purge_expired(self) -> int:
+        """
+        Supprime les sessions expirées ; retourne leur nombre
+        """
+        return self._connection().execute("DELETE FROM sessions WHERE expires <= ?", (time.time(),)).rowcount
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class RedisError(Exception):
+    """
+    Erreur renvoyée par le serveur Redis
+    """
+
+
+class RedisSessionBackend(SessionBackend):
+    """
+    Stockage dans Redis (ou tout serveur parlant le protocole RESP), via un client
+    minimal sur socket : GET, SET ... PX, DEL. Une connexion par thread
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", timeout: float = 2.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.password = parsed.password
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._local.sock = sock
+        self._local.reader = sock.makefile('rb')
+        if self.password:
+            self._command(b'AUTH', self.password.encode('utf-8'))
+        if self.db:
+            self._command(b'SELECT', str(self.db).encode())
+
+    def _command(self, *args: bytes) -> Any:
+        """
+        Envoie une commande (tableau RESP de chaînes) et lit la réponse
+        """
+        if getattr(self._local, 'sock', None) is None:
+            self._connect()
+        payload = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            payload.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+        try:
+            self._local.sock.sendall(b''.join(payload))
+            return self._read_reply()
+        except (OSError, ConnectionError):
+            # Connexion fermée par le serveur : elle sera rouverte à la prochaine commande
+            self.close()
+            raise
+
+    def _read_reply(self) -> Any:
+        line = self._local.reader.readline()
+        if not line:
+            raise ConnectionError("Connexion Redis fermée")
+        prefix, body = line[:1], line[1:-2]
+        if prefix == b'+':
+            return body
+        if prefix == b'-':
+            raise RedisError(body.decode('utf-8', 'replace'))
+        if prefix == b':':
+            return int(body)
+        if prefix == b'$':
+            length = int(body)
+            if length < 0:
+                return None
+            return self._local.reader.read(length + 2)[:-2]
+        if prefix == b'*':
+            length = int(body)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise RedisError(f"Réponse RESP inattendue : {line!r}")
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._command(b'GET', key.encode('utf-8'))
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self._command(b'SET', key.encode('utf-8'), value, b'PX', str(max(1, int(ttl * 1000))).encode())
+
+    def delete(self, key: str):
+        self._command(b'DEL', key.encode('utf-8'))
+
+    def count(self, prefix: str) -> int:
+        """
+        Parcours par SCAN (sans bloquer le serveur comme KEYS) ; coût proportionnel au nombre de clés
+        """
+        pattern = re.sub(r'([*?\[\]\\])', r'\\\1', prefix) + '*'
+        cursor, total = b'0', 0
+        while True:
+            cursor, keys = self._command(b'SCAN', cursor, b'MATCH', pattern.encode('utf-8'), b'COUNT', b'1000')
+            total += len(keys)
+            if cursor == b'0':
+                return total
+
+    def ping(self) -> bool:
+        return self._command(b'PING') == b'PONG'
+
+    def close(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            self._local.reader.close()
+            sock.close()
+            self._local.sock = None
+
+
+class ExternalContextStore:
+    """
+    Contextes de conversation conservés dans un stockage externe (SQLite, Redis),
+    pour que tous les workers voient l'historique d'un utilisateur.
+
+    Même interface que ConversationContextStore : le contexte est lu au début
+    de `session`, puis réécrit (sérialisation compacte) à la sortie du bloc.
+    Les sessions d'un même utilisateur sont sérialisées dans le processus
+    (verrous partitionnés) ; entre workers, la dernière écriture l'emporte.
+    """
+
+    def __init__(self, backend: SessionBackend, context_factory: Callable[[], Any],
+                 ttl: float = 3600.0, num_locks: int = 64, key_prefix: str = "chatbot:session:",
+                 count_ttl: float = 5.0):
+        """
+        Args:
+            backend: stockage clé -> octets
+            context_factory: crée le contexte d'une nouvelle session
+            ttl: durée d'inactivité avant expiration d'une session, en secondes
+            num_locks: nombre de verrous (partitions) dans le processus
+            key_prefix: préfixe des clés dans le stockage
+            count_ttl: durée de validité, en secondes, du nombre de sessions
+                renvoyé par get_stats (comptage en O(sessions) dans le stockage)
+        """
+        self.backend = backend
+        self.context_factory = context_factory
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+        self._locks = [threading.RLock() for _ in range(num_locks)]
+        self._active = threading.local()  # Contextes en cours d'utilisation par thread
+
+        self.count_ttl = count_ttl
+        self._count_lock = threading.Lock()  # Un seul comptage à la fois
+        self._live_sessions = None
+        self._counted_at = 0.0
+
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'loads': 0,
+            'saves': 0,
+            'created': 0,
+            'bytes_written': 0
+        }
+
+    def _key(self, user_id: str) -> str:
+        return self.key_prefix + str(user_id)
+
+    def _lock(self, user_id: str) -> threading.RLock:
+        return self._locks[zlib.crc32(str(user_id).encode('utf-8')) % len(self._locks)]
+
+    @contextmanager
+    def session(self, user_id: str) -> Iterator[Any]:
+        """
+        Donne accès au contexte d'un utilisateur (créé s'il n'existe pas) et
+        l'enregistre à la sortie du bloc
+        """
+        with self._lock(user_id):
+            # Session imbriquée dans le même thread (save_simulation pendant process_message) :
+            # le contexte déjà chargé est partagé et sera enregistré par la session englobante
+            contexts = self._active.__dict__.setdefault('contexts', {})
+            if user_id in contexts:
+                yield contexts[user_id]
+                return
+
+            data = self.backend.get(self._key(user_id))
+            context = self.context_factory() if data is None else deserialize_context(data, self.context_factory())
+            contexts[user_id] = context
+            try:
+                yield context
+            finally:
+                del contexts[user_id]
+
+            payload = serialize_context(context)
+            self.backend.set(self._key(user_id), payload, self.ttl)
+            with self._stats_lock:
+                self.stats['loads'] += 1
+                self.stats['created'] += data is None
+                self.stats['saves'] += 1
+                self.stats['bytes_written'] += len(payload)
+
+    def get(self, user_id: str) -> Optional[Any]:
+        """
+        Retourne le contexte d'un utilisateur sans le créer (None si absent ou expiré)
+        """
+        data = self.backend.get(self._key(user_id))
+        return deserialize_context(data, self.context_factory()) if data is not None else None
+
+    def delete(self, user_id: str):
+        self.backend.delete(self._key(user_id))
+
+    def evict_expired(self):
+        """
+        L'expiration est assurée par le stockage (TTL Redis, colonne expires de SQLite)
+        """
+        if isinstance(self.backend, SQLiteSessionBackend):
+            self.backend.purge_expired()
+
+    def __contains__(self, user_id: str) -> bool:
+        return self.backend.get(self._key(user_id)) is not None
+
+    def __getitem__(self, user_id: str) -> Any:
+        context = self.get(user_id)
+        if context is None:
+            raise KeyError(user_id)
+        return context
+
+    def __len__(self) -> int:
+        return self.backend.count(self.key_prefix)
+
+    def live_sessions(self) -> int:
+        """
+        Nombre de sessions actives pour les métriques : recompté (SCAN Redis, COUNT SQLite)
+        au plus une fois toutes les count_ttl secondes
+        """
+        with self._count_lock:
+            now = time.monotonic()
+            if self._live_sessions is None or now - self._counted_at >= self.count_ttl:
+                self._live_sessions = len(self)
+                self._counted_at = now
+            return self._live_sessions
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne les métriques du store (sessions actives, lectures, écritures, taille moyenne sérialisée)
+        """
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['live_sessions'] = self.live_sessions()
+        stats['backend'] = type(self.backend).__name__
+        stats['ttl'] = self.ttl
+        stats['avg_bytes'] = stats['bytes_written'] / stats['saves'] if stats['saves'] else 0.0
+        return stats
+
+
+def create_context_store(backend: str, context_factory: Callable[[], Any], ttl: float = 3600.0,
+                         max_sessions: int = 100000, sqlite_path: str = "sessions.db",
+                         redis_url: str = "redis://localhost:6379/0"):
+    """
+    Crée le store de contextes selon le backend : "memory" (processus courant),
+    "sqlite" (fichier partagé par les workers d'une machine) ou "redis"
+    """
+    if backend == "memory":
+        return ConversationContextStore(context_factory, ttl=ttl, max_sessions=max_sessions)
+    if backend == "sqlite":
+        return ExternalContextStore(SQLiteSessionBackend(sqlite_path), context_factory, ttl=ttl)
+    if backend == "redis":
+        return ExternalContextStore(RedisSessionBackend(redis_url), context_factory, ttl=ttl)
+    raise ValueError(f"Backend de session inconnu : {backend}")
@@ -44,6 +44,8 @@ class SimpleIntentClassifier:
             ]
         }
         
+        self.compile_keywords()
+        
         # Expressions régulières pour détecter des montants et durées
         self.amount_pattern = re.compile(r'(\d+(?:\s*\d+)*)\s*€|(\d+(?:\s*\d+)*)\s*euros?')
         self.duration_pattern = re.compile(r'(\d+)\s*(?:an|ans|année|années|mois)')
@@ -78,39 +80,140 @@ class SimpleIntentClassifier:
             
         return entities
     
-    def classify_intent(self, text: str) -> Tuple[str, float]:
+    def compile_keywords(self):
         """
-        Classifie l'intent du texte en utilisant la correspondance de mots-clés
+        Compile la table des mots-clés en une seule expression régulière (trie).
+        
+        Dans un lookahead, l'expression donne à chaque position du texte le plus
+        long mot-clé qui y commence ; les mots-clés plus courts qui y commencent
+        aussi en sont des préfixes, précalculés ici. À rappeler après toute
+        modification de intent_keywords.
+        """
+        keywords = sorted(
+            {keyword.lower() for keywords in self.intent_keywords.values() for keyword in keywords},
+            key=len,
+            reverse=True
+        )
+        trie = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = {}  # Fin de mot-clé
+        self.keyword_pattern = re.compile('(?=(' + self._trie_to_regex(trie) + '))')
+        
+        # Mots-clés commençant à la même position que chaque correspondance la plus longue
+        self.keyword_prefixes = {
+            keyword: [other for other in keywords if keyword.startswith(other)]
+            for keyword in keywords
+        }
+        
+        # Nature (mot / non-mot) du premier et du dernier caractère, pour tester \\b
+        self.keyword_edges = {
+            keyword: (self._is_word_char(keyword[0]), self._is_word_char(keyword[-1]))
+            for keyword in keywords
+        }
+        
+        # Intents concernés par chaque mot-clé (une entrée par occurrence dans les listes)
+        self.keyword_intents = {}
+        for intent, keywords in self.intent_keywords.items():
+            for keyword in keywords:
+                self.keyword_intents.setdefault(keyword.lower(), []).append(intent)
+    
+    @classmethod
+    def _trie_to_regex(cls, node: Dict) -> str:
+        """
+        Convertit un trie de mots-clés en expression régulière : un seul chemin est
+        essayé par caractère, et la branche la plus longue est préférée
+        """
+        branches = [re.escape(char) + cls._trie_to_regex(child) for char, child in node.items() if char]
+        if not branches:
+            return ''
+        
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # Le mot-clé peut s'arrêter ici : la suite est optionnelle (gloutonne)
+            pattern = '(?:' + pattern + ')?'
+        return pattern
+    
+    @staticmethod
+    def _is_word_char(char: str) -> bool:
+        """
+        Caractère de mot au sens de \\w (lettre, chiffre ou _)
+        """
+        return char.isalnum() or char == '_'
+    
+    def find_keywords(self, text_lower: str) -> Dict[str, bool]:
+        """
+        Parcourt le texte en une passe et retourne les mots-clés trouvés,
+        associés à True si au moins une occurrence est un mot complet (équivalent de \\b...\\b)
+        """
+        is_word_char = self._is_word_char
+        text_length = len(text_lower)
+        found = {}
+        
+        for match in self.keyword_pattern.finditer(text_lower):
+            start = match.start()
+            word_before = start > 0 and is_word_char(text_lower[start - 1])
+            
+            for keyword in self.keyword_prefixes[match.group(1)]:
+                if found.get(keyword):
+                    continue
+                first_is_word, last_is_word = self.keyword_edges[keyword]
+                end = start + len(keyword)
+                word_after = end < text_length and is_word_char(text_lower[end])
+                found[keyword] = word_before != first_is_word and word_after != last_is_word
+        
+        return found
+    
+    def score_intents(self, text: str) -> Dict[str, float]:
+        """
+        Calcule le score normalisé de chaque intent par correspondance de mots-clés
         
         Returns:
-            Tuple[str, float]: (intent, confidence_score)
+            Dict[str, float]: score par intent, dans l'ordre de intent_keywords
         """
-        text_lower = text.lower()
+        # Compte les mots-clés trouvés (bonus si le mot-clé est un mot complet)
+        scores = dict.fromkeys(self.intent_keywords, 0)
+        for keyword, whole_word in self.find_keywords(text.lower()).items():
+            for intent in self.keyword_intents[keyword]:
+                scores[intent] += 2 if whole_word else 1
         
         # Calcul des scores pour chaque intent
         intent_scores = {}
         
         for intent, keywords in self.intent_keywords.items():
-            score = 0
             total_keywords = len(keywords)
             
-            # Compte les mots-clés trouvés
-            for keyword in keywords:
-                if keyword.lower() in text_lower:
-                    # Bonus si le mot-clé est un mot complet
-                    if re.search(r'\b' + re.escape(keyword.lower()) + r'\b', text_lower):
-                        score += 2
-                    else:
-                        score += 1
-            
             # Normalise le score avec boost si plusieurs mots-clés correspondent
             if total_keywords > 0:
-                normalized_score = score / total_keywords
+                normalized_score = scores[intent] / total_keywords
                 # Boost si score élevé
                 if normalized_score > 0.3:
                     normalized_score = min(normalized_score * 1.5, 1.0)
                 intent_scores[intent] = normalized_score
         
+        return intent_scores
+    
+    def classify_intent(self, text: str) -> Tuple[str, float]:
+        """
+        Classifie l'intent du texte en utilisant la correspondance de mots-clés
+        
+        Returns:
+            Tuple[str, float]: (intent, confidence_score)
+        """
+        intent, confidence, _ = self.classify_intent_with_margin(text)
+        return intent, confidence
+    
+    def classify_intent_with_margin(self, text: str) -> Tuple[str, float, float]:
+        """
+        Classifie l'intent et retourne l'écart de score avec le deuxième intent
+        
+        Returns:
+            Tuple[str, float, float]: (intent, confidence_score, margin)
+        """
+        intent_scores = self.score_intents(text)
+        
         # Trouve l'intent avec le meilleur score
         if intent_scores:
             best_intent = max(intent_scores, key=intent_scores.get)
@@ -118,10 +221,14 @@ class SimpleIntentClassifier:
             
             # Seuil minimal de confiance
             if confidence >= 0.1:
-                return best_intent, confidence
+                runner_up = max(
+                    (score for intent, score in intent_scores.items() if intent != best_intent),
+                    default=0.0
+                )
+                return best_intent, confidence, confidence - min(runner_up, 1.0)
         
         # Cas par défaut
-        return 'support_client', 0.1
+        return 'support_client', 0.1, 0.0
     
     def predict(self, text: str) -> Dict[str, any]:
         """
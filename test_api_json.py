@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+
+import app_flask
+from chatbot_bancaire import ChatbotBancaire
+from json_encoding import StaticPayloadCache, dumps
+
+
+def test_products_etag_and_reload(monkeypatch):
+    """Corps identique à jsonify, 304 sur If-None-Match, réencodé après rechargement du catalogue"""
+    chatbot = ChatbotBancaire()
+    monkeypatch.setattr(app_flask, 'chatbot', chatbot)
+    client = app_flask.app.test_client()
+
+    response = client.get('/api/products')
+    with app_flask.app.app_context():
+        expected = app_flask.jsonify({'success': True, 'products': chatbot.product_info}).get_data()
+    assert response.status_code == 200
+    assert response.get_data() == expected
+    etag = response.headers['ETag']
+
+    assert client.get('/api/products', headers={'If-None-Match': etag}).status_code == 304
+
+    chatbot.product_info['personnel']['name'] = "Prêt personnel"
+    chatbot.reload_product_catalog()
+    response = client.get('/api/products', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert json.loads(response.get_data())['products']['personnel']['name'] == "Prêt personnel"
+
+
+def test_static_cache_builds_once_per_version():
+    cache = StaticPayloadCache()
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {'taux': 0.035}
+
+    first = cache.get('rates', 1, build)
+    assert cache.get('rates', 1, build) == first
+    assert len(calls) == 1
+    assert cache.get('rates', 2, build) == first
+    assert len(calls) == 2
+
+
+def test_dumps_backends_agree():
+    import numpy as np
+
+    data = {'mensualite': np.float64(994.78), 'grille': np.arange(3), 'nom': 'Crédit'}
+    assert json.loads(dumps(data)) == json.loads(dumps(data, backend='orjson'))
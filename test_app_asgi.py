@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+
+import pytest
+
+from app_asgi import InferenceExecutor, ServerOverloaded
+
+
+def test_executor_rejects_beyond_workers_and_queue():
+    """Au-delà des threads et de la file, les requêtes sont refusées sans attendre"""
+    release = threading.Event()
+
+    async def scenario():
+        executor = InferenceExecutor(max_workers=2, max_queue=1)
+        admitted = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(ServerOverloaded):
+            await executor.run(release.wait)
+
+        release.set()
+        await asyncio.gather(*admitted)
+        stats = executor.get_stats()
+        executor.shutdown()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats['accepted'] == 3
+    assert stats['rejected'] == 1
+    assert stats['completed'] == 3
+    assert stats['in_flight'] == 0
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import queue
+import threading
+import time
+
+import pytest
+
+import app_flask
+from chatbot_bancaire import ChatbotBancaire
+
+
+@pytest.mark.parametrize("params, error", [
+    ({'montant': 10000, 'duree': 0}, "La durée doit être comprise entre 1 et 50 ans"),
+    ({'montant': 10000, 'duree': 100000}, "La durée doit être comprise entre 1 et 50 ans"),
+    ({'montant': -5, 'duree': 5}, "Le montant doit être strictement positif"),
+])
+def test_amortization_rejects_invalid_parameters(monkeypatch, params, error):
+    """Montant ou durée hors bornes : message explicite, aucun tableau calculé"""
+    monkeypatch.setattr(app_flask, 'chatbot', ChatbotBancaire())
+    response = app_flask.app.test_client().post('/api/amortization', json=params)
+    assert response.get_json() == {'success': False, 'error': error}
+
+
+def test_scheduler_is_created_once_under_concurrency(monkeypatch):
+    """Des premières requêtes simultanées partagent un seul planificateur (un seul thread)"""
+    created = []
+
+    class SlowScheduler:
+        def __init__(self, *args, **kwargs):
+            created.append(self)
+            time.sleep(0.05)
+
+    monkeypatch.setattr(app_flask, 'chatbot', ChatbotBancaire())
+    monkeypatch.setattr(app_flask, 'batch_scheduler', None)
+    monkeypatch.setattr(app_flask, 'MicroBatchScheduler', SlowScheduler)
+    schedulers = []
+    threads = [threading.Thread(target=lambda: schedulers.append(app_flask.get_batch_scheduler())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(scheduler is created[0] for scheduler in schedulers)
+
+
+def test_full_batch_queue_returns_overload_error(monkeypatch):
+    """File du micro-batching pleine : 503 avec un message explicite (et non une erreur vide)"""
+    class FullScheduler:
+        def submit(self, item):
+            raise queue.Full
+
+    monkeypatch.setattr(app_flask, 'chatbot', ChatbotBancaire())
+    monkeypatch.setattr(app_flask, 'batch_scheduler', FullScheduler())
+    monkeypatch.setitem(app_flask.app.config, 'MICRO_BATCH_ENABLED', True)
+    client = app_flask.app.test_client()
+
+    response = client.post('/chat', json={'message': "Bonjour", 'user_id': 'u'})
+    assert response.status_code == 503
+    assert response.get_json() == {'success': False, 'error': app_flask.SERVER_OVERLOADED_ERROR}
+
+    stream = client.post('/chat/stream', json={'message': "Bonjour", 'user_id': 'u'}).get_data(as_text=True)
+    assert 'event: error' in stream
+    assert json.loads(stream.split('data: ')[-1])['error'] == app_flask.SERVER_OVERLOADED_ERROR
+
+
+@pytest.mark.parametrize("grid, error", [
+    ({'montants': [10000], 'durees': [0, -1], 'taux': [3.5]}, "Les durées doivent être comprises entre 1 et 50 ans"),
+    ({'montants': [10000], 'durees': [100], 'taux': [3.5]}, "Les durées doivent être comprises entre 1 et 50 ans"),
+    ({'montants': [0, 10000], 'durees': [5], 'taux': [3.5]}, "Les montants doivent être strictement positifs"),
+    ({'montants': [-10000], 'durees': [5]}, "Les montants doivent être strictement positifs"),
+    ({'montants': [10000], 'durees': [5], 'taux': [-1200]}, "Les taux doivent être compris entre -100 (exclu) et 100 %"),
+    ({'montants': [10000], 'durees': [5], 'taux': [-100]}, "Les taux doivent être compris entre -100 (exclu) et 100 %"),
+])
+def test_simulate_batch_rejects_invalid_values(monkeypatch, grid, error):
+    """Valeurs hors bornes : message explicite au lieu d'une grille avec Infinity/NaN ou des montants négatifs"""
+    monkeypatch.setattr(app_flask, 'chatbot', ChatbotBancaire())
+    response = app_flask.app.test_client().post('/api/simulate/batch', json=grid)
+    assert response.get_json() == {'success': False, 'error': error}
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+import app_flask
+from chatbot_bancaire import ChatbotBancaire
+
+
+def analysis(intent, entities=None):
+    return {'intent': intent, 'confidence': 0.9, 'entities': entities or {}, 'entity_confidence': 0.9,
+            'classifier': 'transformer'}
+
+
+def test_stream_sends_product_answer_in_several_chunks():
+    """Les morceaux envoyés reconstituent exactement la réponse de process_message"""
+    chatbot = ChatbotBancaire()
+    expected = chatbot.process_message("Vos produits ?", "a", analysis=analysis('information_produit'),
+                                       verbose=False)['response']
+
+    events = list(chatbot.stream_message("Vos produits ?", "b", analysis=analysis('information_produit')))
+    tokens = [payload for event, payload in events if event == 'token']
+
+    assert events[0][0] == 'analysis'
+    assert events[-1][0] == 'done'
+    assert len(tokens) == 1 + len(chatbot.product_info)
+    assert ''.join(tokens) == expected
+    assert events[-1][1]['context']['conversation_count'] == 1
+
+
+def stream_events(client, **kwargs):
+    """(événement, données) de chaque événement SSE de /chat/stream"""
+    body = client.post('/chat/stream', **kwargs).get_data(as_text=True)
+    events = []
+    for block in body.split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if lines:
+            events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+@pytest.mark.parametrize("kwargs, error", [
+    ({'json': {'message': "   ", 'user_id': 'u'}}, "Message vide"),
+    ({'json': [1, 2]}, "Le corps de la requête doit être un objet JSON"),
+])
+def test_stream_reports_bad_requests_as_error_events(monkeypatch, kwargs, error):
+    """Message vide ou corps JSON qui n'est pas un objet : un événement `error`, pas une page 500"""
+    monkeypatch.setattr(app_flask, 'chatbot', ChatbotBancaire())
+    monkeypatch.setitem(app_flask.app.config, 'MICRO_BATCH_ENABLED', False)
+
+    events = stream_events(app_flask.app.test_client(), **kwargs)
+
+    assert events == [('error', {'success': False, 'error': error})]
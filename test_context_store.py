@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+from context_store import ConversationContextStore
+
+
+def new_context():
+    return {'conversation_count': 0, 'simulation_history': []}
+
+
+def test_concurrent_updates_are_not_lost():
+    """Les incréments concurrents d'une même session sont sérialisés"""
+    store = ConversationContextStore(new_context, num_shards=4)
+
+    def worker():
+        for i in range(500):
+            with store.session(f"user-{i % 3}") as context:
+                count = context['conversation_count']
+                time.sleep(0)  # Laisse la main aux autres threads au milieu de la lecture-écriture
+                context['conversation_count'] = count + 1
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(store[f"user-{i}"]['conversation_count'] for i in range(3)) == 8 * 500
+
+
+def test_idle_sessions_expire_and_size_is_bounded():
+    """Les sessions inactives expirent et les plus anciennes sont évincées au-delà de la limite"""
+    store = ConversationContextStore(new_context, num_shards=1, ttl=0.05, max_sessions=3)
+    for user_id in ("a", "b", "c", "d"):
+        with store.session(user_id):
+            pass
+    assert "a" not in store and len(store) == 3
+    assert store.get_stats()['evicted'] == 1
+
+    time.sleep(0.06)
+    store.evict_expired()
+    stats = store.get_stats()
+    assert stats['live_sessions'] == 0 and stats['expired'] == 3
+
+
+def test_non_string_user_id(monkeypatch):
+    """Un user_id numérique (JSON {"user_id": 5}) est accepté par le store et par /chat"""
+    store = ConversationContextStore(new_context, num_shards=4)
+    with store.session(5) as context:
+        context['conversation_count'] += 1
+    assert store[5]['conversation_count'] == 1
+
+    import app_flask
+    from chatbot_bancaire import ChatbotBancaire
+
+    monkeypatch.setattr(app_flask, 'chatbot', ChatbotBancaire())
+    monkeypatch.setitem(app_flask.app.config, 'MICRO_BATCH_ENABLED', False)
+    response = app_flask.app.test_client().post('/chat', json={'message': "Vos produits ?", 'user_id': 5})
+    assert response.get_json()['success'] is True
+    assert app_flask.chatbot.conversation_context['5']['conversation_count'] == 1
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from conversation_state import ConversationState, SimulationHistory
+
+
+def simulation(n):
+    return {'mensualite': 100.0 + n, 'total_rembourse': 6000.5 + n, 'interets': 500.25 + n}
+
+
+def test_history_keeps_last_five_simulations_in_order():
+    """Le tampon circulaire conserve les 5 dernières simulations, de la plus ancienne à la plus récente"""
+    history = SimulationHistory()
+    assert not history
+    for n in range(8):
+        history.append(simulation(n))
+
+    assert len(history) == 5
+    assert list(history) == [simulation(n) for n in range(3, 8)]
+    assert history[-1] == simulation(7)
+    assert history[0] == simulation(3)
+
+
+def test_state_behaves_like_the_former_dict():
+    """Accès par clé, get() et copie en dict comme l'ancien contexte"""
+    state = ConversationState()
+    state['conversation_count'] += 1
+    state['last_entities'] = {'montant': 50000.0}
+    state['simulation_history'] = [simulation(1), simulation(2)]
+
+    assert state.get('simulation_history')[-1] == simulation(2)
+    assert state.get('inconnu', 'défaut') == 'défaut'
+    assert state.to_dict() == {
+        'last_intent': None,
+        'last_entities': {'montant': 50000.0},
+        'simulation_history': [simulation(1), simulation(2)],
+        'conversation_count': 1
+    }
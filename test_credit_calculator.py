@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from credit_calculator import CreditCalculator, _taeg_memoise
+
+
+def test_amortization_schedule_matches_month_by_month_loop():
+    """Le tableau vectoriel correspond au calcul mois par mois"""
+    calculator = CreditCalculator(10000, 20, 3.5)
+    schedule = calculator.amortization_schedule(200000, 25, 3.2, insurance=0.36)
+    assert len(schedule['mois']) == 300
+
+    calculator.taux_annuel = 3.2
+    simulation = calculator.simulate_credit(capital=200000, duration_years=25)
+    mensualite = schedule['mensualite'][0] - schedule['assurance'][0]
+    assert round(mensualite, 2) == simulation['mensualite']
+
+    balance = 200000.0
+    for month in range(300):
+        interest = balance * 3.2 / 12 / 100
+        balance -= mensualite - interest
+        assert np.isclose(schedule['interets'][month], interest)
+        assert np.isclose(schedule['capital_restant'][month], balance, atol=1e-6)
+
+    assert schedule['capital_restant'][-1] == 0.0
+    assert np.isclose(schedule['capital_rembourse'].sum(), 200000)
+    assert np.isclose(schedule['assurance'].sum(), 200000 * 0.36 / 100 * 25)
+
+
+def test_amortization_schedule_zero_rate():
+    """Un taux nul donne un remboursement linéaire sans intérêts"""
+    schedule = CreditCalculator(10000, 20, 3.5).amortization_schedule(12000, 1, 0)
+    assert np.allclose(schedule['mensualite'], 1000)
+    assert np.allclose(schedule['interets'], 0)
+    assert schedule['capital_restant'][-1] == 0.0
+
+
+def test_simulate_grid_matches_single_simulations():
+    """Chaque cellule de la grille correspond à simulate_credit"""
+    calculator = CreditCalculator(10000, 20, 3.5)
+    amounts, durations, rates = [5000, 50000, 250000], [2, 7, 25], [1.9, 3.5, 6.2]
+    grid = calculator.simulate_grid(amounts, durations, rates)
+    assert grid['mensualite'].shape == (3, 3, 3)
+
+    for i, amount in enumerate(amounts):
+        for j, duration in enumerate(durations):
+            for k, rate in enumerate(rates):
+                calculator.taux_annuel = rate
+                simulation = calculator.simulate_credit(capital=amount, duration_years=duration)
+                assert grid['mensualite'][i, j, k] == simulation['mensualite']
+                assert np.isclose(grid['total_rembourse'][i, j, k], simulation['total_rembourse'], atol=0.01)
+                assert np.isclose(grid['interets'][i, j, k], simulation['interets'], atol=0.01)
+
+
+@pytest.mark.parametrize("amounts, durations, rates", [
+    ([10000], [0, 5], [3.5]),
+    ([10000], [-1], [3.5]),
+    ([0], [5], [3.5]),
+    ([float('nan')], [5], [3.5]),
+    ([10000], [5], [-1200]),
+    ([10000], [5], [float('inf')]),
+])
+def test_simulate_grid_rejects_out_of_range_values(amounts, durations, rates):
+    with pytest.raises(ValueError):
+        CreditCalculator(10000, 20, 3.5).simulate_grid(amounts, durations, rates)
+
+
+def test_taeg_solves_actuarial_equation():
+    """Le TAEG actualise les échéances (crédit + assurance) au capital net des frais"""
+    calculator = CreditCalculator(10000, 20, 3.5)
+    # Sans frais ni assurance, le TAEG est le taux nominal exprimé en taux annuel équivalent
+    assert calculator.calculer_taeg(50000, 5, 3.5) == round(((1 + 3.5 / 1200) ** 12 - 1) * 100, 2)
+    assert calculator.calculer_taeg(12000, 1, 0) == 0.0
+
+    taeg = calculator.calculer_taeg_grid(50000, 5, 3.5, frais_dossier=500, assurance_mensuelle=15)
+    mensualite = calculator.simulate_grid([50000], [5], [3.5])['mensualite'][0, 0, 0]
+    taux_mensuel = (1 + taeg / 100) ** (1 / 12) - 1
+    valeur_actuelle = sum((mensualite + 15) / (1 + taux_mensuel) ** k for k in range(1, 61))
+    assert abs(valeur_actuelle - 49500) < 1.0
+    assert calculator.calculer_taeg(50000, 5, 3.5, 500, 15) == round(float(taeg), 2)
+
+
+def test_taeg_rejects_non_positive_net_amount_or_duration():
+    """Frais ≥ montant ou durée nulle : ValueError, rien n'est mémoïsé"""
+    calculator = CreditCalculator(10000, 20, 3.5)
+    cached = _taeg_memoise.cache_info().currsize
+    with pytest.raises(ValueError):
+        calculator.calculer_taeg(1000, 1, 3.5, 2000, 0)
+    with pytest.raises(ValueError):
+        calculator.calculer_taeg(1000, 0, 3.5)
+    with pytest.raises(ValueError):
+        calculator.calculer_taeg_grid([1000, 5000], 1, 3.5, frais_dossier=1000)
+    assert _taeg_memoise.cache_info().currsize == cached
+
+
+def test_simulate_credit_uses_rate_table_of_credit_type():
+    """Le taux suit le type de crédit et la tranche de durée ; la table précalculée donne le même résultat"""
+    calculator = CreditCalculator(10000, 20, 3.5)
+    assert calculator.get_rate('immobilier', 12) == 3.2
+    assert calculator.get_rate('immobilier', 30) == 4.1
+    assert calculator.get_rate('inconnu', 5) == 3.5
+
+    for credit_type, years in [('personnel', 5), ('immobilier', 20), ('automobile', 3), ('travaux', 2)]:
+        rate = calculator.get_rate(credit_type, years)
+        expected = calculator.simulate_grid([100000], [years], [rate])
+        simulation = calculator.simulate_credit(capital=100000, duration_years=years, credit_type=credit_type)
+        assert simulation['mensualite'] == expected['mensualite'][0, 0, 0]
+        assert simulation['total_rembourse'] == expected['total_rembourse'][0, 0, 0]
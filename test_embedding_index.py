@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from embedding_index import IntentEmbeddingIndex
+
+
+class CountingEmbedder:
+    """Encodeur déterministe (histogramme de lettres) qui compte les textes encodés"""
+    model_path = "counting"
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, texts):
+        self.encoded += len(texts)
+        vectors = np.zeros((len(texts), 26), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for char in text.lower():
+                if 'a' <= char <= 'z':
+                    vectors[row, ord(char) - ord('a')] += 1
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_incremental_build_and_neighbours(tmp_path):
+    """Seuls les nouveaux exemples sont encodés ; l'index rouvert est mappé en mémoire"""
+    embedder = CountingEmbedder()
+    index = IntentEmbeddingIndex(embedder, str(tmp_path), k=2)
+    examples = [("taeg taux", "calcul_financier"), ("mot de passe", "support_client"), ("taux annuel", "calcul_financier")]
+    assert index.sync(examples) == {'encoded': 3, 'reused': 0, 'removed': 0}
+    assert index.sync(examples[1:] + [("conseiller", "support_client")]) == {'encoded': 1, 'reused': 2, 'removed': 1}
+    assert embedder.encoded == 4
+
+    reopened = IntentEmbeddingIndex(CountingEmbedder(), str(tmp_path), k=2)
+    assert isinstance(reopened.vectors, np.memmap)
+    result = reopened.classify("le taux annuel")
+    assert result['intent'] == 'calcul_financier'
+    assert result['neighbors'][0]['text'] == "taux annuel"
+    assert abs(sum(result['all_confidences'].values()) - 1.0) < 1e-6
+
+    reopened.add_examples("assurance", ["assurance emprunteur"])
+    assert reopened.classify("assurance")['intent'] == 'assurance'
+
+
+def test_classification_during_updates_sees_consistent_index(tmp_path):
+    """Un lecteur concurrent ne voit jamais de nouveaux vecteurs associés aux anciens exemples"""
+    class CheckedIndex(IntentEmbeddingIndex):
+        """Classifie après chaque écriture d'attribut, comme un thread qui prendrait la main à ce moment"""
+
+        def __setattr__(self, name, value):
+            super().__setattr__(name, value)
+            if getattr(self, 'checking', False) and len(self.examples):
+                for neighbour in self.classify("taux de la banque")['neighbors']:
+                    assert neighbour['intent'] == intents[neighbour['text']]
+
+    intents = {"taux annuel": "calcul_financier", "mot de passe": "support_client", "taux zzz": "nouvel_intent"}
+    index = CheckedIndex(CountingEmbedder(), str(tmp_path), k=3)
+    index.sync([("taux annuel", "calcul_financier"), ("mot de passe", "support_client")])
+    index.checking = True
+
+    index.add_examples("nouvel_intent", ["taux zzz"])
+    assert len(index.examples) == len(index.vectors) == 3
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import re
+import threading
+
+from entity_extractor import EntityExtractor
+
+
+def legacy_extract_entities_regex(extractor, text):
+    """Extraction regex d'origine (findall sur chaque pattern non compilée)"""
+    entities = {}
+    for slot, patterns in extractor.patterns.items():
+        for pattern in patterns:
+            matches = re.findall(pattern, text, re.IGNORECASE)
+            if matches:
+                entities[slot] = matches[0]
+                break
+    return entities
+
+
+def test_compiled_regex_keeps_results():
+    """Les patterns compilées donnent les mêmes entités que l'implémentation d'origine"""
+    extractor = EntityExtractor()
+
+    with open('dataset_bancaire.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    texts = [example for intent_data in data['intents'] for example in intent_data['examples']]
+    texts += [
+        "Je voudrais simuler un crédit personnel de 50 000€ sur 5 ans",
+        "Simulation prêt immobilier 200 000€ sur 20 ans avec assurance",
+        "Crédit automobile 25 000€ sur 4 ans à 3.5%",
+        "Je gagne 3500€ par mois",
+        "Prêt travaux 35 000€ sur 7 ans sans assurance",
+        "prêt voiture 12000 euros sur 48 mois, taux de 4,2%",
+        "Non merci"
+    ]
+
+    for text in texts:
+        raw = legacy_extract_entities_regex(extractor, text)
+        entities = extractor.extract_entities_regex(text)
+        assert set(entities) == set(raw), text
+        if 'montant' in raw:
+            assert entities['montant'] == float(raw['montant'].replace(' ', '').replace(',', '.'))
+        if 'duree' in raw:
+            duree = int(raw['duree'])
+            assert entities['duree'] == (duree // 12 if 'mois' in text.lower() else duree)
+        if 'type_credit' in raw:
+            credit_type = raw['type_credit'].lower()
+            assert entities['type_credit'] == extractor.credit_type_mapping.get(credit_type, credit_type)
+        if 'taux_interet' in raw:
+            assert entities['taux_interet'] == float(raw['taux_interet'].replace(',', '.'))
+        if 'assurance' in raw:
+            assert entities['assurance'] == (raw['assurance'].lower() in ['oui', 'avec'])
+        if 'revenus' in raw:
+            assert entities['revenus'] == float(raw['revenus'].replace(',', '.'))
+
+
+def test_numeric_slots_skipped_without_digit():
+    """Les créneaux numériques déclarés ne sont essayés que si le texte contient un chiffre"""
+    extractor = EntityExtractor()
+    assert extractor.numeric_slots == {'montant', 'duree', 'taux_interet', 'revenus'}
+    # Chaque pattern d'un créneau numérique exige bien un chiffre
+    for slot in extractor.numeric_slots:
+        for pattern in extractor.patterns[slot]:
+            assert '\\d' in pattern
+
+    searched = []
+    search_slot = extractor._search_slot
+    extractor._search_slot = lambda slot, text: searched.append(slot) or search_slot(slot, text)
+    extractor.extract_entities_regex("Un prêt immobilier avec assurance")
+    assert searched and not set(searched) & extractor.numeric_slots
+
+    assert extractor.has_digit("sur 4 ans") and not extractor.has_digit("sur quatre ans")
+
+
+def ner_stub_extractor(ner_mode):
+    """Extracteur dont le modèle NER (non chargé) produit MONEY et CARDINAL ; chaque appel est enregistré"""
+    extractor = EntityExtractor(ner_mode=ner_mode)
+    extractor._ner_entity_types = {'PER', 'ORG', 'MONEY', 'CARDINAL'}
+    extractor.ner_texts = []
+    extractor.extract_entities_ner = lambda text: extractor.ner_texts.append(text) or []
+    return extractor
+
+
+def test_tiered_mode_skips_ner_when_regex_suffices():
+    """En mode "tiered", pas de NER si les regex remplissent montant et durée, ou sans chiffre"""
+    extractor = ner_stub_extractor("tiered")
+    entities = extractor.extract_entities("Crédit personnel de 15 000 euros sur 4 ans")
+    extractor.extract_entities("Bonjour, quels sont vos horaires ?")
+
+    assert entities['montant'] == 15000 and entities['duree'] == 4
+    assert extractor.ner_texts == []
+    # Durée absente des regex : le NER est appelé
+    extractor.extract_entities("Je voudrais 15 000 euros")
+    assert extractor.ner_texts == ["Je voudrais 15 000 euros"]
+
+    stats = extractor.get_stats()
+    assert stats['messages'] == 3 and stats['ner_calls'] == 1 and stats['ner_skipped'] == 2
+
+
+def test_always_mode_calls_ner_for_every_message():
+    extractor = ner_stub_extractor("always")
+    messages = ["Crédit personnel de 15 000 euros sur 4 ans", "Bonjour"]
+    for message in messages:
+        extractor.extract_entities(message)
+    assert extractor.ner_texts == messages
+    assert extractor.get_stats()['ner_calls'] == 2
+
+
+def test_stats_are_not_lost_across_threads():
+    extractor = ner_stub_extractor("tiered")
+
+    def worker():
+        for _ in range(2000):
+            extractor.needs_ner("sur 4 ans", {'duree': 4})
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = extractor.get_stats()
+    assert stats['messages'] == 16000
+    assert stats['ner_calls'] + stats['ner_skipped'] == 16000
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+import torch
+
+from chatbot_bancaire import ChatbotBancaire
+from intent_classifier import IntentClassifier
+
+
+class WordTokenizer:
+    """Un token par mot ; pad complète chaque lot jusqu'à son plus long texte"""
+
+    def __call__(self, texts, truncation=True, max_length=128):
+        input_ids = [[1] * len(text.split()) for text in texts]
+        return {'input_ids': input_ids, 'attention_mask': [[1] * len(ids) for ids in input_ids]}
+
+    def pad(self, encodings, return_tensors="pt"):
+        width = max(len(ids) for ids in encodings['input_ids'])
+        return {
+            key: torch.tensor([row + [0] * (width - len(row)) for row in rows])
+            for key, rows in encodings.items()
+        }
+
+
+class WordCountModel:
+    """Prédit l'intent n° (nombre de mots - 1) ; enregistre la forme de chaque lot"""
+
+    def __init__(self, num_labels):
+        self.num_labels = num_labels
+        self.batch_shapes = []
+
+    def __call__(self, input_ids, attention_mask):
+        self.batch_shapes.append(tuple(input_ids.shape))
+        labels = (attention_mask.sum(dim=1) - 1) % self.num_labels
+        return type('Output', (), {'logits': torch.nn.functional.one_hot(labels, self.num_labels).float() * 10})
+
+
+def test_predict_batch_buckets_by_length_and_keeps_input_order():
+    classifier = IntentClassifier()
+    classifier.id2label = {0: 'salutation', 1: 'simulation_credit', 2: 'support_client', 3: 'information_produit'}
+    classifier.tokenizer = WordTokenizer()
+    classifier.model = WordCountModel(num_labels=4)
+    texts = ["a b c d", "a", "a b c", "a b", "a b c d", "a", "a b c", "a b"]
+
+    results = classifier.predict_batch(texts, batch_size=2)
+
+    assert [result['intent'] for result in results] == [
+        classifier.id2label[len(text.split()) - 1] for text in texts
+    ]
+    # Lots de textes de même longueur, sans padding, du plus court au plus long
+    assert classifier.model.batch_shapes == [(2, 1), (2, 2), (2, 3), (2, 4)]
+    assert classifier.predict_batch([]) == []
+
+
+def test_process_messages_rejects_mismatched_user_ids():
+    chatbot = ChatbotBancaire()
+    with pytest.raises(ValueError):
+        chatbot.process_messages(["Bonjour", "Vos produits ?"], user_ids=["a"])
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from intent_router import CascadeIntentRouter
+
+
+class StubSimpleClassifier:
+    """Message "intent:marge" -> (intent, confiance, marge)"""
+
+    def classify_intent_with_margin(self, message):
+        intent, margin = message.split(':')
+        return intent, 0.8, float(margin)
+
+
+class StubTransformer:
+    def __init__(self, intent='transformer_intent'):
+        self.intent = intent
+        self.calls = []
+
+    def predict_batch(self, messages, batch_size=32):
+        self.calls.append(list(messages))
+        return [{'intent': self.intent, 'confidence': 0.9} for _ in messages]
+
+
+def test_ambiguous_messages_escalate_in_input_order():
+    """Seuls les messages sous le seuil vont au Transformer, en un appel ; l'ordre d'entrée est conservé"""
+    transformer = StubTransformer()
+    router = CascadeIntentRouter(StubSimpleClassifier(), lambda: transformer, threshold=0.5, shadow_rate=0.0)
+    messages = ["a:0.9", "b:0.1", "c:0.7", "d:0.2"]
+
+    results = router.route_batch(messages)
+
+    assert transformer.calls == [["b:0.1", "d:0.2"]]
+    assert [result['classifier'] for result in results] == ['simple', 'transformer', 'simple', 'transformer']
+    assert [result['intent'] for result in results] == ['a', 'transformer_intent', 'c', 'transformer_intent']
+
+    stats = router.get_stats()
+    assert stats['messages'] == 4
+    assert stats['fast_path'] == 2 and stats['transformer'] == 2
+    assert stats['fast_path_rate'] == 0.5
+    assert stats['compared'] == 2 and stats['agreed'] == 0
+
+
+def test_shadow_samples_are_compared_but_not_used():
+    """L'échantillon de contrôle est comparé au Transformer sans changer la réponse"""
+    transformer = StubTransformer(intent='a')
+    router = CascadeIntentRouter(StubSimpleClassifier(), lambda: transformer, threshold=0.5, shadow_rate=1.0)
+
+    result = router.route("a:0.9")
+
+    assert result['classifier'] == 'simple'
+    stats = router.get_stats()
+    assert stats['transformer'] == 0
+    assert stats['compared'] == 1 and stats['agreement_rate'] == 1.0
+
+
+def test_calibrate_threshold():
+    """None sous min_samples ; sinon le plus petit seuil atteignant l'accord visé"""
+    router = CascadeIntentRouter(StubSimpleClassifier(), StubTransformer, threshold=0.25)
+    router.samples.extend((0.9, 'a', 'a') for _ in range(10))
+    assert router.calibrate_threshold(target_agreement=0.9, min_samples=50) is None
+    assert router.threshold == 0.25
+
+    # Accord parfait au-dessus de 0.4, désaccord systématique en dessous
+    router.samples.extend((0.5, 'a', 'a') for _ in range(40))
+    router.samples.extend((0.4, 'a', 'a') for _ in range(10))
+    router.samples.extend((0.1, 'a', 'b') for _ in range(20))
+    threshold = router.calibrate_threshold(target_agreement=0.9, min_samples=50)
+
+    assert threshold == 0.4
+    assert router.threshold == 0.4
+    above = [sample for sample in router.samples if sample[0] >= threshold]
+    assert sum(simple == transformer for _, simple, transformer in above) / len(above) >= 0.9
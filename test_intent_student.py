@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from intent_classifier import IntentClassifier
+from intent_student import CharNgramStudent
+
+
+def test_student_learns_teacher_targets_and_round_trips(tmp_path):
+    """L'élève reproduit un professeur sûr de lui et se recharge à l'identique"""
+    classifier = IntentClassifier()
+    texts, labels = classifier.load_dataset("dataset_bancaire.json")
+    teacher_probabilities = np.full((len(texts), len(classifier.id2label)), 0.02)
+    teacher_probabilities[np.arange(len(texts)), labels] = 0.9
+
+    student = CharNgramStudent(classifier.id2label).fit(texts, teacher_probabilities, labels)
+    probabilities = student.predict_proba(texts)
+    assert probabilities.shape == (len(texts), len(classifier.id2label))
+    assert np.allclose(probabilities.sum(axis=1), 1.0, atol=1e-5)
+    assert np.mean(probabilities.argmax(axis=1) == np.array(labels)) > 0.9
+
+    path = str(tmp_path / "student" / "student.joblib")
+    student.save(path)
+    assert np.allclose(CharNgramStudent.load(path).predict_proba(texts), probabilities)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+
+from message_cache import MessageAnalysisCache
+
+
+def make_analysis(intent):
+    return {
+        'intent': intent,
+        'confidence': 0.9,
+        'entities': {'montant': 50000.0},
+        'entity_confidence': 1.0
+    }
+
+
+def test_normalized_hits_and_lru_eviction():
+    """Les messages normalisés identiques partagent une entrée ; la plus ancienne est évincée"""
+    cache = MessageAnalysisCache(max_size=2)
+    cache.put("Comment contacter un conseiller ?", make_analysis('support_client'))
+    cache.put("Qu'est-ce qu'un crédit immobilier ?", make_analysis('information_produit'))
+
+    assert cache.get("  comment contacter un CONSEILLER ?")['intent'] == 'support_client'
+
+    cache.put("Je veux faire une demande de crédit", make_analysis('demande_credit'))
+    assert cache.get("Qu'est-ce qu'un crédit immobilier ?") is None
+    assert cache.get("Comment contacter un conseiller ?") is not None
+
+    stats = cache.get_stats()
+    assert stats['evictions'] == 1
+    assert stats['hits'] == 2
+    assert stats['misses'] == 1
+
+
+def test_ttl_expiration_and_copies():
+    """Les entrées expirent après le TTL et l'appelant reçoit une copie"""
+    cache = MessageAnalysisCache(ttl=0.05)
+    cache.put("Calculez-moi le TAEG", make_analysis('calcul_financier'))
+
+    analysis = cache.get("Calculez-moi le TAEG")
+    analysis['entities']['duree'] = 5
+    assert 'duree' not in cache.get("Calculez-moi le TAEG")['entities']
+
+    time.sleep(0.06)
+    assert cache.get("Calculez-moi le TAEG") is None
+    assert cache.get_stats()['expirations'] == 1
+
+    cache.put("Calculez-moi le TAEG", make_analysis('calcul_financier'))
+    cache.clear()
+    assert cache.get_stats()['size'] == 0
+
+
+def test_degraded_analyses_are_not_cached():
+    """Repli NER (entity_confidence 0.5) ou classificateur simple : le message sera réanalysé"""
+    from chatbot_bancaire import ChatbotBancaire
+
+    class StubIntentClassifier:
+        def predict_intent_with_confidence(self, message):
+            return {'intent': 'simulation_credit', 'confidence': 0.9}
+
+    class FlakyEntityExtractor:
+        failures = 1
+
+        def extract_entities_with_validation(self, message):
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("NER indisponible")
+            return {'validated_entities': {'montant': 50000.0}, 'confidence': 1.0}
+
+    chatbot = ChatbotBancaire()
+    chatbot._intent_classifier = StubIntentClassifier()
+    chatbot._entity_extractor = FlakyEntityExtractor()
+    chatbot.intent_model_loaded = True
+    message = "Simuler un crédit de 50 000 euros"
+
+    assert chatbot.analyze_message(message)['entity_confidence'] == 0.5
+    assert chatbot.analysis_cache.get(message) is None
+    assert chatbot.analyze_message(message)['entity_confidence'] == 1.0
+    assert chatbot.analysis_cache.get(message)['entities'] == {'montant': 50000.0}
+
+    chatbot.analysis_cache.clear()
+    chatbot.use_simple_classifier = True
+    chatbot.analyze_messages([message])
+    assert chatbot.analysis_cache.get(message) is None
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+
+import pytest
+
+from micro_batcher import MicroBatchScheduler
+
+
+def test_concurrent_requests_are_batched():
+    """Les requêtes concurrentes partagent un lot et récupèrent leur propre résultat"""
+    batch_sizes = []
+
+    def process_batch(items):
+        batch_sizes.append(len(items))
+        return [item * 2 for item in items]
+
+    scheduler = MicroBatchScheduler(process_batch, max_batch_size=8, max_wait_ms=50)
+    results = {}
+
+    def worker(value):
+        results[value] = scheduler.submit(value)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {i: i * 2 for i in range(8)}
+    assert max(batch_sizes) > 1
+    metrics = scheduler.get_metrics()
+    assert metrics['item_count'] == 8
+    assert metrics['batch_count'] == len(batch_sizes)
+
+
+def test_batch_errors_are_propagated():
+    """Une erreur du traitement est renvoyée à chaque requête du lot"""
+    def process_batch(items):
+        raise RuntimeError("modèle indisponible")
+
+    scheduler = MicroBatchScheduler(process_batch, max_wait_ms=1)
+    with pytest.raises(RuntimeError, match="modèle indisponible"):
+        scheduler.submit("message")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+import torch
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+
+from transformers import BertTokenizerFast, DistilBertConfig, DistilBertForSequenceClassification
+
+from onnx_backend import load_onnx_intent_model, onnx_model_path
+
+WORDS = ["je", "voudrais", "simuler", "un", "crédit", "immobilier", "bonjour", "conseiller", "taux", "de"]
+
+
+def save_tiny_intent_model(model_path):
+    """Petit DistilBERT aléatoire (6 intents) et son tokenizer, enregistrés comme un modèle entraîné"""
+    vocab_file = model_path / "vocab.txt"
+    model_path.mkdir()
+    vocab_file.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + WORDS), encoding="utf-8")
+    tokenizer = BertTokenizerFast(vocab_file=str(vocab_file), do_lower_case=True)
+    tokenizer.save_pretrained(str(model_path))
+
+    torch.manual_seed(0)
+    config = DistilBertConfig(vocab_size=len(WORDS) + 5, dim=32, hidden_dim=64, n_layers=2, n_heads=2,
+                              max_position_embeddings=64, num_labels=6)
+    model = DistilBertForSequenceClassification(config).eval()
+    model.save_pretrained(str(model_path))
+    return model, tokenizer
+
+
+def test_onnx_model_matches_torch_logits(tmp_path):
+    """L'export ONNX donne les mêmes logits (et donc les mêmes intents) que PyTorch, lots avec padding compris"""
+    model_path = tmp_path / "intent_model"
+    model, tokenizer = save_tiny_intent_model(model_path)
+
+    onnx_model = load_onnx_intent_model(str(model_path), intra_op_threads=1)
+    # Export écrit dans un fichier temporaire puis renommé : rien d'autre dans le dossier
+    assert sorted(path.name for path in (model_path / "onnx").iterdir()) == ["model.onnx"]
+    assert onnx_model.onnx_path == onnx_model_path(str(model_path))
+
+    inputs = tokenizer(["je voudrais simuler un crédit immobilier", "bonjour", "taux de crédit"],
+                       padding=True, return_tensors="pt")
+    with torch.no_grad():
+        expected = model(input_ids=inputs['input_ids'], attention_mask=inputs['attention_mask']).logits
+    logits = onnx_model(input_ids=inputs['input_ids'], attention_mask=inputs['attention_mask']).logits
+
+    assert torch.allclose(logits, expected, atol=1e-4)
+    assert torch.equal(logits.argmax(dim=-1), expected.argmax(dim=-1))
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import gc
+
+import prefork
+
+
+def test_worker_threads_split_cores_between_workers(monkeypatch):
+    """Les cœurs sont répartis entre workers, au moins un thread chacun"""
+    monkeypatch.setattr(prefork.os, 'cpu_count', lambda: 8)
+    assert prefork.worker_threads(4) == 2
+    assert prefork.worker_threads(16) == 1
+    assert prefork.worker_threads(4, threads=3) == 3
+
+
+def test_freeze_heap_moves_objects_to_permanent_generation():
+    """Après freeze_heap, les objets existants ne sont plus parcourus par le ramasse-miettes"""
+    try:
+        prefork.freeze_heap()
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+
+def test_onnx_export_runs_in_master_and_sessions_in_workers(monkeypatch):
+    """En mode ONNX, le maître exporte avant le fork ; les workers ne font que créer leur session"""
+    calls = []
+
+    class FakeExtractor:
+        def preload(self):
+            calls.append('ner')
+
+    class FakeChatbot:
+        entity_extractor = FakeExtractor()
+
+        def ensure_intent_model(self):
+            calls.append('session')
+
+    monkeypatch.setitem(prefork.app_flask.app.config, 'INTENT_BACKEND', 'onnx')
+    monkeypatch.setitem(prefork.app_flask.app.config, 'INTENT_MODEL_PATH', '/modeles/intent')
+    monkeypatch.setitem(prefork.app_flask.app.config, 'PRELOAD_MODELS', True)
+    monkeypatch.setattr(prefork, 'ensure_onnx_export', lambda path: calls.append(('export', path)))
+    monkeypatch.setattr(prefork, 'initialize_chatbot', FakeChatbot)
+    monkeypatch.setattr(prefork, 'freeze_heap', lambda: None)
+    monkeypatch.setattr(prefork.torch, 'set_num_threads', lambda threads: None)
+
+    prefork.load_shared_models()
+    assert calls == [('export', '/modeles/intent'), 'ner']
+    assert prefork.app_flask.app.config['PRELOAD_MODELS'] is False
+
+    prefork.load_worker_sessions()
+    assert calls[-1] == 'session'
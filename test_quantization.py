@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+
+import pytest
+import torch
+
+from quantization import _quantize_torchao, model_size_mb, quantize_dynamic_int8, release_free_memory
+
+
+def test_quantize_dynamic_int8_replaces_linear_layers():
+    """Les couches Linear passent en int8, les sorties restent proches et les poids rétrécissent"""
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(torch.nn.Linear(256, 256), torch.nn.ReLU(), torch.nn.Linear(256, 6))
+    inputs = torch.randn(8, 256)
+    with torch.no_grad():
+        expected = model(inputs)
+    size_before = model_size_mb(model)
+
+    quantized = quantize_dynamic_int8(model)
+    assert not any(type(module) is torch.nn.Linear for module in quantized.modules())
+    with torch.no_grad():
+        assert torch.allclose(quantized(inputs), expected, atol=0.05)
+    assert model_size_mb(quantized) < size_before / 2
+
+
+def test_torchao_quantize_api():
+    """Chemin torchao (torch sans torch.ao.quantization.quantize_dynamic) : sorties proches, poids réduits"""
+    pytest.importorskip("torchao")
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(torch.nn.Linear(256, 256), torch.nn.ReLU(), torch.nn.Linear(256, 6))
+    inputs = torch.randn(8, 256)
+    with torch.no_grad():
+        expected = model(inputs)
+    size_before = model_size_mb(model)
+
+    quantized = _quantize_torchao(model.eval())
+    with torch.no_grad():
+        assert torch.allclose(quantized(inputs), expected, atol=0.05)
+    assert model_size_mb(quantized) < size_before / 2
+
+
+def test_release_free_memory_is_safe_on_any_platform(monkeypatch):
+    monkeypatch.setattr(sys, 'platform', 'darwin')
+    release_free_memory()
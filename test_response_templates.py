@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from chatbot_bancaire import ChatbotBancaire
+
+
+def test_catalog_reload_renders_product_answers_again():
+    """Les réponses produits suivent le catalogue, remplacé ou modifié puis rechargé"""
+    chatbot = ChatbotBancaire()
+    context = ChatbotBancaire.new_context()
+
+    chatbot.product_info = {
+        'etudiant': {'name': 'Prêt Étudiant', 'description': 'Pour financer vos études',
+                     'features': ['Différé possible'], 'advantages': ['Taux réduit']}
+    }
+    response = chatbot.generate_product_info_response({'type_credit': 'etudiant'}, context)
+    assert response.startswith("🏦 **Prêt Étudiant**")
+    assert "• Différé possible\n" in response
+
+    chatbot.product_info['etudiant']['advantages'].append('Sans frais de dossier')
+    chatbot.reload_product_catalog()
+    assert "• Sans frais de dossier\n" in chatbot.generate_product_info_response({}, context)
+
+
+def test_simulation_answer_formats_only_the_amounts():
+    chatbot = ChatbotBancaire()
+    simulation = {'mensualite': 453.37, 'total_rembourse': 21761.92, 'interets': 1761.92}
+    assert chatbot.templates.format_simulation(simulation) == chatbot.credit_calculator.format_simulation_result(simulation)
+    assert chatbot.templates.format_simulation(simulation, insurance_offer=True).endswith("à cette simulation ?")
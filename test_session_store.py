@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+
+import pytest
+
+from chatbot_bancaire import ChatbotBancaire
+from fake_redis import FakeRedisServer
+from session_store import (ExternalContextStore, MemorySessionBackend, RedisSessionBackend, SessionBackend,
+                           SQLiteSessionBackend, create_context_store, deserialize_context, serialize_context)
+
+
+def fill(store, user_id):
+    with store.session(user_id) as context:
+        context['conversation_count'] += 1
+        context['last_intent'] = 'simulation_credit'
+        context['last_entities'] = {'montant': 50000.0, 'duree': 5, 'type_credit': 'personnel'}
+        context['simulation_history'].append({'mensualite': 994.78, 'total_rembourse': 59687.08, 'interets': 9687.08})
+
+
+def test_serialization_round_trip_is_compact():
+    """La sérialisation positionnelle restitue le contexte et reste compacte"""
+    context = ChatbotBancaire.new_context()
+    context['last_entities'] = {'montant': 50000.0, 'duree': 5}
+    context['simulation_history'] = [{'mensualite': 994.78, 'total_rembourse': 59687.08, 'interets': 9687.08}] * 5
+    data = serialize_context(context)
+    assert deserialize_context(data) == context
+    assert len(data) < 220
+
+
+def test_sqlite_and_redis_backends_share_context_between_workers(tmp_path):
+    """Deux stores (deux workers) sur le même stockage voient le même historique"""
+    server = FakeRedisServer().start()
+    try:
+        backends = [
+            lambda: SQLiteSessionBackend(str(tmp_path / "sessions.db")),
+            lambda: RedisSessionBackend(server.url)
+        ]
+        for make_backend in backends:
+            worker_a = ExternalContextStore(make_backend(), ChatbotBancaire.new_context)
+            worker_b = ExternalContextStore(make_backend(), ChatbotBancaire.new_context)
+
+            threads = [threading.Thread(target=fill, args=(worker_a, "alice")) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            fill(worker_b, "alice")
+
+            context = worker_a["alice"]
+            assert context['conversation_count'] == 5
+            assert len(context['simulation_history']) == 5
+            assert context['simulation_history'][-1]['mensualite'] == 994.78
+            assert "bob" not in worker_b
+    finally:
+        server.stop()
+
+
+def test_backends_implement_the_interface_and_count_live_sessions(tmp_path):
+    """Backend incomplet refusé ; __len__ et live_sessions comme ConversationContextStore, quel que soit le backend"""
+    class IncompleteBackend(SessionBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        IncompleteBackend()
+
+    server = FakeRedisServer().start()
+    try:
+        backends = [
+            MemorySessionBackend(),
+            SQLiteSessionBackend(str(tmp_path / "sessions.db")),
+            RedisSessionBackend(server.url)
+        ]
+        for backend in backends:
+            store = ExternalContextStore(backend, ChatbotBancaire.new_context, key_prefix="chat*[1]:")
+            backend.set("autre:cle", b"[]", 60)  # Hors du préfixe : non comptée
+            for user_id in ("alice", "bob"):
+                fill(store, user_id)
+            assert len(store) == 2
+            assert store.get_stats()['live_sessions'] == 2
+            store.delete("bob")
+            assert len(store) == 1
+            # Nombre mis en cache pour /api/metrics : recompté seulement après count_ttl
+            assert store.get_stats()['live_sessions'] == 2
+            store.count_ttl = 0.0
+            assert store.get_stats()['live_sessions'] == 1
+    finally:
+        server.stop()
+
+    memory_store = create_context_store("memory", ChatbotBancaire.new_context)
+    assert {'live_sessions', 'created', 'ttl'} <= set(memory_store.get_stats())
+    assert {'live_sessions', 'created', 'ttl'} <= set(store.get_stats())